@@ -43,7 +43,10 @@
         'data/followup_levels.xml',
         'data/multiple_invoice_data.xml',
         'data/recurring_entry_cron.xml',
+        'data/account_report_job_cron.xml',
+        'data/account_asset_depreciation_run_cron.xml',
         'data/account_pdc_data.xml',
+        'data/account_pdc_cron.xml',
         'views/account_journal_dashboard_view.xml',
         'views/reports_config_view.xml',
         'views/accounting_menu.xml',
@@ -55,6 +58,7 @@
         'views/followup_report.xml',
         'wizard/asset_depreciation_confirmation_wizard_views.xml',
         'wizard/asset_modify_views.xml',
+        'wizard/asset_depreciation_forecast_views.xml',
         'views/account_asset_views.xml',
         'views/account_move_views.xml',
         'views/product_template_views.xml',
@@ -87,8 +91,11 @@
         'report/multiple_invoice_layouts.xml',
         'report/multiple_invoice_report.xml',
         'views/recurring_payments_view.xml',
+        'views/account_report_job_views.xml',
+        'views/account_asset_depreciation_run_views.xml',
         'wizard/account_lock_date.xml',
         'views/account_payment_view.xml',
+        'wizard/account_pdc_intake_views.xml',
     ],
     'license': 'LGPL-3',
     'images': ['static/description/banner.gif'],
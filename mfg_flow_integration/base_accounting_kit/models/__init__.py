@@ -22,9 +22,15 @@
 #############################################################################
 from . import account_account
 from . import account_asset
+from . import account_asset_depreciation_run
+from . import account_balance_snapshot
 from . import account_followup
 from . import account_journal
+from . import account_ledger_version
 from . import account_move
+from . import account_partial_reconcile
+from . import account_report_cache
+from . import account_report_job
 from . import credit_limit
 from . import product_template
 from . import res_config_settings
@@ -20,12 +20,15 @@
 #
 #############################################################################
 import calendar
+from collections import defaultdict
 from datetime import date, datetime
 from dateutil.relativedelta import relativedelta
 from odoo import api, fields, models, _
 from odoo.exceptions import UserError, ValidationError
 from odoo.tools import DEFAULT_SERVER_DATE_FORMAT as DF
 from odoo.tools import float_compare, float_is_zero
+from odoo.tools.sql import column_exists, create_column, table_exists
+from markupsafe import Markup
 
 
 class AccountAssetCategory(models.Model):
@@ -145,6 +148,58 @@ class AccountAssetCategory(models.Model):
         if self.method_time != 'number':
             self.prorata = False
 
+    def _forecast_depreciation(self, date_from, date_to, budget_vals_list=()):
+        """Project the depreciation of the categories between ``date_from``
+        and ``date_to`` without writing anything.
+
+        The remaining board of every running asset is computed in memory
+        with the logic of ``compute_depreciation_board``, and so is the board
+        of each budgeted asset of ``budget_vals_list``: dicts of
+        account.asset.asset values holding at least ``category_id``,
+        ``value`` and ``date``. All the purchase categories of the current
+        companies are forecast when the recordset is empty.
+
+        :return: dict {(category_id, month, origin): amount} where month is
+            the first day of the month, origin 'asset' or 'budget' and the
+            amount in the currency of the company of the category, converted
+            at the rate of the month
+        """
+        categories = self or self.search([
+            ('type', '=', 'purchase'),
+            ('company_id', 'in', self.env.companies.ids)])
+        assets = self.env['account.asset.asset'].search([
+            ('category_id', 'in', categories.ids), ('state', '=', 'open')])
+        no_lines = self.env['account.asset.depreciation.line']
+        boards = []
+        for asset in assets:
+            posted_depreciation_line_ids = asset.depreciation_line_ids.filtered(
+                lambda x: x.move_check).sorted(
+                key=lambda l: l.depreciation_date or date.min)
+            boards.append((asset, 'asset', posted_depreciation_line_ids))
+        for budget_vals in budget_vals_list:
+            category = self.browse(budget_vals['category_id'])
+            asset_vals = assets.onchange_category_id_values(
+                category.id)['value']
+            asset_vals.update(company_id=category.company_id.id,
+                              currency_id=category.company_id.currency_id.id)
+            asset_vals.update(budget_vals)
+            boards.append((assets.new(asset_vals), 'budget', no_lines))
+        forecast = defaultdict(float)
+        for asset, origin, posted_depreciation_line_ids in boards:
+            for line_vals in asset._get_depreciation_board_vals(
+                    posted_depreciation_line_ids):
+                depreciation_date = line_vals['depreciation_date']
+                if depreciation_date > date_to:
+                    break
+                if depreciation_date >= date_from:
+                    month = depreciation_date.replace(day=1)
+                    company = asset.category_id.company_id
+                    forecast[asset.category_id.id, month, origin] += \
+                        asset.currency_id._convert(
+                            line_vals['amount'], company.currency_id,
+                            company, month)
+        return dict(forecast)
+
 
 class AccountAssetAsset(models.Model):
     _name = 'account.asset.asset'
@@ -205,7 +260,18 @@ class AccountAssetAsset(models.Model):
     method_progress_factor = fields.Float(string='Degressive Factor',
                                           readonly=True, default=0.3, )
     value_residual = fields.Float(compute='_amount_residual',
-                                  digits=0, string='Residual Value')
+                                  digits=0, string='Residual Value',
+                                  store=True)
+    depreciated_amount = fields.Float(compute='_amount_residual',
+                                      digits=0, string='Posted Depreciation',
+                                      store=True,
+                                      help="Total of the depreciation lines "
+                                           "linked to a journal entry")
+    last_depreciation_date = fields.Date(
+        compute='_amount_residual', string='Last Depreciation Date',
+        store=True,
+        help="Date of the last depreciation entry, the purchase date if "
+             "none was made yet")
     method_time = fields.Selection(
         [('number', 'Number of Entries'), ('end', 'Ending Date')],
         string='Time Method', required=True, readonly=True, default='number',
@@ -247,23 +313,43 @@ class AccountAssetAsset(models.Model):
                         'posted entries.'))
         return super(AccountAssetAsset, self).unlink()
 
+    def _auto_init(self):
+        """Create and fill the depreciation totals in SQL, the ORM would
+        recompute them asset by asset on large registers. On install the
+        table does not exist yet and there is nothing to fill."""
+        cr = self.env.cr
+        if table_exists(cr, 'account_asset_asset') and not column_exists(
+                cr, 'account_asset_asset', 'depreciated_amount'):
+            create_column(cr, 'account_asset_asset', 'depreciated_amount',
+                          'numeric')
+            create_column(cr, 'account_asset_asset', 'last_depreciation_date',
+                          'date')
+            if not column_exists(cr, 'account_asset_asset', 'value_residual'):
+                create_column(cr, 'account_asset_asset', 'value_residual',
+                              'numeric')
+            cr.execute("""
+                UPDATE account_asset_asset a
+                SET depreciated_amount = COALESCE(posted.amount, 0.0),
+                    last_depreciation_date = COALESCE(posted.date, a.date),
+                    value_residual = COALESCE(a.value, 0.0)
+                        - COALESCE(posted.amount, 0.0)
+                        - COALESCE(a.salvage_value, 0.0)
+                FROM account_asset_asset asset
+                LEFT JOIN LATERAL (
+                    SELECT SUM(dl.amount) AS amount, MAX(m.date) AS date
+                    FROM account_asset_depreciation_line dl
+                    JOIN account_move m ON m.id = dl.move_id
+                    WHERE dl.asset_id = asset.id) posted ON TRUE
+                WHERE asset.id = a.id""")
+        return super(AccountAssetAsset, self)._auto_init()
+
     def _get_last_depreciation_date(self):
         """
-        @param id: ids of a account.asset.asset objects
         @return: Returns a dictionary of the effective dates of the last
-         depreciation entry made for given asset ids. If there isn't any,
+         depreciation entry made for the assets. If there isn't any,
          return the purchase date of this asset
         """
-        self.env.cr.execute("""
-            SELECT a.id as id, COALESCE(MAX(m.date),a.date) AS date
-            FROM account_asset_asset a
-            LEFT JOIN account_asset_depreciation_line rel ON 
-            (rel.asset_id = a.id)
-            LEFT JOIN account_move m ON (rel.move_id = m.id)
-            WHERE a.id IN %s
-            GROUP BY a.id, m.date """, (tuple(self.ids),))
-        result = dict(self.env.cr.fetchall())
-        return result
+        return {asset.id: asset.last_depreciation_date for asset in self}
 
     # @api.model
     # def _cron_generate_entries(self):
@@ -274,27 +360,14 @@ class AccountAssetAsset(models.Model):
 
     @api.model
     def compute_generated_entries(self, date, asset_type=None):
-        # Entries generated : one by grouped category and one by asset
-        # from ungrouped category
-        created_move_ids = []
-        type_domain = []
-        if asset_type:
-            type_domain = [('type', '=', asset_type)]
-
-        ungrouped_assets = self.env['account.asset.asset'].search(
-            type_domain + [('state', '=', 'open'),
-                           ('category_id.group_entries', '=', False)])
-        created_move_ids += (ungrouped_assets.
-                             _compute_entries(date, group_entries=False))
-
-        for grouped_category in self.env['account.asset.category'].search(
-                type_domain + [('group_entries', '=', True)]):
-            assets = self.env['account.asset.asset'].search(
-                [('state', '=', 'open'),
-                 ('category_id', '=', grouped_category.id)])
-            created_move_ids += assets._compute_entries(date,
-                                                        group_entries=True)
-        return created_move_ids
+        """Generate the entries of the depreciation lines due on ``date``:
+        one per line of the ungrouped categories and one per grouped
+        category, in one depreciation run per company of the environment"""
+        runs = self.env['account.asset.depreciation.run']._create_company_runs(
+            date, asset_type or False)
+        for run in runs:
+            run._process(auto_commit=False)
+        return runs.move_ids.ids
 
     def _compute_board_amount(self, sequence, residual_amount, amount_to_depr,
                               undone_dotation_number,
@@ -311,11 +384,9 @@ class AccountAssetAsset(models.Model):
                     amount = amount_to_depr / self.method_number
                     if sequence == 1:
                         if self.method_period % 12 != 0:
-                            date = datetime.strptime(str(self.date),
-                                                     '%Y-%m-%d')
-                            month_days = \
-                                calendar.monthrange(date.year, date.month)[1]
-                            days = month_days - date.day + 1
+                            month_days = calendar.monthrange(
+                                self.date.year, self.date.month)[1]
+                            days = month_days - self.date.day + 1
                             amount = ((amount_to_depr / self.method_number)
                                       / month_days * days)
                         else:
@@ -331,11 +402,9 @@ class AccountAssetAsset(models.Model):
                 if self.prorata:
                     if sequence == 1:
                         if self.method_period % 12 != 0:
-                            date = datetime.strptime(str(self.date),
-                                                     '%Y-%m-%d')
-                            month_days = \
-                                calendar.monthrange(date.year, date.month)[1]
-                            days = month_days - date.day + 1
+                            month_days = calendar.monthrange(
+                                self.date.year, self.date.month)[1]
+                            days = month_days - self.date.day + 1
                             amount = ((
                                               residual_amount *
                                               self.method_progress_factor) /
@@ -353,123 +422,102 @@ class AccountAssetAsset(models.Model):
     def _compute_board_undone_dotation_nb(self, depreciation_date, total_days):
         undone_dotation_number = self.method_number
         if self.method_time == 'end':
-            end_date = datetime.strptime(str(self.method_end), DF).date()
+            end_date = self.method_end
             undone_dotation_number = 0
             while depreciation_date <= end_date:
-                depreciation_date = date(depreciation_date.year,
-                                         depreciation_date.month,
-                                         depreciation_date.day) + relativedelta(
+                depreciation_date = depreciation_date + relativedelta(
                     months=+self.method_period)
                 undone_dotation_number += 1
         if self.prorata:
             undone_dotation_number += 1
         return undone_dotation_number
 
-    def compute_depreciation_board(self):
+    def _get_board_start_date(self, posted_depreciation_line_ids):
+        """Date of the first depreciation line left to compute"""
+        if posted_depreciation_line_ids and \
+                posted_depreciation_line_ids[-1].depreciation_date:
+            # if we already have some previous validated entries, starting
+            # date is last entry + method period
+            return posted_depreciation_line_ids[-1].depreciation_date + \
+                relativedelta(months=+self.method_period)
+        if self.prorata:
+            return max(posted_depreciation_line_ids.move_id.mapped('date'),
+                       default=None) or self.date
+        # depreciation_date = 1st of January of purchase year if annual
+        # valuation, 1st of purchase month in other cases
+        if self.method_period >= 12:
+            if self.company_id.fiscalyear_last_month:
+                # e.g. 2018-12-31 +1 -> 2019
+                return (date(year=self.date.year,
+                             month=int(self.company_id.fiscalyear_last_month),
+                             day=self.company_id.fiscalyear_last_day) +
+                        relativedelta(days=1) +
+                        relativedelta(year=self.date.year))
+            return date(self.date.year, 1, 1)
+        return self.date.replace(day=1)
+
+    def _get_depreciation_board_vals(self, posted_depreciation_line_ids):
+        """Values of the depreciation lines left to compute"""
         self.ensure_one()
-        posted_depreciation_line_ids = self.depreciation_line_ids.filtered(
-            lambda x: x.move_check).sorted(key=lambda l: l.depreciation_date)
-        unposted_depreciation_line_ids = self.depreciation_line_ids.filtered(
-            lambda x: not x.move_check)
-
-        # Remove old unposted depreciation lines. We cannot use unlink()
-        # with One2many field
-        commands = [(2, line_id.id, False) for line_id in
-                    unposted_depreciation_line_ids]
-
-        if self.value_residual != 0.0:
-            amount_to_depr = residual_amount = self.value_residual
-            if self.prorata:
-                # if we already have some previous validated entries,
-                # starting date is last entry + method perio
-                if posted_depreciation_line_ids and \
-                        posted_depreciation_line_ids[-1].depreciation_date:
-                    last_depreciation_date = datetime.strptime(
-                        posted_depreciation_line_ids[-1].depreciation_date,
-                        DF).date()
-                    depreciation_date = last_depreciation_date + relativedelta(
-                        months=+self.method_period)
-                else:
-                    depreciation_date = datetime.strptime(
-                        str(self._get_last_depreciation_date()[self.id]),
-                        DF).date()
-            else:
-                # depreciation_date = 1st of January of purchase year if
-                # annual valuation, 1st of
-                # purchase month in other cases
-                if self.method_period >= 12:
-                    if self.company_id.fiscalyear_last_month:
-                        asset_date = (date(year=int(self.date.year),
-                                           month=int(
-                                               self.company_id.fiscalyear_last_month),
-                                           day=int(
-                                               self.company_id.
-                                               fiscalyear_last_day)) +
-                                      relativedelta(days=1) + relativedelta(
-                                    year=int(
-                                        self.date.year)))
-                        # e.g. 2018-12-31 +1 -> 2019
-                    else:
-                        asset_date = datetime.strptime(
-                            str(self.date)[:4] + '-01-01', DF).date()
-                else:
-                    asset_date = datetime.strptime(str(self.date)[:7] + '-01',
-                                                   DF).date()
-                # if we already have some previous validated entries, starting
-                # date isn't 1st January but last entry + method period
-                if posted_depreciation_line_ids and \
-                        posted_depreciation_line_ids[-1].depreciation_date:
-                    last_depreciation_date = datetime.strptime(str(
-                        posted_depreciation_line_ids[-1].depreciation_date),
-                        DF).date()
-                    depreciation_date = last_depreciation_date + relativedelta(
-                        months=+self.method_period)
-                else:
-                    depreciation_date = asset_date
-            day = depreciation_date.day
-            month = depreciation_date.month
-            year = depreciation_date.year
-            total_days = (year % 4) and 365 or 366
-
-            undone_dotation_number = self._compute_board_undone_dotation_nb(
-                depreciation_date, total_days)
-
-            for x in range(len(posted_depreciation_line_ids),
-                           undone_dotation_number):
-                sequence = x + 1
-                amount = self._compute_board_amount(sequence, residual_amount,
-                                                    amount_to_depr,
-                                                    undone_dotation_number,
-                                                    posted_depreciation_line_ids,
-                                                    total_days,
-                                                    depreciation_date)
-
-                amount = self.currency_id.round(amount)
-                if float_is_zero(amount,
-                                 precision_rounding=self.currency_id.rounding):
-                    continue
-                residual_amount -= amount
-                vals = {
-                    'amount': amount,
-                    'asset_id': self.id,
-                    'sequence': sequence,
-                    'name': (self.code or '') + '/' + str(sequence),
-                    'remaining_value': residual_amount if
-                    residual_amount >= 0 else 0.0,
-                    'depreciated_value': self.value - (
-                            self.salvage_value + residual_amount),
-                    'depreciation_date': depreciation_date.strftime(DF),
-                }
-                commands.append((0, False, vals))
-                # Considering Depr. Period as months
-                depreciation_date = date(year, month, day) + relativedelta(
-                    months=+self.method_period)
-                day = depreciation_date.day
-                month = depreciation_date.month
-                year = depreciation_date.year
+        vals_list = []
+        if self.value_residual == 0.0:
+            return vals_list
+        amount_to_depr = residual_amount = self.value_residual
+        depreciation_date = self._get_board_start_date(
+            posted_depreciation_line_ids)
+        year = depreciation_date.year
+        total_days = (year % 4) and 365 or 366
+        undone_dotation_number = self._compute_board_undone_dotation_nb(
+            depreciation_date, total_days)
+        rounding = self.currency_id.rounding
+        for sequence in range(len(posted_depreciation_line_ids) + 1,
+                              undone_dotation_number + 1):
+            amount = self._compute_board_amount(sequence, residual_amount,
+                                                amount_to_depr,
+                                                undone_dotation_number,
+                                                posted_depreciation_line_ids,
+                                                total_days,
+                                                depreciation_date)
+            amount = self.currency_id.round(amount)
+            if float_is_zero(amount, precision_rounding=rounding):
+                continue
+            residual_amount -= amount
+            vals_list.append({
+                'amount': amount,
+                'asset_id': self.id,
+                'sequence': sequence,
+                'name': (self.code or '') + '/' + str(sequence),
+                'remaining_value': residual_amount if
+                residual_amount >= 0 else 0.0,
+                'depreciated_value': self.value - (
+                        self.salvage_value + residual_amount),
+                'depreciation_date': depreciation_date,
+            })
+            # Considering Depr. Period as months
+            depreciation_date = depreciation_date + relativedelta(
+                months=+self.method_period)
+        return vals_list
 
-        self.write({'depreciation_line_ids': commands})
+    def compute_depreciation_board(self):
+        """Recompute the unposted depreciation lines of the assets.
 
+        The boards of the whole recordset are computed in memory from
+        prefetched values, then the unposted lines are deleted and the new
+        ones created with a single batch unlink and create, instead of one
+        one2many write per asset.
+        """
+        unposted_lines = self.env['account.asset.depreciation.line']
+        vals_list = []
+        for asset in self:
+            posted_depreciation_line_ids = asset.depreciation_line_ids.filtered(
+                lambda x: x.move_check).sorted(
+                key=lambda l: l.depreciation_date or date.min)
+            unposted_lines |= asset.depreciation_line_ids - \
+                posted_depreciation_line_ids
+            vals_list += asset._get_depreciation_board_vals(
+                posted_depreciation_line_ids)
+        unposted_lines.unlink()
+        self.env['account.asset.depreciation.line'].create(vals_list)
         return True
 
     def validate(self):
@@ -569,15 +617,18 @@ class AccountAssetAsset(models.Model):
     def set_to_draft(self):
         self.write({'state': 'draft'})
 
-    @api.depends('value', 'salvage_value',
+    @api.depends('value', 'salvage_value', 'date',
                  'depreciation_line_ids.move_check',
-                 'depreciation_line_ids.amount')
+                 'depreciation_line_ids.amount',
+                 'depreciation_line_ids.move_id.date')
     def _amount_residual(self):
         for record in self:
-            total_amount = 0.0
-            for line in record.depreciation_line_ids:
-                if line.move_check:
-                    total_amount += line.amount
+            posted_lines = record.depreciation_line_ids.filtered('move_check')
+            total_amount = sum(posted_lines.mapped('amount'))
+            move_dates = posted_lines.move_id.mapped('date')
+            record.depreciated_amount = total_amount
+            record.last_depreciation_date = (max(move_dates) if move_dates
+                                             else record.date)
             record.value_residual = (record.value - total_amount -
                                      record.salvage_value)
 
@@ -634,6 +685,9 @@ class AccountAssetAsset(models.Model):
         return super(AccountAssetAsset, self).copy_data(default)
 
     def _compute_entries(self, date, group_entries=False):
+        """Entries of the lines of the assets due on ``date``. Kept for the
+        callers working on a known set of assets, the scheduled generation
+        goes through account.asset.depreciation.run"""
         depreciation_ids = self.env['account.asset.depreciation.line'].search([
             ('asset_id', 'in', self.ids), ('depreciation_date', '<=', date),
             ('move_check', '=', False)])
@@ -641,18 +695,17 @@ class AccountAssetAsset(models.Model):
             return depreciation_ids.create_grouped_move()
         return depreciation_ids.create_move()
 
-    @api.model
-    def create(self, vals):
-        asset = super(AccountAssetAsset,
-                      self.with_context(mail_create_nolog=True)).create(vals)
-        asset.sudo().compute_depreciation_board()
-        return asset
+    @api.model_create_multi
+    def create(self, vals_list):
+        assets = super(AccountAssetAsset, self.with_context(
+            mail_create_nolog=True)).create(vals_list)
+        assets.sudo().compute_depreciation_board()
+        return assets
 
     def write(self, vals):
         res = super(AccountAssetAsset, self).write(vals)
         if 'depreciation_line_ids' not in vals and 'state' not in vals:
-            for rec in self:
-                rec.compute_depreciation_board()
+            self.compute_depreciation_board()
         return res
 
     def open_entries(self):
@@ -707,100 +760,65 @@ class AccountAssetDepreciationLine(models.Model):
                                               line.move_id.state == 'posted')\
                 else False
 
-    def create_move(self, post_move=True):
-        created_moves = self.env['account.move']
+    def _prepare_move_vals(self):
+        """Values of the journal entry of a depreciation line"""
+        self.ensure_one()
         prec = self.env['decimal.precision'].precision_get('Account')
-        if self.mapped('move_id'):
-            raise UserError(_(
-                'This depreciation is already linked to a journal entry! '
-                'Please post or delete it.'))
-        for line in self:
-            category_id = line.asset_id.category_id
-            depreciation_date = (self.env.context.get(
-                'depreciation_date') or line.depreciation_date or
-                                 fields.Date.context_today(
-                self))
-            company_currency = line.asset_id.company_id.currency_id
-            current_currency = line.asset_id.currency_id
-            amount = current_currency.with_context(
-                date=depreciation_date)._convert(line.amount, company_currency)
-            asset_name = line.asset_id.name + ' (%s/%s)' % (
-                line.sequence, len(line.asset_id.depreciation_line_ids))
-            partner = self.env['res.partner']._find_accounting_partner(
-                line.asset_id.partner_id)
-            move_line_1 = {
-                'name': asset_name,
-                'account_id': category_id.account_depreciation_id.id,
-                'debit': 0.0 if float_compare(amount, 0.0,
-                                              precision_digits=prec) > 0
-                else -amount,
-                'credit': amount if float_compare(amount, 0.0,
-                                                  precision_digits=prec) > 0
-                else 0.0,
-                'journal_id': category_id.journal_id.id,
-                'partner_id': partner.id,
-                # 'analytic_account_id': category_id.account_analytic_id.id if
-                # category_id.type == 'sale' else False,
-                'currency_id': company_currency != current_currency and
-                               current_currency.id or company_currency.id,
-                'amount_currency': company_currency != current_currency
-                                   and - 1.0 * line.amount or 0.0,
-            }
-            move_line_2 = {
-                'name': asset_name,
-                'account_id': category_id.account_depreciation_expense_id.id,
-                'credit': 0.0 if float_compare(amount, 0.0,
-                                               precision_digits=prec) > 0
-                else -amount,
-                'debit': amount if float_compare(amount, 0.0,
-                                                 precision_digits=prec) > 0
-                else 0.0,
-                'journal_id': category_id.journal_id.id,
-                'partner_id': partner.id,
-                # 'analytic_account_id': category_id.account_analytic_id.id
-                # if category_id.type == 'purchase' else False,
-                'currency_id': company_currency != current_currency and
-                               current_currency.id or company_currency.id,
-                'amount_currency': company_currency != current_currency and
-                                   line.amount or 0.0,
-            }
-            line_ids = [(0, 0, {
+        category_id = self.asset_id.category_id
+        depreciation_date = (self.env.context.get('depreciation_date') or
+                             self.depreciation_date or
+                             fields.Date.context_today(self))
+        company_currency = self.asset_id.company_id.currency_id
+        current_currency = self.asset_id.currency_id
+        amount = current_currency.with_context(
+            date=depreciation_date)._convert(self.amount, company_currency)
+        partner = self.env['res.partner']._find_accounting_partner(
+            self.asset_id.partner_id)
+        positive = float_compare(amount, 0.0, precision_digits=prec) > 0
+        return {
+            'ref': self.asset_id.code,
+            'date': depreciation_date or False,
+            'journal_id': category_id.journal_id.id,
+            'line_ids': [(0, 0, {
                 'account_id': category_id.account_depreciation_id.id,
                 'partner_id': partner.id,
-                'credit': amount if float_compare(amount, 0.0,
-                                                  precision_digits=prec) > 0
-                else 0.0,
+                'debit': 0.0 if positive else -amount,
+                'credit': amount if positive else 0.0,
             }), (0, 0, {
                 'account_id': category_id.account_depreciation_expense_id.id,
                 'partner_id': partner.id,
-                'debit': amount if float_compare(amount, 0.0,
-                                                 precision_digits=prec) > 0
-                else 0.0,
-            })]
-            move = self.env['account.move'].create({
-                'ref': line.asset_id.code,
-                'date': depreciation_date or False,
-                'journal_id': category_id.journal_id.id,
-                'line_ids': line_ids,
-            })
-            for move_line in move.line_ids:
-                if move_line.account_id.id == move_line_1['account_id']:
-                    move_line.write({'credit': move_line_1['credit'],
-                                     'debit': move_line_1['debit']})
-                elif move_line.account_id.id == move_line_2['account_id']:
-                    move_line.write({'debit': move_line_2['debit'],
-                                     'credit': move_line_2['credit']})
-            if move.line_ids.filtered(
-                    lambda x: x.name == 'Automatic Balancing Line'):
-                move.line_ids.filtered(
-                    lambda x: x.name == 'Automatic Balancing Line').unlink()
-            line.write({'move_id': move.id, 'move_check': True})
-            created_moves |= move
+                'debit': amount if positive else 0.0,
+                'credit': 0.0 if positive else -amount,
+            })],
+            'asset_depreciation_ids': [(4, self.id)],
+        }
+
+    def create_move(self, post_move=True):
+        """Create the journal entries of the depreciation lines with a
+        single create, and post those of the auto-confirmed categories in
+        one go"""
+        if self.mapped('move_id'):
+            raise UserError(_(
+                'This depreciation is already linked to a journal entry! '
+                'Please post or delete it.'))
+        created_moves = self.env['account.move'].create(
+            [line._prepare_move_vals() for line in self])
         if post_move and created_moves:
             created_moves.filtered(lambda m: any(
                 m.asset_depreciation_ids.mapped(
                     'asset_id.category_id.open_asset'))).post()
-        return [x.id for x in created_moves]
+        return created_moves.ids
+
+    def _create_run_moves(self):
+        """Create the entries of the lines of a depreciation run chunk: one
+        per line of the ungrouped categories, one per grouped category"""
+        grouped = self.filtered(lambda l: l.asset_id.category_id.group_entries)
+        moves = self.env['account.move'].browse((self - grouped).create_move())
+        for category in grouped.asset_id.category_id:
+            moves |= moves.browse(grouped.filtered(
+                lambda l: l.asset_id.category_id == category
+            ).create_grouped_move())
+        return moves
 
     def create_grouped_move(self, post_move=True):
         if not self.exists():
@@ -868,12 +886,13 @@ class AccountAssetDepreciationLine(models.Model):
 
     def log_message_when_posted(self):
         def _format_message(message_description, tracked_values):
-            message = ''
+            message = Markup('')
             if message_description:
-                message = '<span>%s</span>' % message_description
+                message = Markup('<span>%s</span>') % message_description
             for name, values in tracked_values.items():
-                message += '<div> &nbsp; &nbsp; &bull; <b>%s</b>: ' % name
-                message += '%s</div>' % values
+                message += Markup(
+                    '<div> &nbsp; &nbsp; &bull; <b>%s</b>: %s</div>') % (
+                    name, values)
             return message
         # `message_post` invalidates the (whole) cache
         # preprocess the assets in which messages should be posted,
@@ -891,9 +910,9 @@ class AccountAssetDepreciationLine(models.Model):
                 msg = _format_message(_('Depreciation line posted.'),
                                       msg_values)
                 assets_to_post.setdefault(line.asset_id, []).append(msg)
+        # one message per asset, whatever the number of lines posted
         for asset, messages in assets_to_post.items():
-            for msg in messages:
-                asset.message_post(body=msg)
+            asset.message_post(body=Markup('').join(messages))
 
     def unlink(self):
         for record in self:
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+#############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2023-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: Cybrosys Techno Solutions(<https://www.cybrosys.com>)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+import logging
+import time
+from datetime import timedelta
+
+from odoo import api, fields, models, _
+
+_logger = logging.getLogger(__name__)
+
+# Depreciation lines turned into entries between two commits
+DEFAULT_CHUNK_SIZE = 500
+
+
+class AccountAssetDepreciationRun(models.Model):
+    """Generation of the entries of the depreciation lines due at a date.
+
+    The due lines of one company are processed in chunks: the entries of
+    a chunk are created with one create and posted together, then the
+    transaction is committed. The due lines of a grouped category always
+    belong to the same chunk, so they still give a single entry. A run
+    interrupted by a crash resumes from the lines that have no entry yet,
+    and the counts and timings of every chunk are kept in the log."""
+    _name = 'account.asset.depreciation.run'
+    _description = 'Depreciation Run'
+    _order = 'id desc'
+
+    name = fields.Char(string='Name', compute='_compute_name')
+    date = fields.Date(string='Account Date', required=True, readonly=True,
+                       help="Depreciation lines due on or before this date "
+                            "are posted.")
+    asset_type = fields.Selection([('sale', 'Sale: Revenue Recognition'),
+                                   ('purchase', 'Purchase: Asset')],
+                                  string='Type', readonly=True,
+                                  help="Restrict the run to the assets or to "
+                                       "the deferred revenues.")
+    chunk_size = fields.Integer(string='Chunk Size', required=True,
+                                default=DEFAULT_CHUNK_SIZE,
+                                help="Number of depreciation lines processed "
+                                     "between two commits. A chunk holding a "
+                                     "line of a category grouping its "
+                                     "entries also takes every due line of "
+                                     "that category, so it can exceed this "
+                                     "size.")
+    state = fields.Selection([('queued', 'Queued'), ('running', 'Running'),
+                              ('done', 'Done'), ('failed', 'Failed')],
+                             string='Status', required=True, readonly=True,
+                             default='queued', copy=False)
+    line_count = fields.Integer(string='Processed Lines', readonly=True)
+    move_count = fields.Integer(string='Created Entries', readonly=True)
+    posted_count = fields.Integer(string='Posted Entries', readonly=True)
+    chunk_count = fields.Integer(string='Chunks', readonly=True)
+    duration = fields.Float(string='Duration (s)', readonly=True,
+                            digits=(16, 2))
+    date_start = fields.Datetime(string='Started On', readonly=True)
+    date_done = fields.Datetime(string='Finished On', readonly=True)
+    move_ids = fields.Many2many('account.move',
+                                'account_asset_depreciation_run_move_rel',
+                                'run_id', 'move_id', string='Entries',
+                                readonly=True, copy=False)
+    log = fields.Text(string='Log', readonly=True, copy=False)
+    error = fields.Text(string='Error', readonly=True, copy=False)
+    user_id = fields.Many2one('res.users', string='Started By',
+                              required=True, readonly=True,
+                              default=lambda self: self.env.user)
+    company_id = fields.Many2one('res.company', string='Company',
+                                 required=True, readonly=True,
+                                 default=lambda self: self.env.company)
+
+    @api.depends('date', 'asset_type')
+    def _compute_name(self):
+        for run in self:
+            run.name = _("Depreciation run of %s", run.date)
+
+    def _get_due_line_domain(self):
+        self.ensure_one()
+        domain = [('move_check', '=', False),
+                  ('depreciation_date', '<=', self.date),
+                  ('asset_id.state', '=', 'open'),
+                  ('asset_id.company_id', '=', self.company_id.id)]
+        if self.asset_type:
+            domain.append(('asset_id.category_id.type', '=', self.asset_type))
+        return domain
+
+    def _process(self, auto_commit=True):
+        """Generate the entries of the due lines chunk by chunk.
+
+        :param auto_commit: commit after every chunk, so that the run can be
+            resumed from there and no lock is held for the whole run
+        """
+        self.ensure_one()
+        Line = self.env['account.asset.depreciation.line'].with_company(
+            self.company_id)
+        self.write({'state': 'running',
+                    'date_start': self.date_start or fields.Datetime.now()})
+        if auto_commit:
+            self.env.cr.commit()
+        try:
+            while True:
+                start = time.monotonic()
+                lines = Line.search(self._get_due_line_domain(),
+                                    order='asset_id, id',
+                                    limit=max(self.chunk_size, 1))
+                if not lines:
+                    break
+                grouped_categories = lines.asset_id.category_id.filtered(
+                    'group_entries')
+                if grouped_categories:
+                    # a grouped category gives one entry for the whole run
+                    lines |= Line.search(self._get_due_line_domain() + [
+                        ('asset_id.category_id', 'in',
+                         grouped_categories.ids)])
+                moves = lines._create_run_moves()
+                self._log_chunk(lines, moves, time.monotonic() - start)
+                if auto_commit:
+                    self.env.cr.commit()
+        except Exception as error:
+            if not auto_commit:
+                raise
+            _logger.exception("Depreciation run %s failed", self.id)
+            self.env.cr.rollback()
+            self.write({'state': 'failed', 'error': str(error),
+                        'date_done': fields.Datetime.now()})
+            self.env.cr.commit()
+            return
+        self.write({'state': 'done', 'error': False,
+                    'date_done': fields.Datetime.now()})
+        if auto_commit:
+            self.env.cr.commit()
+
+    def _log_chunk(self, lines, moves, duration):
+        posted = moves.filtered(lambda move: move.state == 'posted')
+        self.write({
+            'line_count': self.line_count + len(lines),
+            'move_count': self.move_count + len(moves),
+            'posted_count': self.posted_count + len(posted),
+            'chunk_count': self.chunk_count + 1,
+            'duration': self.duration + duration,
+            'move_ids': [(4, move.id) for move in moves],
+            'log': (self.log or '') + _(
+                "Chunk %(chunk)s: %(lines)s lines, %(moves)s entries, "
+                "%(posted)s posted in %(duration).2fs\n",
+                chunk=self.chunk_count + 1, lines=len(lines),
+                moves=len(moves), posted=len(posted), duration=duration),
+        })
+
+    def action_resume(self):
+        """Queue the failed runs again, they restart from the lines that have
+        no entry yet"""
+        self.filtered(lambda run: run.state == 'failed').write({
+            'state': 'queued', 'error': False})
+        self.env.ref(
+            'base_accounting_kit.ir_cron_asset_depreciation_run')._trigger()
+
+    def action_view_moves(self):
+        self.ensure_one()
+        return {
+            'name': _('Journal Entries'),
+            'view_mode': 'tree,form',
+            'res_model': 'account.move',
+            'type': 'ir.actions.act_window',
+            'domain': [('id', 'in', self.move_ids.ids)],
+        }
+
+    @api.model
+    def _create_company_runs(self, date, asset_type=False):
+        """Create a run of ``date`` for each company of the environment"""
+        return self.create([{
+            'date': date,
+            'asset_type': asset_type,
+            'company_id': company.id,
+        } for company in self.env.companies])
+
+    @api.model
+    def _cron_process_runs(self):
+        """Process the queued runs, and resume those whose worker died"""
+        self.search([('state', '=', 'running'),
+                     ('write_date', '<', fields.Datetime.now() - timedelta(
+                         hours=1))]).write({'state': 'queued'})
+        self.env.cr.commit()
+        while True:
+            self.env.cr.execute("""
+                SELECT id FROM account_asset_depreciation_run
+                WHERE state = 'queued'
+                ORDER BY id LIMIT 1 FOR UPDATE SKIP LOCKED""")
+            row = self.env.cr.fetchone()
+            if not row:
+                break
+            run = self.browse(row[0])
+            run.with_user(run.user_id).with_company(
+                run.company_id)._process()
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+#############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2023-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: Cybrosys Techno Solutions(<https://www.cybrosys.com>)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+from odoo import api, fields, models
+from odoo.tools.sql import column_exists, table_exists
+
+# Context keys of account.move.line._query_get() filtering on journal item
+# fields that the snapshot does not keep.
+LINE_LEVEL_FILTERS = ('aged_balance', 'reconcile_date', 'analytic_tag_ids',
+                      'analytic_account_ids', 'partner_ids',
+                      'partner_categories')
+
+# Journal item and entry fields moving posted amounts between snapshot rows
+SNAPSHOT_LINE_FIELDS = {'account_id', 'journal_id', 'date', 'company_id',
+                        'debit', 'credit', 'balance'}
+SNAPSHOT_MOVE_FIELDS = {'date', 'journal_id', 'company_id'}
+
+# Layout of the snapshot rows, bumping it rebuilds the table on update
+SNAPSHOT_VERSION = '2'
+SNAPSHOT_VERSION_PARAM = 'base_accounting_kit.balance_snapshot_version'
+
+
+class AccountBalanceSnapshot(models.Model):
+    """Debit and credit totals of the posted journal items per entry,
+    account and journal, so the balance reports can aggregate this table
+    instead of the journal items.
+
+    The rows of an entry are rebuilt whenever the entry is posted, reset to
+    draft, cancelled, or its posted journal items are created, edited or
+    deleted. Each entry only ever touches its own rows, so concurrent
+    postings on the same account and day never update the same row."""
+    _name = 'account.balance.snapshot'
+    _description = 'Account Balance Snapshot'
+    _log_access = False
+
+    move_id = fields.Many2one('account.move', string='Journal Entry',
+                              required=True, readonly=True, index=True,
+                              ondelete='cascade')
+    company_id = fields.Many2one('res.company', string='Company',
+                                 required=True, readonly=True, index=True,
+                                 ondelete='cascade')
+    account_id = fields.Many2one('account.account', string='Account',
+                                 required=True, readonly=True, index=True,
+                                 ondelete='cascade')
+    journal_id = fields.Many2one('account.journal', string='Journal',
+                                 required=True, readonly=True,
+                                 ondelete='cascade')
+    date = fields.Date(string='Date', required=True, readonly=True,
+                       index=True)
+    debit = fields.Float(string='Debit', readonly=True)
+    credit = fields.Float(string='Credit', readonly=True)
+    line_count = fields.Integer(string='Journal Items', readonly=True)
+
+    _sql_constraints = [
+        ('snapshot_key_uniq',
+         'unique(move_id, account_id, journal_id, date)',
+         'Only one snapshot row is allowed per journal entry, account, '
+         'journal and day.'),
+    ]
+
+    def _auto_init(self):
+        """Drop the daily rows of the first layout, which have no journal
+        entry, before the required column is added; init() rebuilds them"""
+        cr = self.env.cr
+        if table_exists(cr, self._table) and not column_exists(
+                cr, self._table, 'move_id'):
+            cr.execute("DELETE FROM account_balance_snapshot")
+        return super(AccountBalanceSnapshot, self)._auto_init()
+
+    def init(self):
+        """Build the snapshot from the existing journal items on install,
+        and on update when the layout of the rows changed"""
+        params = self.env['ir.config_parameter'].sudo()
+        self.env.cr.execute("SELECT 1 FROM account_balance_snapshot LIMIT 1")
+        if not self.env.cr.rowcount or params.get_param(
+                SNAPSHOT_VERSION_PARAM) != SNAPSHOT_VERSION:
+            self._rebuild()
+            params.set_param(SNAPSHOT_VERSION_PARAM, SNAPSHOT_VERSION)
+
+    @api.model
+    def _rebuild(self):
+        self._flush_move_lines()
+        self.env.cr.execute("DELETE FROM account_balance_snapshot")
+        self.env.cr.execute("""
+            INSERT INTO account_balance_snapshot
+                (move_id, company_id, account_id, journal_id, date, debit,
+                 credit, line_count)
+            SELECT l.move_id, l.company_id, l.account_id, l.journal_id,
+                l.date, COALESCE(SUM(l.debit), 0),
+                COALESCE(SUM(l.credit), 0), COUNT(l.id)
+            FROM account_move_line l
+            WHERE l.parent_state = 'posted' AND l.account_id IS NOT NULL
+            GROUP BY l.move_id, l.company_id, l.account_id, l.journal_id,
+                l.date""")
+        self.invalidate_model()
+
+    def _flush_move_lines(self):
+        self.env['account.move.line'].flush_model(
+            ['move_id', 'company_id', 'account_id', 'journal_id', 'date',
+             'debit', 'credit', 'parent_state'])
+
+    @api.model
+    def _refresh_moves(self, moves):
+        """Recompute the snapshot rows of ``moves`` from their posted
+        journal items"""
+        move_ids = tuple(moves.exists().ids)
+        if not move_ids:
+            return
+        self._flush_move_lines()
+        self.env.cr.execute(
+            "DELETE FROM account_balance_snapshot WHERE move_id IN %s",
+            (move_ids,))
+        self.env.cr.execute("""
+            INSERT INTO account_balance_snapshot
+                (move_id, company_id, account_id, journal_id, date, debit,
+                 credit, line_count)
+            SELECT l.move_id, l.company_id, l.account_id, l.journal_id,
+                l.date, COALESCE(SUM(l.debit), 0),
+                COALESCE(SUM(l.credit), 0), COUNT(l.id)
+            FROM account_move_line l
+            WHERE l.move_id IN %s AND l.parent_state = 'posted'
+                AND l.account_id IS NOT NULL
+            GROUP BY l.move_id, l.company_id, l.account_id, l.journal_id,
+                l.date""", (move_ids,))
+        self.invalidate_model()
+
+    @api.model
+    def _query_get(self):
+        """Counterpart of account.move.line._query_get() reading the snapshot.
+
+        Returns None when the filters of the context cannot be answered from
+        the snapshot, i.e. when draft entries are included or a journal item
+        level filter is set; the caller then scans the journal items.
+        """
+        self.env['account.move.line'].check_access_rights('read')
+        context = dict(self._context or {})
+        state = context.get('state')
+        if not state or state.lower() != 'posted' or any(
+                context.get(key) for key in LINE_LEVEL_FILTERS):
+            return None
+        domain = []
+        if context.get('date_to'):
+            domain += [('date', '<=', context['date_to'])]
+        if context.get('date_from'):
+            if not context.get('strict_range'):
+                domain += ['|', ('date', '>=', context['date_from']),
+                           ('account_id.include_initial_balance', '=', True)]
+            elif context.get('initial_bal'):
+                domain += [('date', '<', context['date_from'])]
+            else:
+                domain += [('date', '>=', context['date_from'])]
+        if context.get('journal_ids'):
+            domain += [('journal_id', 'in', context['journal_ids'])]
+        if context.get('company_id'):
+            company_branches = self.env['res.company']._get_branch_ids(
+                context['company_id'])
+            common_ids = list(set(self.env.companies.ids) &
+                              set(company_branches))
+            domain += [('company_id', 'in', common_ids)]
+        elif context.get('allowed_company_ids'):
+            domain += [('company_id', 'in', self.env.companies.ids)]
+        else:
+            domain += [('company_id', '=', self.env.company.id)]
+        if context.get('account_tag_ids'):
+            domain += [
+                ('account_id.tag_ids', 'in', context['account_tag_ids'].ids)]
+        if context.get('account_ids'):
+            domain += [('account_id', 'in', context['account_ids'].ids)]
+        query = self._where_calc(domain)
+        self._apply_ir_rules(query)
+        return query.get_sql()
@@ -19,7 +19,7 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 #
 #############################################################################
-from odoo import models, _
+from odoo import fields, models, _
 
 
 class AccountJournal(models.Model):
@@ -27,6 +27,14 @@ class AccountJournal(models.Model):
     journal"""
     _inherit = "account.journal"
 
+    pdc_clearing_account_id = fields.Many2one(
+        'account.account', string='PDC Clearing Account', copy=False,
+        check_company=True,
+        domain="[('reconcile', '=', True), ('deprecated', '=', False)]",
+        help="Matured PDCs are moved from their outstanding account to this "
+             "account, where they stay open until the bank statement line "
+             "of the deposit is reconciled with them.")
+
     def action_open_reconcile(self):
         """Function to open reconciliation view for bank statements
         belonging to this journal"""
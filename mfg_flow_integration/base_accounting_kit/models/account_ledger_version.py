@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+#############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2023-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: Cybrosys Techno Solutions(<https://www.cybrosys.com>)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+from odoo import api, fields, models
+
+# Key of the companies whose ledger changed in the current transaction, in
+# cr.postcommit.data
+PENDING_COMPANIES_KEY = 'base_accounting_kit.ledger_version_companies'
+
+
+class AccountLedgerVersion(models.Model):
+    """Version counter of the journal items of each company. A company's
+    version is incremented after every transaction that creates, edits,
+    posts, cancels, reconciles or deletes its journal entries, so results
+    computed from the ledger can be keyed on it instead of being
+    invalidated."""
+    _name = 'account.ledger.version'
+    _description = 'Ledger Version'
+    _log_access = False
+
+    company_id = fields.Many2one('res.company', string='Company',
+                                 required=True, readonly=True,
+                                 ondelete='cascade')
+    version = fields.Integer(string='Version', required=True, readonly=True,
+                             default=0)
+
+    _sql_constraints = [
+        ('company_uniq', 'unique(company_id)',
+         'Only one ledger version is allowed per company.'),
+    ]
+
+    @api.model
+    def _get_versions(self, company_ids):
+        """Return the ((company_id, version), ...) tuple of the given
+        companies, sorted by company"""
+        company_ids = sorted(set(company_ids))
+        if not company_ids:
+            return ()
+        self.env.cr.execute("""
+            SELECT company_id, version FROM account_ledger_version
+            WHERE company_id IN %s""", [tuple(company_ids)])
+        versions = dict(self.env.cr.fetchall())
+        return tuple((company_id, versions.get(company_id, 0))
+                     for company_id in company_ids)
+
+    @api.model
+    def _has_pending_changes(self):
+        """Whether the current transaction changed a ledger whose version is
+        not bumped yet"""
+        return bool(self.env.cr.postcommit.data.get(PENDING_COMPANIES_KEY))
+
+    @api.model
+    def _bump(self, company_ids):
+        """Increment the version of the given companies once the current
+        transaction is committed, so that a version is never paired with
+        data that is not visible yet. The update runs in its own short
+        transaction to keep concurrent postings from waiting on the row."""
+        postcommit = self.env.cr.postcommit
+        pending = postcommit.data.get(PENDING_COMPANIES_KEY)
+        if pending is None:
+            pending = postcommit.data[PENDING_COMPANIES_KEY] = set()
+            registry = self.env.registry
+
+            @postcommit.add
+            def bump_ledger_versions():
+                if not pending:
+                    return
+                with registry.cursor() as cr:
+                    cr.execute("""
+                        INSERT INTO account_ledger_version (company_id, version)
+                        SELECT company_id, 1
+                        FROM unnest(%s::int[]) AS company_id
+                        ORDER BY company_id
+                        ON CONFLICT (company_id) DO UPDATE
+                        SET version = account_ledger_version.version + 1
+                    """, [sorted(pending)])
+        pending.update(company_ids)
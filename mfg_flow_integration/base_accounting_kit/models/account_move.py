@@ -25,6 +25,30 @@ from dateutil.relativedelta import relativedelta
 from odoo import api, fields, models, _
 from odoo.exceptions import UserError
 from odoo.tools import DEFAULT_SERVER_DATE_FORMAT as DF
+from odoo.tools.sql import column_exists, create_column, create_index
+from .account_balance_snapshot import SNAPSHOT_LINE_FIELDS, \
+    SNAPSHOT_MOVE_FIELDS
+
+# Context keys account.move.line._query_get() filters on
+QUERY_GET_CONTEXT_KEYS = ('aged_balance', 'date_from', 'date_to',
+                          'strict_range', 'initial_bal', 'journal_ids',
+                          'state', 'company_id', 'reconcile_date',
+                          'account_tag_ids', 'account_ids',
+                          'analytic_tag_ids', 'analytic_account_ids',
+                          'partner_ids', 'partner_categories')
+
+# Fields changing the figures of the cached reports, the ledger version is
+# bumped when they are written on posted entries and journal items
+LEDGER_MOVE_FIELDS = SNAPSHOT_MOVE_FIELDS | {'state', 'partner_id',
+                                             'line_ids'}
+LEDGER_LINE_FIELDS = SNAPSHOT_LINE_FIELDS | {
+    'amount_currency', 'partner_id', 'tax_ids', 'tax_line_id',
+    'tax_tag_ids', 'analytic_distribution', 'move_id'}
+
+# Journal items still open at a date: not fully reconciled, or fully
+# reconciled after that date. Matches account_move_line_open_as_of_index.
+OPEN_AS_OF_CLAUSE = """COALESCE("account_move_line".full_reconcile_date,
+    'infinity'::date) > %s"""
 
 
 class AccountMove(models.Model):
@@ -42,7 +66,50 @@ class AccountMove(models.Model):
         for move in self:
             for line in move.asset_depreciation_ids:
                 line.move_posted_check = False
-        return super(AccountMove, self).button_cancel()
+        res = super(AccountMove, self).button_cancel()
+        self.env['account.balance.snapshot']._refresh_moves(self)
+        return res
+
+    def button_draft(self):
+        """Remove the entries reset to draft from the balance snapshot"""
+        res = super(AccountMove, self).button_draft()
+        self.env['account.balance.snapshot']._refresh_moves(self)
+        return res
+
+    def _post(self, soft=True):
+        """Add the posted entries to the balance snapshot"""
+        posted = super(AccountMove, self)._post(soft=soft)
+        self.env['account.balance.snapshot']._refresh_moves(posted)
+        return posted
+
+    def unlink(self):
+        companies = self.filtered(
+            lambda move: move.state == 'posted').company_id
+        res = super(AccountMove, self).unlink()
+        self.env['account.move.line']._bump_ledger_version(companies)
+        return res
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        moves = super(AccountMove, self).create(vals_list)
+        self.env['account.move.line']._bump_ledger_version(moves.filtered(
+            lambda move: move.state == 'posted').company_id)
+        return moves
+
+    def write(self, vals):
+        ledger_moves = self.filtered(lambda move: move.state == 'posted') \
+            if LEDGER_MOVE_FIELDS.intersection(vals) else self.browse()
+        companies = ledger_moves.company_id
+        res = super(AccountMove, self).write(vals)
+        if SNAPSHOT_MOVE_FIELDS.intersection(vals):
+            self.env['account.balance.snapshot']._refresh_moves(
+                self.filtered(lambda move: move.state == 'posted'))
+        if LEDGER_MOVE_FIELDS.intersection(vals):
+            ledger_moves |= self.filtered(
+                lambda move: move.state == 'posted')
+            self.env['account.move.line']._bump_ledger_version(
+                companies | ledger_moves.company_id)
+        return res
 
     def post(self):
         """Supering the post method to mapped the asset depreciation records"""
@@ -97,6 +164,97 @@ class AccountInvoiceLine(models.Model):
                              compute='_get_asset_date',
                              readonly=True, digits='Account',
                              store=True)
+    full_reconcile_date = fields.Date(
+        string='Fully Reconciled On', compute='_compute_full_reconcile_date',
+        store=True, readonly=True, copy=False,
+        help="Date of the last reconciliation of the item once it is fully "
+             "reconciled. The item is open as of any earlier date.")
+
+    def _auto_init(self):
+        """Create and fill the reconciliation date in SQL, the ORM would
+        recompute it line by line on large ledgers"""
+        cr = self.env.cr
+        if not column_exists(cr, 'account_move_line', 'full_reconcile_date'):
+            create_column(cr, 'account_move_line', 'full_reconcile_date',
+                          'date')
+            cr.execute("""
+                UPDATE account_move_line l
+                SET full_reconcile_date = COALESCE(GREATEST(
+                    (SELECT MAX(part.max_date)
+                     FROM account_partial_reconcile part
+                     WHERE part.debit_move_id = l.id),
+                    (SELECT MAX(part.max_date)
+                     FROM account_partial_reconcile part
+                     WHERE part.credit_move_id = l.id)), l.date)
+                WHERE l.reconciled""")
+        return super(AccountInvoiceLine, self)._auto_init()
+
+    def init(self):
+        super(AccountInvoiceLine, self).init()
+        create_index(self.env.cr, 'account_move_line_open_as_of_index',
+                     'account_move_line',
+                     ["COALESCE(full_reconcile_date, 'infinity'::date)"])
+
+    @api.depends('reconciled', 'date', 'matched_debit_ids.max_date',
+                 'matched_credit_ids.max_date')
+    def _compute_full_reconcile_date(self):
+        for line in self:
+            if not line.reconciled:
+                line.full_reconcile_date = False
+                continue
+            dates = (line.matched_debit_ids |
+                     line.matched_credit_ids).mapped('max_date')
+            line.full_reconcile_date = max(dates) if dates else line.date
+
+    @api.model
+    def _get_ledger_version(self, company_ids=None):
+        """Return the current version of the ledger of the given companies,
+        the companies of the environment by default"""
+        if company_ids is None:
+            company_ids = self.env.companies.ids
+        return self.env['account.ledger.version']._get_versions(company_ids)
+
+    @api.model
+    def _bump_ledger_version(self, companies):
+        """Increment the ledger version of ``companies`` once the current
+        transaction is committed"""
+        self.env['account.ledger.version']._bump(companies.ids)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        lines = super(AccountInvoiceLine, self).create(vals_list)
+        posted = lines.filtered(lambda line: line.parent_state == 'posted')
+        self.env['account.balance.snapshot']._refresh_moves(posted.move_id)
+        self._bump_ledger_version(posted.company_id)
+        return lines
+
+    def write(self, vals):
+        ledger_lines = self.filtered(
+            lambda line: line.parent_state == 'posted') \
+            if LEDGER_LINE_FIELDS.intersection(vals) else self.browse()
+        companies = ledger_lines.company_id
+        moves = self.filtered(
+            lambda line: line.parent_state == 'posted').move_id \
+            if SNAPSHOT_LINE_FIELDS.intersection(vals) \
+            else self.env['account.move']
+        res = super(AccountInvoiceLine, self).write(vals)
+        if SNAPSHOT_LINE_FIELDS.intersection(vals):
+            moves |= self.filtered(
+                lambda line: line.parent_state == 'posted').move_id
+            self.env['account.balance.snapshot']._refresh_moves(moves)
+        if LEDGER_LINE_FIELDS.intersection(vals):
+            ledger_lines |= self.filtered(
+                lambda line: line.parent_state == 'posted')
+            self._bump_ledger_version(companies | ledger_lines.company_id)
+        return res
+
+    def unlink(self):
+        posted = self.filtered(lambda line: line.parent_state == 'posted')
+        moves = posted.move_id
+        self._bump_ledger_version(posted.company_id)
+        res = super(AccountInvoiceLine, self).unlink()
+        self.env['account.balance.snapshot']._refresh_moves(moves)
+        return res
 
     @api.depends('asset_category_id', 'move_id.invoice_date')
     def _get_asset_date(self):
@@ -198,13 +356,40 @@ class AccountInvoiceLine(models.Model):
                                                                fpos, company)
 
     @api.model
+    def _get_query_get_key(self, domain):
+        """Normalize the filters of ``_query_get`` into a hashable key"""
+        values = []
+        for key in QUERY_GET_CONTEXT_KEYS:
+            value = self._context.get(key)
+            if isinstance(value, models.BaseModel):
+                value = (value._name, tuple(value.ids))
+            elif isinstance(value, list):
+                value = tuple(value)
+            values.append(value)
+        return (self.env.uid, self.env.su, tuple(self.env.companies.ids),
+                self.env.company.id, repr(domain), tuple(values))
+
     def _query_get(self, domain=None):
-        """Used to add domain constraints to the query"""
+        """Used to add domain constraints to the query.
+
+        The compiled (tables, where clause, params) are kept for the rest of
+        the transaction, keyed on the filters of the context, since the
+        reports call this for every section, account or partner they print.
+        """
         self.check_access_rights('read')
-        context = dict(self._context or {})
         domain = domain or []
         if not isinstance(domain, (list, tuple)):
             domain = ast.literal_eval(domain)
+        cache = self.env.cr.precommit.data.setdefault(
+            'base_accounting_kit.query_get', {})
+        key = self._get_query_get_key(domain)
+        if key not in cache:
+            cache[key] = self._compile_query_get(list(domain))
+        tables, where_clause, where_clause_params = cache[key]
+        return tables, where_clause, list(where_clause_params)
+
+    def _compile_query_get(self, domain):
+        context = dict(self._context or {})
         date_field = 'date'
         if context.get('aged_balance'):
             date_field = 'date_maturity'
@@ -224,20 +409,15 @@ class AccountInvoiceLine(models.Model):
         if state and state.lower() != 'all':
             domain += [('parent_state', '=', state)]
         if context.get('company_id'):
-            company_branches = self.env['res.company'].browse([context['company_id']]).mapped('child_ids').ids
-            company_branches.append(context['company_id'])
-            common_ids = list(set(context['allowed_company_ids']) & set(company_branches))
+            company_branches = self.env['res.company']._get_branch_ids(
+                context['company_id'])
+            common_ids = list(set(self.env.companies.ids) &
+                              set(company_branches))
             domain += [('company_id', 'in', common_ids)]
         elif context.get('allowed_company_ids'):
             domain += [('company_id', 'in', self.env.companies.ids)]
         else:
             domain += [('company_id', '=', self.env.company.id)]
-        if context.get('reconcile_date'):
-            domain += ['|', ('reconciled', '=', False), '|',
-                       ('matched_debit_ids.max_date', '>',
-                        context['reconcile_date']),
-                       ('matched_credit_ids.max_date', '>',
-                        context['reconcile_date'])]
         if context.get('account_tag_ids'):
             domain += [
                 ('account_id.tag_ids', 'in', context['account_tag_ids'].ids)]
@@ -266,4 +446,11 @@ class AccountInvoiceLine(models.Model):
             # company access rights.
             self._apply_ir_rules(query)
             tables, where_clause, where_clause_params = query.get_sql()
-        return tables, where_clause, where_clause_params
+            if context.get('reconcile_date'):
+                # one indexed predicate instead of the ORM subselects of
+                # matched_debit_ids / matched_credit_ids
+                where_clause = '(%s) AND %s' % (where_clause,
+                                                OPEN_AS_OF_CLAUSE)
+                where_clause_params = list(where_clause_params) + [
+                    context['reconcile_date']]
+        return tables, where_clause, tuple(where_clause_params)
@@ -19,9 +19,17 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 #
 #############################################################################
-from odoo import api, fields, models, _
+import logging
+from collections import defaultdict
+
+from odoo import api, fields, models, tools, _
 from odoo.exceptions import UserError
 
+_logger = logging.getLogger(__name__)
+
+# Matured PDCs cleared by the scheduled action between two commits
+PDC_CLEARING_CHUNK_SIZE = 500
+
 
 class AccountRegisterPayments(models.TransientModel):
     """Inherits the account.payment.register model to add the new
@@ -40,9 +48,10 @@ class AccountRegisterPayments(models.TransientModel):
         res = super(AccountRegisterPayments, self)._prepare_payment_vals(
             invoices)
         # Check payment method is Check or PDC
-        check_pdc_ids = self.env['account.payment.method'].search(
-            [('code', 'in', ['pdc', 'check_printing'])])
-        if self.payment_method_id.id in check_pdc_ids.ids:
+        check_pdc_ids = self.env[
+            'account.payment.method']._get_method_ids_by_code(
+            ('pdc', 'check_printing'))
+        if self.payment_method_id.id in check_pdc_ids:
             currency_id = self.env['res.currency'].browse(res['currency_id'])
             journal_id = self.env['account.journal'].browse(res['journal_id'])
             # Updating values in case of Multi payments
@@ -88,12 +97,10 @@ class AccountRegisterPayments(models.TransientModel):
         """USed to create a list of payments and update the bank and
          cheque reference"""
         payments = super(AccountRegisterPayments, self)._create_payments()
-
-        for payment in payments:
-            payment.write({
-                'bank_reference': self.bank_reference,
-                'cheque_reference': self.cheque_reference
-            })
+        payments.write({
+            'bank_reference': self.bank_reference,
+            'cheque_reference': self.cheque_reference
+        })
         return payments
 
 
@@ -107,6 +114,176 @@ class AccountPayment(models.Model):
     effective_date = fields.Date('Effective Date',
                                  help='Effective date of PDC', copy=False,
                                  default=False)
+    pdc_cleared = fields.Boolean(string='PDC Cleared', copy=False,
+                                 readonly=True,
+                                 help="The cheque matured and its amount was "
+                                      "moved to the PDC clearing account of "
+                                      "the journal, to be reconciled with "
+                                      "the bank statement line of the "
+                                      "deposit. Cheques booked on the bank "
+                                      "account directly are marked cleared "
+                                      "without a clearing entry.")
+    pdc_clearing_move_id = fields.Many2one('account.move',
+                                           string='PDC Clearing Entry',
+                                           copy=False, readonly=True,
+                                           index='btree_not_null')
+
+    @api.model
+    def _get_due_pdc_domain(self, date):
+        """Domain of the posted PDCs maturing on or before ``date``"""
+        return [('payment_method_id', 'in', self.env[
+            'account.payment.method']._get_method_ids_by_code(('pdc',))),
+                ('state', '=', 'posted'),
+                ('pdc_cleared', '=', False),
+                ('effective_date', '<=', date)]
+
+    def _get_pdc_outstanding_lines(self):
+        """Lines of the payments on their outstanding account"""
+        return self.env['account.move.line'].concat(
+            *(payment._seek_for_lines()[0] for payment in self))
+
+    def _prepare_pdc_clearing_move_vals(self, journal, date, currency):
+        """Values of the entry moving the cheques of ``self``, all of
+        ``journal`` and ``currency`` maturing on ``date``, from their
+        outstanding account to the PDC clearing account of the journal,
+        one clearing line per cheque for the bank statement matching"""
+        line_vals = []
+        for payment in self:
+            name = _("PDC %s", payment.cheque_reference or payment.name)
+            for line in payment._seek_for_lines()[0]:
+                for account, sign in ((line.account_id, -1),
+                                      (journal.pdc_clearing_account_id, 1)):
+                    line_vals.append((0, 0, {
+                        'name': name,
+                        'account_id': account.id,
+                        'partner_id': line.partner_id.id,
+                        'currency_id': currency.id,
+                        'amount_currency': sign * line.amount_currency,
+                        'balance': sign * line.balance,
+                    }))
+        return {
+            'move_type': 'entry',
+            'journal_id': journal.id,
+            'date': date,
+            'ref': _("PDC clearing of %s", date),
+            'line_ids': line_vals,
+        }
+
+    def _clear_pdc(self):
+        """Clear the matured PDCs of ``self`` with one entry per bank
+        journal, currency and effective date, posted together, then
+        reconcile the outstanding lines of the payments with it.
+
+        The bank account itself is never debited: the clearing lines stay
+        open on the PDC clearing account of the journal until the bank
+        statement line of the deposit is reconciled with them, so the
+        deposit is booked on the bank account once. Cheques already booked
+        on the bank or clearing account have nothing to move: they are
+        marked cleared without a clearing entry.
+        """
+        groups = defaultdict(lambda: self.browse())
+        for payment in self:
+            groups[payment.journal_id, payment.effective_date,
+                   payment.currency_id] |= payment
+        vals_list = []
+        group_payments = []
+        for (journal, date, currency), payments in groups.items():
+            # nothing to move when the cheques were booked on the bank or
+            # clearing account directly
+            payments = payments.filtered(
+                lambda p: p._seek_for_lines()[0].account_id not in (
+                    journal.default_account_id |
+                    journal.pdc_clearing_account_id))
+            if payments and not journal.pdc_clearing_account_id:
+                raise UserError(_(
+                    "Set the PDC clearing account of the journal %s to "
+                    "clear its PDCs.", journal.display_name))
+            if payments:
+                vals_list.append(payments._prepare_pdc_clearing_move_vals(
+                    journal, date, currency))
+                group_payments.append(payments)
+        moves = self.env['account.move'].create(vals_list)
+        moves.action_post()
+        for move, payments in zip(moves, group_payments):
+            payments.write({'pdc_clearing_move_id': move.id})
+            outstanding_lines = payments._get_pdc_outstanding_lines()
+            for account in outstanding_lines.account_id.filtered('reconcile'):
+                (outstanding_lines + move.line_ids).filtered(
+                    lambda l: l.account_id == account).reconcile()
+        self.write({'pdc_cleared': True})
+        return moves
+
+    def action_clear_pdc(self):
+        """Clear the selected PDCs that have matured"""
+        payments = self.filtered_domain(
+            self._get_due_pdc_domain(fields.Date.context_today(self)))
+        if not payments:
+            raise UserError(_("None of the selected payments is a posted PDC "
+                              "that has matured."))
+        moves = payments._clear_pdc()
+        return {
+            'name': _('PDC Clearing Entries'),
+            'view_mode': 'tree,form',
+            'res_model': 'account.move',
+            'type': 'ir.actions.act_window',
+            'domain': [('id', 'in', moves.ids)],
+        }
+
+    @api.model
+    def _clear_pdc_chunk(self, groups):
+        """Clear the payments of ``groups``, a list of recordsets of one
+        journal and day each. When the chunk fails, its groups are cleared
+        one by one, and those failing again are logged and left for the
+        next run"""
+        try:
+            with self.env.cr.savepoint():
+                return self.concat(*groups)._clear_pdc()
+        except Exception:
+            self.env.invalidate_all()
+            if len(groups) == 1:
+                _logger.exception("Clearing the PDCs %s failed",
+                                  groups[0].ids)
+                return self.env['account.move']
+        moves = self.env['account.move']
+        for payments in groups:
+            try:
+                with self.env.cr.savepoint():
+                    moves |= payments._clear_pdc()
+            except Exception:
+                self.env.invalidate_all()
+                _logger.exception("Clearing the PDCs %s failed",
+                                  payments.ids)
+        return moves
+
+    @api.model
+    def _cron_clear_due_pdc(self, chunk_size=PDC_CLEARING_CHUNK_SIZE):
+        """Clear the PDCs matured today or before, company by company in
+        order of effective date. A journal and day are never split across
+        chunks, the transaction is committed after every chunk and a
+        failing journal and day do not block the others"""
+        today = fields.Date.context_today(self)
+        for company in self.env['res.company'].search([]):
+            Payment = self.with_company(company)
+            domain = self._get_due_pdc_domain(today) + [
+                ('company_id', '=', company.id)]
+            groups = []
+            count = 0
+            for date, journal in Payment._read_group(
+                    domain, ['effective_date:day', 'journal_id'],
+                    order='effective_date:day, journal_id'):
+                payments = Payment.search(domain + [
+                    ('effective_date', '=', date),
+                    ('journal_id', '=', journal.id)])
+                groups.append(payments)
+                count += len(payments)
+                if count >= chunk_size:
+                    Payment._clear_pdc_chunk(groups)
+                    self.env.cr.commit()
+                    groups = []
+                    count = 0
+            if groups:
+                Payment._clear_pdc_chunk(groups)
+                self.env.cr.commit()
 
     def open_payment_matching_screen(self):
         """Open reconciliation view for customers/suppliers"""
@@ -205,6 +382,22 @@ class AccountPaymentMethod(models.Model):
     _get_payment_method_information function"""
     _inherit = "account.payment.method"
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        self.env.registry.clear_cache()
+        return super().create(vals_list)
+
+    def write(self, vals):
+        if 'code' in vals:
+            self.env.registry.clear_cache()
+        return super().write(vals)
+
+    @api.model
+    @tools.ormcache('codes')
+    def _get_method_ids_by_code(self, codes):
+        """Return the ids of the payment methods of the given codes"""
+        return tuple(self.sudo().search([('code', 'in', list(codes))]).ids)
+
     @api.model
     def _get_payment_method_information(self):
         """Super the function to update the pdc values"""
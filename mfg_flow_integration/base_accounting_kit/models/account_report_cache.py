@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+#############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2023-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: Cybrosys Techno Solutions(<https://www.cybrosys.com>)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+import copy
+import threading
+
+from odoo import api, models
+from odoo.tools.lru import LRU
+
+# Default number of report results kept per database and worker
+DEFAULT_REPORT_CACHE_SIZE = 256
+
+# {dbname: {'lru': LRU, 'hits': int, 'misses': int}}, per worker process
+_report_caches = {}
+_report_caches_lock = threading.Lock()
+
+
+class AccountReportCache(models.AbstractModel):
+    """Results of the accounting reports, kept in memory by each worker.
+
+    An entry is keyed on the report, its own options, the filters of
+    ``account.move.line._query_get()`` for the current context, the company
+    set and the ledger versions of those companies. Posting, cancelling or
+    editing the amounts of a posted entry bumps the ledger version of its
+    company, so the outdated results are never read again and age out of
+    the LRU. Draft entries do not bump it, so only the reports on posted
+    entries are cached."""
+    _name = 'account.report.cache'
+    _description = 'Accounting Report Cache'
+
+    @api.model
+    def _get_cache_size(self):
+        size = self.env['ir.config_parameter'].sudo().get_param(
+            'base_accounting_kit.report_cache_size',
+            DEFAULT_REPORT_CACHE_SIZE)
+        try:
+            return max(int(size), 0)
+        except ValueError:
+            return DEFAULT_REPORT_CACHE_SIZE
+
+    @api.model
+    def _get_cache(self):
+        """Return the cache of the current database, resized to the
+        configured size if needed"""
+        size = self._get_cache_size()
+        dbname = self.env.cr.dbname
+        with _report_caches_lock:
+            cache = _report_caches.get(dbname)
+            if cache is None:
+                cache = _report_caches[dbname] = {
+                    'lru': LRU(max(size, 1)), 'hits': 0, 'misses': 0}
+            elif cache['lru'].count != max(size, 1):
+                cache['lru'] = LRU(max(size, 1))
+        return cache if size else None
+
+    @api.model
+    def _get_definition_version(self, model_names):
+        """Return the (count, last write date) of the records of each model,
+        to tell whether the definition of a report changed"""
+        versions = []
+        for model_name in model_names:
+            self.env.cr.execute(
+                'SELECT count(*), max(write_date) FROM "%s"'
+                % self.env[model_name]._table)
+            versions.append(self.env.cr.fetchone())
+        return tuple(versions)
+
+    @api.model
+    def _get_cache_key(self, report, options, definition_models):
+        MoveLine = self.env['account.move.line']
+        tables, where_clause, where_params = MoveLine._query_get()
+        companies = tuple(sorted(self.env.companies.ids))
+        return (report, options, tables, where_clause, repr(where_params),
+                self.env.lang, companies,
+                MoveLine._get_ledger_version(companies),
+                self._get_definition_version(definition_models))
+
+    @api.model
+    def _get_or_compute(self, report, options, compute,
+                        definition_models=()):
+        """Return the result of ``compute()`` for ``report`` and the
+        hashable ``options`` of the report, from the cache when the ledgers
+        did not change since it was computed.
+
+        :param definition_models: models the report is configured with; the
+            cached results are dropped as soon as one of their records is
+            created, changed or deleted
+
+        Results including draft entries, and those computed while the
+        current transaction holds unbumped ledger changes, are not cached.
+        """
+        cache = self._get_cache()
+        if cache is None or (self._context.get('state') or '').lower() != \
+                'posted' or self.env[
+                    'account.ledger.version']._has_pending_changes():
+            return compute()
+        key = self._get_cache_key(report, options, definition_models)
+        try:
+            value = cache['lru'][key]
+        except KeyError:
+            cache['misses'] += 1
+            value = compute()
+            cache['lru'][key] = copy.deepcopy(value)
+            return value
+        cache['hits'] += 1
+        return copy.deepcopy(value)
+
+    @api.model
+    def _get_stats(self):
+        cache = _report_caches.get(self.env.cr.dbname) or {}
+        return {
+            'entries': len(cache['lru']) if cache else 0,
+            'hits': cache.get('hits', 0),
+            'misses': cache.get('misses', 0),
+        }
+
+    @api.model
+    def _clear(self):
+        with _report_caches_lock:
+            _report_caches.pop(self.env.cr.dbname, None)
@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*-
+#############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2023-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: Cybrosys Techno Solutions(<https://www.cybrosys.com>)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+import hashlib
+import json
+import logging
+
+from odoo import api, fields, models, _
+from odoo.exceptions import UserError
+
+_logger = logging.getLogger(__name__)
+
+# Context keys of the wizard kept to compute the report in the background
+JOB_CONTEXT_KEYS = ('active_model', 'active_ids', 'active_id', 'lang', 'tz',
+                    'allowed_company_ids', 'landscape', 'discard_logo_check')
+# Wizard fields which are not report options
+JOB_IGNORED_FIELDS = ('id', 'display_name', 'create_uid', 'create_date',
+                      'write_uid', 'write_date')
+# First key of the session advisory lock a worker holds on its job while
+# running it, the second one being the id of the job
+JOB_LOCK_KEY = 4215380
+# Runs of a job before it is failed, when its worker keeps dying
+JOB_MAX_ATTEMPTS = 3
+
+
+class AccountReportJob(models.Model):
+    """Accounting report computed and rendered in the background.
+
+    The report wizards enqueue a job instead of rendering the report inside
+    the HTTP request; the jobs are processed by the 'Process Accounting
+    Report Jobs' scheduled action, which renders the report to an
+    attachment. Every copy of that scheduled action is an additional worker:
+    the jobs are claimed with ``SKIP LOCKED`` so several of them can run at
+    the same time. A finished job is reused as long as the same options are
+    requested and the ledger did not change since it was computed.
+
+    The values of the wizard are copied into the job, so the report can be
+    computed after the wizard has been vacuumed. A worker holds a session
+    advisory lock on its job for the whole run, however long the rendering
+    takes; PostgreSQL releases it when the worker dies, so a running job
+    whose lock is free is queued again.
+    """
+    _name = 'account.report.job'
+    _description = 'Accounting Report Job'
+    _order = 'id desc'
+
+    name = fields.Char(string='Report', required=True, readonly=True)
+    res_model = fields.Char(string='Wizard Model', required=True,
+                            readonly=True)
+    res_id = fields.Integer(string='Wizard', required=True, readonly=True)
+    method = fields.Char(string='Wizard Method', required=True,
+                         readonly=True)
+    context = fields.Text(string='Context', readonly=True)
+    wizard_values = fields.Text(string='Wizard Values', readonly=True,
+                                help="Values recreating the wizard once it "
+                                     "has been vacuumed.")
+    attempt_count = fields.Integer(string='Attempts', readonly=True)
+    params_key = fields.Char(string='Options Key', required=True,
+                             readonly=True, index=True)
+    ledger_version = fields.Char(string='Ledger Version', readonly=True,
+                                 help="Versions of the ledgers of the "
+                                      "companies the report was computed "
+                                      "from.")
+    state = fields.Selection(selection=[('queued', 'Queued'),
+                                        ('running', 'Running'),
+                                        ('done', 'Done'),
+                                        ('failed', 'Failed')],
+                             string='Status', default='queued', required=True,
+                             readonly=True, index=True)
+    progress = fields.Integer(string='Progress', readonly=True)
+    progress_message = fields.Char(string='Step', readonly=True)
+    attachment_id = fields.Many2one('ir.attachment', string='Result',
+                                    readonly=True, ondelete='set null')
+    error = fields.Text(string='Error', readonly=True)
+    user_id = fields.Many2one('res.users', string='Requested By',
+                              required=True, readonly=True,
+                              default=lambda self: self.env.user)
+    company_id = fields.Many2one('res.company', string='Company',
+                                 required=True, readonly=True,
+                                 default=lambda self: self.env.company)
+    date_start = fields.Datetime(string='Started On', readonly=True)
+    date_done = fields.Datetime(string='Finished On', readonly=True)
+
+    @api.model
+    def _get_params_key(self, wizard, method, context):
+        """Hash of the report options: the wizard values, the method
+        printing the report, the user and the context"""
+        values = wizard.read([name for name in wizard._fields
+                              if name not in JOB_IGNORED_FIELDS])[0]
+        values.pop('id', None)
+        params = [wizard._name, method, self.env.uid, context, values]
+        return hashlib.sha1(json.dumps(
+            params, sort_keys=True, default=str).encode()).hexdigest()
+
+    @api.model
+    def _get_wizard_values(self, wizard):
+        """Values creating a copy of ``wizard``, its lines included"""
+        values = wizard.copy_data()[0]
+        for name, field in wizard._fields.items():
+            if field.type == 'one2many' and field.store and \
+                    name not in values:
+                values[name] = [(0, 0, line.copy_data()[0])
+                                for line in wizard[name]]
+        return values
+
+    def _try_lock(self):
+        """Take the advisory lock of the job for the session of the cursor,
+        return whether it was free"""
+        self.ensure_one()
+        self.env.cr.execute("SELECT pg_try_advisory_lock(%s, %s)",
+                            (JOB_LOCK_KEY, self.id))
+        return self.env.cr.fetchone()[0]
+
+    def _unlock(self):
+        self.ensure_one()
+        self.env.cr.execute("SELECT pg_advisory_unlock(%s, %s)",
+                            (JOB_LOCK_KEY, self.id))
+
+    @api.model
+    def _requeue_dead_jobs(self):
+        """Queue again the running jobs whose worker died, i.e. whose lock
+        is free, or fail them when they keep dying"""
+        for job in self.search([('state', '=', 'running')]):
+            if not job._try_lock():
+                continue
+            try:
+                # new snapshot: the worker may have finished in between
+                self.env.cr.commit()
+                job.invalidate_recordset()
+                if job.state != 'running':
+                    continue
+                if job.attempt_count >= JOB_MAX_ATTEMPTS:
+                    job.write({'state': 'failed',
+                               'error': _("The job was interrupted.")})
+                else:
+                    job.write({'state': 'queued', 'progress': 0,
+                               'progress_message': False})
+                self.env.cr.commit()
+            finally:
+                job._unlock()
+
+    @api.model
+    def _enqueue(self, wizard, method):
+        """Queue the report printed by ``method`` of ``wizard``, or reuse a
+        job computing or having computed the same report. Like the report
+        cache, finished jobs are only reused for reports on posted entries:
+        draft entries do not bump the ledger version.
+
+        :return: action downloading the report if it is available, else
+                 showing the job
+        """
+        wizard.ensure_one()
+        context = {key: self.env.context[key] for key in JOB_CONTEXT_KEYS
+                   if key in self.env.context}
+        params_key = self._get_params_key(wizard, method, context)
+        ledger_version = str(
+            wizard.env['account.move.line']._get_ledger_version())
+        domain = [('state', 'in', ('queued', 'running'))]
+        if 'target_move' in wizard._fields and \
+                wizard.target_move == 'posted':
+            domain = ['|'] + domain + [
+                '&', '&', ('state', '=', 'done'),
+                ('ledger_version', '=', ledger_version),
+                ('attachment_id', '!=', False)]
+        job = self.search([
+            ('params_key', '=', params_key),
+            ('user_id', '=', self.env.uid)] + domain, limit=1)
+        if job.state == 'done':
+            return job.action_download()
+        if not job:
+            job = self.create({
+                'name': wizard._description,
+                'res_model': wizard._name,
+                'res_id': wizard.id,
+                'method': method,
+                'context': json.dumps(context),
+                'wizard_values': json.dumps(
+                    self._get_wizard_values(wizard), default=str),
+                'params_key': params_key,
+            })
+            cron = self.env.ref(
+                'base_accounting_kit.ir_cron_account_report_job',
+                raise_if_not_found=False)
+            if cron:
+                cron._trigger()
+        return {
+            'type': 'ir.actions.act_window',
+            'name': _('Report Job'),
+            'res_model': self._name,
+            'res_id': job.id,
+            'view_mode': 'form',
+            'target': 'new',
+        }
+
+    def action_download(self):
+        self.ensure_one()
+        if not self.attachment_id:
+            raise UserError(_("The report is not available yet."))
+        return {
+            'type': 'ir.actions.act_url',
+            'url': '/web/content/%s?download=true' % self.attachment_id.id,
+            'target': 'self',
+        }
+
+    def action_retry(self):
+        self.filtered(lambda job: job.state == 'failed').write({
+            'state': 'queued', 'progress': 0, 'progress_message': False,
+            'error': False, 'attempt_count': 0})
+        self.env.ref('base_accounting_kit.ir_cron_account_report_job')._trigger()
+
+    def _set_progress(self, progress, message):
+        """Record the progress of the job and commit it, so that it is
+        visible while the job runs"""
+        self.write({'progress': progress, 'progress_message': message})
+        self.env.cr.commit()
+
+    @api.model
+    def _cron_process_jobs(self, job_limit=None):
+        """Process the queued jobs one after the other. Several copies of the
+        scheduled action may run concurrently, each job being claimed by a
+        single worker."""
+        self._requeue_dead_jobs()
+        count = 0
+        while job_limit is None or count < job_limit:
+            self.env.cr.execute("""
+                SELECT id FROM account_report_job WHERE state = 'queued'
+                ORDER BY id LIMIT 1 FOR UPDATE SKIP LOCKED""")
+            row = self.env.cr.fetchone()
+            if not row:
+                break
+            job = self.browse(row[0])
+            if not job._try_lock():
+                # being requeued by another worker, leave it to the next run
+                self.env.cr.rollback()
+                break
+            try:
+                job.write({'state': 'running',
+                           'date_start': fields.Datetime.now(),
+                           'progress': 0,
+                           'attempt_count': job.attempt_count + 1})
+                self.env.cr.commit()
+                job._run()
+            finally:
+                job._unlock()
+            count += 1
+
+    def _run(self):
+        self.ensure_one()
+        try:
+            self._set_progress(10, _("Computing"))
+            Wizard = self.env[self.res_model].with_user(
+                self.user_id).with_company(self.company_id).with_context(
+                json.loads(self.context or '{}'))
+            wizard = Wizard.browse(self.res_id).exists()
+            if not wizard and self.wizard_values:
+                # the wizard was vacuumed while the job was queued
+                wizard = Wizard.create(json.loads(self.wizard_values))
+            if not wizard:
+                raise UserError(_("The options of this report are no longer "
+                                  "available, please print it again."))
+            ledger_version = str(
+                wizard.env['account.move.line']._get_ledger_version())
+            action = getattr(wizard, self.method)()
+            if action.get('type') != 'ir.actions.report':
+                raise UserError(_("The wizard did not return a report."))
+            self._set_progress(50, _("Rendering"))
+            report = self.env['ir.actions.report'].with_user(
+                self.user_id).with_company(self.company_id).with_context(
+                action.get('context') or {})
+            res_ids = (action.get('context') or {}).get('active_ids')
+            content, extension = report._render(
+                action['report_name'], res_ids, data=action.get('data'))
+            attachment = self.env['ir.attachment'].sudo().create({
+                'name': '%s.%s' % (self.name, extension),
+                'raw': content,
+                'res_model': self._name,
+                'res_id': self.id,
+            })
+            self.write({
+                'state': 'done',
+                'progress': 100,
+                'progress_message': _("Done"),
+                'attachment_id': attachment.id,
+                'ledger_version': ledger_version,
+                'date_done': fields.Datetime.now(),
+            })
+            self.env.cr.commit()
+        except Exception as error:
+            _logger.exception("Accounting report job %s failed", self.id)
+            self.env.cr.rollback()
+            self.write({'state': 'failed', 'error': str(error),
+                        'date_done': fields.Datetime.now()})
+            self.env.cr.commit()
+
+
+class AccountReportJobMixin(models.AbstractModel):
+    """Let a report wizard print its report in the background or export it
+    to XLSX"""
+    _name = 'account.report.job.mixin'
+    _description = 'Background Report Printing'
+
+    # Method of the wizard returning the report action
+    _report_job_method = 'check_report'
+
+    def action_print_background(self):
+        self.ensure_one()
+        return self.env['account.report.job']._enqueue(
+            self, self._report_job_method)
+
+    def action_export_xlsx(self):
+        self.ensure_one()
+        return self.env['account.report.xlsx']._get_download_action(
+            self._description, getattr(self, self._report_job_method)())
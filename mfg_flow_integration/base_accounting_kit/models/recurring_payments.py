@@ -19,7 +19,7 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 #
 #############################################################################
-from datetime import datetime, date
+from datetime import date
 from dateutil.relativedelta import relativedelta
 from odoo import api, fields, models
 
@@ -38,21 +38,14 @@ class RecurringPayments(models.Model):
 
     def _get_next_schedule(self):
         """Function for adding the schedule process"""
-        if self.date:
-            recurr_dates = []
-            today = datetime.today()
-            start_date = datetime.strptime(str(self.date), '%Y-%m-%d')
-            while start_date <= today:
-                recurr_dates.append(str(start_date.date()))
-                if self.recurring_period == 'days':
-                    start_date += relativedelta(days=self.recurring_interval)
-                elif self.recurring_period == 'weeks':
-                    start_date += relativedelta(weeks=self.recurring_interval)
-                elif self.recurring_period == 'months':
-                    start_date += relativedelta(months=self.recurring_interval)
-                else:
-                    start_date += relativedelta(years=self.recurring_interval)
-            self.next_date = start_date.date()
+        today = fields.Date.today()
+        for rec in self:
+            next_date = False
+            if rec.date and rec.recurring_interval > 0:
+                next_date = rec._get_first_pending_date()
+                while next_date <= today:
+                    next_date = rec._get_following_date(next_date)
+            rec.next_date = next_date
 
     name = fields.Char(string='Name')
     debit_account = fields.Many2one('account.account',
@@ -97,6 +90,12 @@ class RecurringPayments(models.Model):
                                  default=lambda l: l.env.company.id)
     recurring_lines = fields.One2many(
         'account.recurring.entries.line', 'tmpl_id')
+    last_generated_date = fields.Date('Last Generated On', readonly=True,
+                                      copy=False,
+                                      help="Date of the last entry generated "
+                                           "from this template. The "
+                                           "scheduler only generates the "
+                                           "entries following it.")
 
     @api.onchange('partner_id')
     def onchange_partner_id(self):
@@ -104,75 +103,107 @@ class RecurringPayments(models.Model):
         if self.partner_id.property_account_receivable_id:
             self.credit_account = self.partner_id.property_account_payable_id
 
+    def write(self, vals):
+        """A new schedule is generated again from its starting date, the
+        entries already existing being skipped"""
+        if {'date', 'recurring_period', 'recurring_interval'} & set(vals):
+            vals = dict(vals, last_generated_date=False)
+        return super().write(vals)
+
+    def _get_following_date(self, current_date):
+        """Return the occurrence following ``current_date``"""
+        self.ensure_one()
+        if self.recurring_period == 'days':
+            return current_date + relativedelta(days=self.recurring_interval)
+        elif self.recurring_period == 'weeks':
+            return current_date + relativedelta(weeks=self.recurring_interval)
+        elif self.recurring_period == 'months':
+            return current_date + relativedelta(months=self.recurring_interval)
+        return current_date + relativedelta(years=self.recurring_interval)
+
+    def _get_first_pending_date(self):
+        """Return the first occurrence not generated yet"""
+        self.ensure_one()
+        if self.last_generated_date:
+            return self._get_following_date(self.last_generated_date)
+        return self.date
+
+    def _get_pending_dates(self, until):
+        """Return the occurrences of the template up to ``until`` which were
+        not generated yet"""
+        self.ensure_one()
+        pending_dates = []
+        if not self.date or self.recurring_interval <= 0:
+            return pending_dates
+        current_date = self._get_first_pending_date()
+        while current_date <= until:
+            pending_dates.append(current_date)
+            current_date = self._get_following_date(current_date)
+        return pending_dates
+
+    @staticmethod
+    def _get_recurring_ref(template, entry_date):
+        return str(template.id) + '/' + str(entry_date)
+
+    def _prepare_recurring_move_vals(self, entry_date):
+        """Return the values of the journal entry of ``entry_date``"""
+        self.ensure_one()
+        line_ids = [(0, 0, {
+            'account_id': self.credit_account.id,
+            'partner_id': self.partner_id.id,
+            'credit': self.amount,
+        }), (0, 0, {
+            'account_id': self.debit_account.id,
+            'partner_id': self.partner_id.id,
+            'debit': self.amount,
+        })]
+        return {
+            'date': entry_date,
+            'recurring_ref': self._get_recurring_ref(self, entry_date),
+            'company_id': self.env.company.id,
+            'journal_id': self.journal_id.id,
+            'ref': self.name,
+            'narration': 'Recurring entry',
+            'line_ids': line_ids
+        }
+
     @api.model
     def _cron_generate_entries(self):
-        data = self.env['account.recurring.payments'].search(
+        """Generate the entries due since the last run of every running
+        template, all created at once and posted at once"""
+        templates = self.env['account.recurring.payments'].search(
             [('state', '=', 'running')])
-        entries = self.env['account.move'].search(
-            [('recurring_ref', '!=', False)])
-        journal_dates = []
-        journal_codes = []
-        remaining_dates = []
-        for entry in entries:
-            journal_dates.append(str(entry.date))
-            if entry.recurring_ref:
-                journal_codes.append(str(entry.recurring_ref))
-        today = datetime.today()
-        for line in data:
-            if line.date:
-                recurr_dates = []
-                start_date = datetime.strptime(str(line.date),
-                                               '%Y-%m-%d')
-                while start_date <= today:
-                    recurr_dates.append(str(start_date.date()))
-                    if line.recurring_period == 'days':
-                        start_date += relativedelta(
-                            days=line.recurring_interval)
-                    elif line.recurring_period == 'weeks':
-                        start_date += relativedelta(
-                            weeks=line.recurring_interval)
-                    elif line.recurring_period == 'months':
-                        start_date += relativedelta(
-                            months=line.recurring_interval)
-                    else:
-                        start_date += relativedelta(
-                            years=line.recurring_interval)
-                for rec in recurr_dates:
-                    recurr_code = str(line.id) + '/' + str(rec)
-                    if recurr_code not in journal_codes:
-                        remaining_dates.append({
-                            'date': rec,
-                            'template_name': line.name,
-                            'amount': line.amount,
-                            'tmpl_id': line.id,
-                        })
-        child_ids = self.recurring_lines.create(remaining_dates)
-        for line in child_ids:
-            tmpl_id = line.tmpl_id
-            recurr_code = str(tmpl_id.id) + '/' + str(line.date)
-            line_ids = [(0, 0, {
-                'account_id': tmpl_id.credit_account.id,
-                'partner_id': tmpl_id.partner_id.id,
-                'credit': line.amount,
-                # 'analytic_account_id': tmpl_id.analytic_account_id.id,
-            }), (0, 0, {
-                'account_id': tmpl_id.debit_account.id,
-                'partner_id': tmpl_id.partner_id.id,
-                'debit': line.amount,
-                # 'analytic_account_id': tmpl_id.analytic_account_id.id,
-            })]
-            vals = {
-                'date': line.date,
-                'recurring_ref': recurr_code,
-                'company_id': self.env.company.id,
-                'journal_id': tmpl_id.journal_id.id,
-                'ref': line.template_name,
-                'narration': 'Recurring entry',
-                'line_ids': line_ids
-            }
-            move_id = self.env['account.move'].create(vals)
-            if tmpl_id.journal_state == 'posted':
-                move_id.post()
+        today = fields.Date.today()
+        pending = {template: template._get_pending_dates(today)
+                   for template in templates}
+        # Templates without high-water mark may already have entries, look
+        # them up once for all of them
+        existing_refs = set()
+        candidate_refs = [
+            self._get_recurring_ref(template, entry_date)
+            for template, dates in pending.items()
+            if not template.last_generated_date for entry_date in dates]
+        if candidate_refs:
+            existing_refs = set(self.env['account.move'].search(
+                [('recurring_ref', 'in', candidate_refs)]).mapped(
+                'recurring_ref'))
+        vals_list = []
+        to_post = []
+        for template, dates in pending.items():
+            for entry_date in dates:
+                if self._get_recurring_ref(
+                        template, entry_date) in existing_refs:
+                    continue
+                vals_list.append(
+                    template._prepare_recurring_move_vals(entry_date))
+                to_post.append(template.journal_state == 'posted')
+        moves = self.env['account.move'].create(vals_list)
+        self.env['account.move'].browse(
+            [move.id for move, post in zip(moves, to_post) if post]
+        ).action_post()
+        for template, dates in pending.items():
+            if dates:
+                template.last_generated_date = dates[-1]
 
 
 class GetAllRecurringEntries(models.TransientModel):
@@ -19,13 +19,53 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 #
 #############################################################################
-from odoo import models, _
+from contextlib import suppress
+from odoo import api, models, tools, _
 from odoo.exceptions import RedirectWarning
 
 
 class ResCompany(models.Model):
     _inherit = "res.company"
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        companies = super().create(vals_list)
+        if companies.parent_id:
+            self._clear_method_cache('res.company', '_get_branch_ids')
+        return companies
+
+    def write(self, vals):
+        if 'parent_id' in vals:
+            self._clear_method_cache('res.company', '_get_branch_ids')
+        if 'fiscalyear_lock_date' in vals:
+            # amounts of the locked periods are cached by the tax report
+            self._clear_method_cache('report.base_accounting_kit.report_tax',
+                                     '_get_closed_period_items')
+        return super().write(vals)
+
+    @api.model
+    def _clear_method_cache(self, model_name, method_name):
+        """Drop the ormcache entries of one method from the cache of this
+        worker, leaving the cached values of the other methods in place.
+        The registry only signals invalidations per cache, so the other
+        workers still clear their whole default cache."""
+        model = self.env[model_name]
+        method = getattr(type(model), method_name)
+        cache, key, _counter = method.__cache__.lru(model)
+        for cached_key in list(cache.d):
+            if cached_key[:len(key)] == key:
+                with suppress(KeyError):
+                    # evicted by another thread in between
+                    del cache[cached_key]
+        self.env.registry.cache_invalidated.add('default')
+
+    @api.model
+    @tools.ormcache('company_id')
+    def _get_branch_ids(self, company_id):
+        """Return the ids of the company and of its direct branches"""
+        company = self.sudo().browse(company_id)
+        return tuple(company.child_ids.ids) + (company_id,)
+
     def _validate_fiscalyear_lock(self, values):
         if values.get('fiscalyear_lock_date'):
             draft_entries = self.env['account.move'].search([
@@ -21,6 +21,8 @@
 #############################################################################
 from odoo import api, fields, models
 
+from .account_report_cache import DEFAULT_REPORT_CACHE_SIZE
+
 
 class ResConfigSettings(models.TransientModel):
     _inherit = 'res.config.settings'
@@ -31,6 +33,29 @@ class ResConfigSettings(models.TransientModel):
         string="Use Anglo-Saxon accounting", readonly=False,
         related='company_id.anglo_saxon_accounting')
 
+    report_cache_size = fields.Integer(
+        string="Report Cache Size", default=DEFAULT_REPORT_CACHE_SIZE,
+        config_parameter='base_accounting_kit.report_cache_size',
+        help="Number of accounting report results kept in memory by each "
+             "worker. Set to 0 to disable the cache.")
+    report_cache_entries = fields.Integer(
+        string="Cached Reports", compute='_compute_report_cache_stats')
+    report_cache_hits = fields.Integer(
+        string="Cache Hits", compute='_compute_report_cache_stats')
+    report_cache_misses = fields.Integer(
+        string="Cache Misses", compute='_compute_report_cache_stats')
+
+    def _compute_report_cache_stats(self):
+        stats = self.env['account.report.cache']._get_stats()
+        for settings in self:
+            settings.report_cache_entries = stats['entries']
+            settings.report_cache_hits = stats['hits']
+            settings.report_cache_misses = stats['misses']
+
+    def action_clear_report_cache(self):
+        """Drop the cached report results and reset the counters"""
+        self.env['account.report.cache']._clear()
+
     @api.model
     def get_values(self):
         res = super(ResConfigSettings, self).get_values()
@@ -51,6 +51,11 @@ class AssetAssetReport(models.Model):
     gross_value = fields.Float(string='Gross Amount', readonly=True)
     posted_value = fields.Float(string='Posted Amount', readonly=True)
     unposted_value = fields.Float(string='Unposted Amount', readonly=True)
+    residual_value = fields.Float(string='Residual Amount', readonly=True)
+    depreciated_value = fields.Float(string='Depreciated Amount',
+                                     readonly=True)
+    last_depreciation_date = fields.Date(string='Last Depreciation Date',
+                                         readonly=True)
     company_id = fields.Many2one('res.company', string='Company',
                                  readonly=True)
 
@@ -63,10 +68,22 @@ class AssetAssetReport(models.Model):
                     dl.name as name,
                     dl.depreciation_date as depreciation_date,
                     a.date as date,
-                    (CASE WHEN dlmin.id = min(dl.id)
+                    (CASE WHEN min(min(dl.id)) OVER (
+                            PARTITION BY dl.asset_id) = min(dl.id)
                       THEN a.value
                       ELSE 0
                       END) as gross_value,
+                    (CASE WHEN min(min(dl.id)) OVER (
+                            PARTITION BY dl.asset_id) = min(dl.id)
+                      THEN a.value_residual
+                      ELSE 0
+                      END) as residual_value,
+                    (CASE WHEN min(min(dl.id)) OVER (
+                            PARTITION BY dl.asset_id) = min(dl.id)
+                      THEN a.depreciated_amount
+                      ELSE 0
+                      END) as depreciated_value,
+                    a.last_depreciation_date as last_depreciation_date,
                     dl.amount as depreciation_value,
                     dl.amount as installment_value,
                     (CASE WHEN dl.move_check
@@ -87,14 +104,11 @@ class AssetAssetReport(models.Model):
                     a.company_id as company_id
                 from account_asset_depreciation_line dl
                     left join account_asset_asset a on (dl.asset_id=a.id)
-                    left join (select min(d.id) as id,ac.id as ac_id from 
-                    account_asset_depreciation_line as d inner join 
-                    account_asset_asset as ac ON (ac.id=d.asset_id) group by 
-                    ac_id) as dlmin on dlmin.ac_id=a.id
                 where a.active is true 
                 group by
                     dl.amount,dl.asset_id,dl.depreciation_date,dl.name,
                     a.date, dl.move_check, a.state, a.category_id, 
                     a.partner_id, a.company_id,
-                    a.value, a.id, a.salvage_value, dlmin.id
+                    a.value, a.id, a.salvage_value, a.value_residual,
+                    a.depreciated_amount, a.last_depreciation_date
         )""")
@@ -20,7 +20,8 @@
 #
 #############################################################################
 import time
-from datetime import timedelta, datetime
+from itertools import groupby
+from operator import itemgetter
 
 from odoo import models, api, _
 from odoo.exceptions import UserError
@@ -28,56 +29,81 @@ from odoo.exceptions import UserError
 
 class DayBookPdfReport(models.AbstractModel):
     _name = 'report.base_accounting_kit.day_book_report_template'
+    _inherit = 'account.ledger.mixin'
     _description = 'Day Book Report'
 
-    def _get_account_move_entry(self, accounts, form_data, pass_date):
-        cr = self.env.cr
-        move_line = self.env['account.move.line']
-        tables, where_clause, where_params = move_line._query_get()
-        wheres = [""]
-        if where_clause.strip():
-            wheres.append(where_clause.strip())
+    def _get_day_entry(self, accounts, form_data, pass_date):
+        """Return the totals and lines of a single day, see
+        :meth:`_get_day_book_entries`."""
+        res = {'debit': 0.0, 'credit': 0.0, 'balance': 0.0, 'lines': []}
+        for day in self._get_day_book_entries(accounts, form_data, pass_date,
+                                              pass_date):
+            res.update(debit=day['debit'], credit=day['credit'],
+                       balance=day['balance'], lines=list(day['child_lines']))
+        return res
+
+    def _get_day_book_entries(self, accounts, form_data, date_from, date_to):
+        """Yield one dictionary per day of the range having journal items.
+
+        The whole range is read with a single query ordered by date; the
+        per-day totals come from the same query through ``GROUP BY ROLLUP``
+        and precede the lines of their day. 'child_lines' is an iterator
+        over a server-side cursor, it must be consumed before requesting the
+        next day.
+        """
         if form_data['target_move'] == 'posted':
             target_move = "AND m.state = 'posted'"
         else:
             target_move = ''
-        sql = ('''
-                SELECT l.id AS lid, acc.name as accname, l.account_id AS 
-                account_id, l.date AS ldate, j.code AS lcode, l.currency_id, 
-                l.amount_currency, l.ref AS lref, l.name AS lname,
-                 COALESCE(l.debit,0) AS debit, COALESCE(l.credit,0) AS credit, 
-                COALESCE(SUM(l.debit),0) - COALESCE(SUM(l.credit), 0) AS 
+        sql = ("""
+            SELECT l.date AS ldate, GROUPING(l.id) AS is_total, l.id AS lid,
+                acc.name AS accname, l.account_id AS account_id,
+                j.code AS lcode, l.currency_id, l.amount_currency,
+                l.ref AS lref, l.name AS lname,
+                COALESCE(SUM(l.debit),0) AS debit,
+                COALESCE(SUM(l.credit),0) AS credit,
+                COALESCE(SUM(l.debit),0) - COALESCE(SUM(l.credit), 0) AS
                 balance,
-                m.name AS move_name, c.symbol AS currency_code, p.name 
-                AS partner_name
-                FROM account_move_line l
-                JOIN account_move m ON (l.move_id=m.id)
-                LEFT JOIN res_currency c ON (l.currency_id=c.id)
-                LEFT JOIN res_partner p ON (l.partner_id=p.id)
-                JOIN account_journal j ON (l.journal_id=j.id)
-                JOIN account_account acc ON (l.account_id = acc.id) 
-                WHERE l.account_id IN %s AND l.journal_id IN %s '''
-               + target_move + ''' AND l.date = %s
-                GROUP BY l.id, l.account_id, l.date,
-                     j.code, l.currency_id, l.amount_currency, l.ref, 
-                     l.name, m.name, c.symbol, p.name , acc.name
-                     ORDER BY l.date DESC
-        ''')
-        params = (
-        tuple(accounts.ids), tuple(form_data['journal_ids']), pass_date)
-        cr.execute(sql, params)
-        data = cr.dictfetchall()
-        res = {}
-        debit = credit = balance = 0.00
-        for line in data:
-            debit += line['debit']
-            credit += line['credit']
-            balance += line['balance']
-        res['debit'] = debit
-        res['credit'] = credit
-        res['balance'] = balance
-        res['lines'] = data
-        return res
+                m.name AS move_name, c.symbol AS currency_code,
+                p.name AS partner_name
+            FROM account_move_line l
+            JOIN account_move m ON (l.move_id=m.id)
+            LEFT JOIN res_currency c ON (l.currency_id=c.id)
+            LEFT JOIN res_partner p ON (l.partner_id=p.id)
+            JOIN account_journal j ON (l.journal_id=j.id)
+            JOIN account_account acc ON (l.account_id = acc.id)
+            WHERE l.account_id IN %s AND l.journal_id IN %s """
+               + target_move + """ AND l.date BETWEEN %s AND %s
+            GROUP BY ROLLUP (l.date, (l.id, l.account_id, j.code,
+                l.currency_id, l.amount_currency, l.ref, l.name, m.name,
+                c.symbol, p.name, acc.name))
+            HAVING GROUPING(l.date) = 0
+            ORDER BY l.date, GROUPING(l.id) DESC, l.id""")
+        params = (tuple(accounts.ids), tuple(form_data['journal_ids']),
+                  date_from, date_to)
+        rows = self._stream_query(sql, params)
+        for day, day_rows in groupby(rows, key=itemgetter('ldate')):
+            total = next(day_rows)
+            yield {
+                'date': day,
+                'debit': total['debit'],
+                'credit': total['credit'],
+                'balance': total['balance'],
+                'child_lines': day_rows,
+            }
+
+    def _get_xlsx_report(self, docids, data):
+        """XLSX export of the day book, see account.report.xlsx"""
+        days = self._get_report_values(docids, data)['Accounts']
+
+        def rows():
+            for day in days:
+                yield 'total', [day['date'], '', '', '', '', '', day['debit'],
+                                day['credit'], day['balance']]
+                for line in day['child_lines']:
+                    yield self._get_ledger_xlsx_line(line)
+
+        return self._description, self._get_ledger_xlsx_columns(), rows()
 
     @api.model
     def _get_report_values(self, docids, data=None):
@@ -98,28 +124,9 @@ class DayBookPdfReport(models.AbstractModel):
             [('id', 'in', active_acc)]) if data['form']['account_ids'] else \
             self.env['account.account'].search([])
 
-        date_start = datetime.strptime(form_data['date_from'],
-                                       '%Y-%m-%d').date()
-        date_end = datetime.strptime(form_data['date_to'],
-                                     '%Y-%m-%d').date()
-        days = date_end - date_start
-        dates = []
-        record = []
-        for i in range(days.days + 1):
-            dates.append(date_start + timedelta(days=i))
-        for head in dates:
-            pass_date = str(head)
-            accounts_res = self.with_context(
-                data['form'].get('used_context', {}))._get_account_move_entry(
-                accounts, form_data, pass_date)
-            if accounts_res['lines']:
-                record.append({
-                    'date': head,
-                    'debit': accounts_res['debit'],
-                    'credit': accounts_res['credit'],
-                    'balance': accounts_res['balance'],
-                    'child_lines': accounts_res['lines']
-                })
+        record = self.with_context(
+            data['form'].get('used_context', {}))._get_day_book_entries(
+            accounts, form_data, form_data['date_from'], form_data['date_to'])
         return {
             'doc_ids': docids,
             'doc_model': model,
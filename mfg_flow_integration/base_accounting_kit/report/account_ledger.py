@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+#############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2023-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: Cybrosys Techno Solutions(<https://www.cybrosys.com>)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+import uuid
+from itertools import chain, groupby
+from operator import itemgetter
+
+from odoo import models, tools, _
+
+LEDGER_JOINS = """
+    FROM account_move_line l
+    JOIN account_move m ON (l.move_id=m.id)
+    LEFT JOIN res_currency c ON (l.currency_id=c.id)
+    LEFT JOIN res_partner p ON (l.partner_id=p.id)
+    JOIN account_journal j ON (l.journal_id=j.id)
+    JOIN account_account acc ON (l.account_id = acc.id)
+    WHERE l.account_id IN %s"""
+
+LEDGER_SORTS = {
+    'sort_date': 'l.date, l.move_id',
+    'sort_journal_partner': 'j.code, p.name, l.move_id',
+}
+
+
+class AccountLedgerMixin(models.AbstractModel):
+    """Ledger query engine shared by the general ledger, cash book and bank
+    book reports.
+
+    For a set of accounts it yields the initial balance, the totals and the
+    detail lines of every account, the running balance being computed by
+    PostgreSQL with a window function and the lines read from a server-side
+    cursor in chunks of ``_ledger_fetch_size`` rows.
+    """
+    _name = 'account.ledger.mixin'
+    _description = 'Account Ledger Query Engine'
+
+    # Number of rows pulled from the server-side cursor per round trip
+    _ledger_fetch_size = 2000
+
+    def _get_account_move_entry(self, accounts, init_balance, sortby,
+                                display_account):
+        """
+        :param:
+                accounts: the recordset of accounts
+                init_balance: boolean value of initial_balance
+                sortby: sorting by date or partner and journal
+                display_account: type of account(receivable, payable and both)
+
+        Returns a dictionary of accounts with following key and value {
+                'code': account code,
+                'name': account name,
+                'debit': sum of total debit amount,
+                'credit': sum of total credit amount,
+                'balance': total balance,
+                'amount_currency': sum of amount_currency,
+                'move_lines': list of move line
+        }
+        """
+        return [dict(res, move_lines=list(res['move_lines'])) for res in
+                self._get_account_move_entry_stream(
+                    accounts, init_balance, sortby, display_account)]
+
+    def _get_account_move_entry_stream(self, accounts, init_balance, sortby,
+                                       display_account):
+        """Streaming variant of :meth:`_get_account_move_entry`.
+
+        Yields the same account dictionaries, but 'move_lines' is an iterator
+        reading a server-side cursor, with the running balance computed by
+        PostgreSQL. Each account's lines must be consumed before requesting
+        the next account.
+        """
+        if not accounts:
+            return
+        cr = self.env.cr
+        MoveLine = self.env['account.move.line']
+
+        # Initial balance of every account, in one grouped query
+        initial = {}
+        if init_balance:
+            filters, params = self._get_ledger_filters(
+                MoveLine.with_context(
+                    date_from=self.env.context.get('date_from'),
+                    date_to=False, initial_bal=True))
+            cr.execute(self._get_ledger_sql(filters, sortby)[0],
+                       (tuple(accounts.ids),) + tuple(params))
+            for account_id, debit, credit, count in cr.fetchall():
+                initial[account_id] = (debit, credit)
+
+        # Totals of the period, known before streaming the lines
+        filters, params = self._get_ledger_filters(MoveLine)
+        totals_sql, lines_sql = self._get_ledger_sql(filters, sortby)
+        cr.execute(totals_sql, (tuple(accounts.ids),) + tuple(params))
+        totals = {account_id: (debit, credit, count) for
+                  account_id, debit, credit, count in cr.fetchall()}
+
+        params = (tuple(accounts.ids),) + tuple(params) + (accounts.ids,)
+        groups = groupby(self._stream_query(lines_sql, params),
+                         key=itemgetter('account_id'))
+        group = next(groups, None)
+
+        for account in accounts:
+            currency = (account.currency_id and account.currency_id or
+                        account.company_id.currency_id)
+            init_debit, init_credit = initial.get(account.id, (0.0, 0.0))
+            debit, credit, count = totals.get(account.id, (0.0, 0.0, 0))
+            init_lines = []
+            if account.id in initial:
+                init_lines.append(self._get_initial_balance_line(
+                    init_debit, init_credit))
+            lines = iter(())
+            has_lines = group is not None and group[0] == account.id
+            if has_lines:
+                lines = self._add_initial_balance(
+                    group[1], init_debit - init_credit)
+            res = {
+                'code': account.code,
+                'name': account.name,
+                'debit': init_debit + debit,
+                'credit': init_credit + credit,
+                'balance': init_debit - init_credit + debit - credit,
+                'move_lines': chain(init_lines, lines),
+            }
+            if display_account == 'all':
+                yield res
+            if display_account == 'movement' and (init_lines or count):
+                yield res
+            if display_account == 'not_zero' and not currency.is_zero(
+                    res['balance']):
+                yield res
+            if has_lines:
+                # move past the lines of this account if left unconsumed
+                group = next(groups, None)
+
+    def _get_ledger_xlsx_columns(self):
+        return [(_('Date'), 'date'), (_('JRNL'), 'char'),
+                (_('Partner'), 'char'), (_('Ref'), 'char'),
+                (_('Move'), 'char'), (_('Entry Label'), 'char'),
+                (_('Debit'), 'amount'), (_('Credit'), 'amount'),
+                (_('Balance'), 'amount')]
+
+    @staticmethod
+    def _get_ledger_xlsx_line(line):
+        return 'line', [line['ldate'], line['lcode'], line['partner_name'],
+                        line['lref'], line['move_name'], line['lname'],
+                        line['debit'], line['credit'], line['balance']]
+
+    def _get_xlsx_report(self, docids, data):
+        """XLSX export of the ledger, see account.report.xlsx"""
+        accounts = self._get_report_values(docids, data)['Accounts']
+
+        def rows():
+            for account in accounts:
+                yield 'total', [account['code'], account['name'], '', '', '',
+                                '', account['debit'], account['credit'],
+                                account['balance']]
+                for line in account['move_lines']:
+                    yield self._get_ledger_xlsx_line(line)
+
+        return self._description, self._get_ledger_xlsx_columns(), rows()
+
+    @tools.ormcache('filters', 'sortby')
+    def _get_ledger_sql(self, filters, sortby):
+        """Return the totals and detail queries for the ``filters`` where
+        clause, compiled once per filter shape and sort order. Both take the
+        account ids tuple followed by the filter parameters, the detail
+        query also takes the account ids list giving the accounts order."""
+        sql_sort = LEDGER_SORTS.get(sortby, LEDGER_SORTS['sort_date'])
+        totals_sql = ("""SELECT l.account_id, COALESCE(SUM(l.debit),0.0),
+            COALESCE(SUM(l.credit),0.0), COUNT(l.id)""" + LEDGER_JOINS +
+                      filters + ' GROUP BY l.account_id')
+        lines_sql = ("""SELECT l.id AS lid, l.account_id AS account_id,
+            l.date AS ldate, j.code AS lcode, l.currency_id,
+            l.amount_currency, l.ref AS lref, l.name AS lname,
+            COALESCE(l.debit,0) AS debit, COALESCE(l.credit,0) AS credit,
+            SUM(COALESCE(l.debit,0) - COALESCE(l.credit,0)) OVER (
+                PARTITION BY l.account_id ORDER BY """ + sql_sort + """, l.id
+                ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW) AS balance,
+            m.name AS move_name, c.symbol AS currency_code,
+            p.name AS partner_name""" + LEDGER_JOINS + filters + """
+            ORDER BY array_position(%s, l.account_id), """ + sql_sort +
+                     ", l.id")
+        return totals_sql, lines_sql
+
+    def _get_ledger_filters(self, move_line):
+        """Return the where clause of ``move_line._query_get()``, using the
+        'l' and 'm' aliases of the ledger queries, and its parameters."""
+        tables, where_clause, where_params = move_line._query_get()
+        wheres = [""]
+        if where_clause.strip():
+            wheres.append(where_clause.strip())
+        filters = " AND ".join(wheres)
+        filters = filters.replace('account_move_line__move_id',
+                                  'm').replace(
+            'account_move_line', 'l')
+        return filters, where_params
+
+    @staticmethod
+    def _get_initial_balance_line(debit, credit):
+        return {
+            'lid': 0, 'ldate': '', 'lcode': '', 'amount_currency': 0.0,
+            'lref': '', 'lname': 'Initial Balance', 'debit': debit,
+            'credit': credit, 'balance': debit - credit, 'lpartner_id': '',
+            'move_name': '', 'mmove_id': '', 'currency_code': '',
+            'currency_id': None, 'invoice_id': '', 'invoice_type': '',
+            'invoice_number': '', 'partner_name': '',
+        }
+
+    @staticmethod
+    def _add_initial_balance(rows, initial_balance):
+        for row in rows:
+            del row['account_id']
+            row['balance'] += initial_balance
+            yield row
+
+    def _stream_query(self, query, params):
+        """Run ``query`` through a server-side cursor and yield its rows as
+        dictionaries, fetching ``_ledger_fetch_size`` rows at a time."""
+        cr = self.env.cr
+        cursor_name = 'ledger_%s' % uuid.uuid4().hex
+        cr.execute('DECLARE %s NO SCROLL CURSOR FOR %s' % (cursor_name, query),
+                   params)
+        try:
+            while True:
+                cr.execute('FETCH FORWARD %s FROM %s' % (
+                    int(self._ledger_fetch_size), cursor_name))
+                rows = cr.dictfetchall()
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            if not cr.closed:
+                cr.execute('CLOSE %s' % cursor_name)
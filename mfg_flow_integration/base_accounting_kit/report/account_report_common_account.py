@@ -27,7 +27,7 @@ from odoo.tools.misc import get_lang
 class AccountCommonAccountReport(models.TransientModel):
     _name = 'account.common.account.report'
     _description = 'Account Common Account Report'
-    _inherit = "account.report"
+    _inherit = ["account.report", "account.report.job.mixin"]
 
     section_main_report_ids = fields.Many2many(string="Section Of",
                                                comodel_name='account.report',
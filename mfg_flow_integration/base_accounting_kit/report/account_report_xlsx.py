@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+#############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2023-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: Cybrosys Techno Solutions(<https://www.cybrosys.com>)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+import tempfile
+from datetime import timedelta
+
+import xlsxwriter
+
+from odoo import api, fields, models, _
+from odoo.exceptions import UserError
+
+# Widths of the column kinds of an XLSX export
+COLUMN_WIDTHS = {'char': 30, 'date': 12, 'amount': 16}
+# Rows of an Excel worksheet, the export continues on a new sheet beyond
+XLSX_MAX_ROWS = 1048576
+# Row of the column labels of every sheet, the lines start right below
+XLSX_HEADER_ROW = 2
+# Description marking the downloadable exports, removed after a day
+XLSX_EXPORT_DESCRIPTION = 'base_accounting_kit.xlsx_export'
+
+
+class AccountReportXlsx(models.AbstractModel):
+    """XLSX export shared by the accounting reports.
+
+    A report supports the export by implementing
+    ``_get_xlsx_report(docids, data)``, returning the sheet title, the
+    columns as a list of (label, kind) where kind is 'char', 'date' or
+    'amount', and an iterable of (style, values) rows where style is
+    'total' or 'line'. The workbook is written to a temporary file in
+    ``constant_memory`` mode: each row is flushed to disk as soon as the
+    next one starts, so the rows can be produced lazily from a database
+    cursor whatever the size of the report. Rows beyond the limit of a
+    worksheet continue on a new one.
+    """
+    _name = 'account.report.xlsx'
+    _description = 'Accounting Report XLSX Export'
+
+    @api.model
+    def _add_xlsx_sheet(self, workbook, title, columns, bold):
+        """Add a worksheet with the title and the column labels"""
+        index = len(workbook.worksheets()) + 1
+        name = title[:31] if index == 1 else '%s (%s)' % (title[:24], index)
+        sheet = workbook.add_worksheet(name)
+        for col, (label, kind) in enumerate(columns):
+            sheet.set_column(col, col, COLUMN_WIDTHS[kind])
+        sheet.write(0, 0, title, workbook.add_format({'bold': True,
+                                                      'font_size': 14}))
+        for col, (label, kind) in enumerate(columns):
+            sheet.write(XLSX_HEADER_ROW, col, label, bold)
+        return sheet
+
+    @api.model
+    def _write_xlsx(self, report_name, docids, data, output):
+        """Write the XLSX export of the report ``report_name`` to the
+        file object ``output``"""
+        report_model = self.env.get('report.%s' % report_name)
+        if report_model is None or not hasattr(report_model,
+                                               '_get_xlsx_report'):
+            raise UserError(_("This report cannot be exported to XLSX."))
+        title, columns, rows = report_model._get_xlsx_report(docids, data)
+
+        workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+        bold = workbook.add_format({'bold': True})
+        formats = {
+            'line': {
+                'char': None,
+                'date': workbook.add_format({'num_format': 'yyyy-mm-dd'}),
+                'amount': workbook.add_format({'num_format': '#,##0.00'}),
+            },
+            'total': {
+                'char': bold,
+                'date': workbook.add_format({'num_format': 'yyyy-mm-dd',
+                                             'bold': True}),
+                'amount': workbook.add_format({'num_format': '#,##0.00',
+                                               'bold': True}),
+            },
+        }
+        sheet = self._add_xlsx_sheet(workbook, title, columns, bold)
+        kinds = [kind for label, kind in columns]
+        row = XLSX_HEADER_ROW + 1
+        for style, values in rows:
+            if row >= XLSX_MAX_ROWS:
+                sheet = self._add_xlsx_sheet(workbook, title, columns, bold)
+                row = XLSX_HEADER_ROW + 1
+            style_formats = formats[style]
+            for col, (kind, value) in enumerate(zip(kinds, values)):
+                if value is None or value is False or value == '':
+                    continue
+                if sheet.write(row, col, value, style_formats[kind]) < 0:
+                    raise UserError(_(
+                        "The value %(value)s could not be written in row "
+                        "%(row)s of the XLSX export.",
+                        value=value, row=row + 1))
+            row += 1
+        workbook.close()
+
+    @api.model
+    def _get_download_action(self, name, action):
+        """Export the report of the report ``action`` returned by a wizard
+        and return the action downloading it"""
+        if action.get('type') != 'ir.actions.report':
+            raise UserError(_("The wizard did not return a report."))
+        context = action.get('context') or {}
+        with tempfile.TemporaryFile() as output:
+            self.with_context(context)._write_xlsx(
+                action['report_name'], context.get('active_ids'),
+                action.get('data'), output)
+            output.seek(0)
+            attachment = self.env['ir.attachment'].create({
+                'name': '%s.xlsx' % name,
+                'raw': output.read(),
+                'description': XLSX_EXPORT_DESCRIPTION,
+                'mimetype': 'application/vnd.openxmlformats-officedocument.'
+                            'spreadsheetml.sheet',
+            })
+        return {
+            'type': 'ir.actions.act_url',
+            'url': '/web/content/%s?download=true' % attachment.id,
+            'target': 'self',
+        }
+
+    @api.autovacuum
+    def _gc_xlsx_exports(self):
+        """Remove the downloaded exports older than a day"""
+        self.env['ir.attachment'].sudo().search([
+            ('res_model', '=', False),
+            ('description', '=', XLSX_EXPORT_DESCRIPTION),
+            ('create_date', '<', fields.Datetime.now() - timedelta(days=1)),
+        ]).unlink()
@@ -25,6 +25,16 @@ import time
 from odoo import api, models, _
 from odoo.exceptions import UserError
 
+# Cash in/out report lines and the section they belong to
+CASH_FLOW_SECTIONS = {
+    'base_accounting_kit.cash_in_from_operation0': ('in', 'operating'),
+    'base_accounting_kit.cash_out_operation1': ('out', 'operating'),
+    'base_accounting_kit.cash_in_investing0': ('in', 'investing'),
+    'base_accounting_kit.cash_out_investing1': ('out', 'investing'),
+    'base_accounting_kit.cash_in_financial0': ('in', 'financing'),
+    'base_accounting_kit.cash_out_financial1': ('out', 'financing'),
+}
+
 
 class ReportFinancial(models.AbstractModel):
     _name = 'report.base_accounting_kit.report_cash_flow'
@@ -41,8 +51,9 @@ class ReportFinancial(models.AbstractModel):
         for account in accounts:
             res[account.id] = dict.fromkeys(mapping, 0.0)
         if accounts:
-            tables, where_clause, where_params = self.env[
-                'account.move.line']._query_get()
+            tables, where_clause, where_params = (
+                self.env['account.balance.snapshot']._query_get() or
+                self.env['account.move.line']._query_get())
             tables = tables.replace('"', '') if tables else "account_move_line"
             wheres = [""]
             if where_clause.strip():
@@ -60,60 +71,95 @@ class ReportFinancial(models.AbstractModel):
                 res[row['id']] = row
         return res
 
+    @api.model
+    def _get_cash_flow_classification(self):
+        """Map the ids of the cash in/out report lines to their
+        (direction, activity), resolving the xmlids once"""
+        classification = {}
+        for xmlid, section in CASH_FLOW_SECTIONS.items():
+            report = self.env.ref(xmlid, raise_if_not_found=False)
+            if report:
+                classification[report.id] = section
+        return classification
+
+    def _get_report_accounts(self, report, type_cache):
+        """Accounts whose balance makes up the amount of ``report``, None for
+        'accounts' lines that take their amount from their parent"""
+        if report.type == 'accounts':
+            return None
+        if report.type == 'account_type':
+            # it's the sum the leaf accounts with such an account type
+            key = report.account_type_ids
+            if key not in type_cache:
+                type_cache[key] = self.env['account.account'].search(
+                    [('account_type', 'in', report.account_type_ids)])
+            return type_cache[key]
+        if report.type == 'sum' or (report.type == 'account_report' and
+                                    report.account_report_id):
+            return report.account_ids
+        return self.env['account.account']
+
     def _compute_report_balance(self, reports):
-        res = {}
+        """Return the credit, debit and balance of each report line.
+
+        Results are shared through the report cache until the ledger of the
+        companies, the report lines or the accounts change."""
+        return self.env['account.report.cache']._get_or_compute(
+            'cash_flow', tuple(reports.ids),
+            lambda: self._compute_cash_flow_balance(reports),
+            definition_models=('account.financial.report',
+                               'account.account'))
+
+    def _compute_cash_flow_balance(self, reports):
         fields = ['credit', 'debit', 'balance']
-        for report in reports:
-            if report.id in res:
-                continue
-            res[report.id] = dict((fn, 0.0) for fn in fields)
+        classification = self._get_cash_flow_classification()
+        # resolve the account set of every line involved, including the
+        # parents the cash in/out lines take their amount from
+        type_cache = {}
+        report_accounts = {}
+        todo = reports
+        while todo:
+            for report in todo:
+                report_accounts[report.id] = self._get_report_accounts(
+                    report, type_cache)
+            todo = todo.filtered(
+                lambda r: r.type == 'accounts').parent_id.filtered(
+                lambda r: r.id not in report_accounts)
+        all_accounts = self.env['account.account'].union(
+            *[accounts for accounts in report_accounts.values()
+              if accounts is not None])
+        # one aggregated query feeds every section
+        account_balance = self._compute_account_balance(all_accounts)
+        computed = {}
+
+        def compute(report):
+            if report.id in computed:
+                return computed[report.id]
+            values = computed[report.id] = dict((fn, 0.0) for fn in fields)
             if report.type == 'accounts':
                 # it's the sum of credit or debit
-                res2 = self._compute_report_balance(report.parent_id)
-                for key, value in res2.items():
-                    cash_in_operation = self.env.ref(
-                        'base_accounting_kit.cash_in_from_operation0')
-                    cash_out_operation = self.env.ref(
-                        'base_accounting_kit.cash_out_operation1')
-                    cash_in_financial = self.env.ref(
-                        'base_accounting_kit.cash_in_financial0')
-                    cash_out_financial = self.env.ref(
-                        'base_accounting_kit.cash_out_financial1')
-                    cash_in_investing = self.env.ref(
-                        'base_accounting_kit.cash_in_investing0')
-                    cash_out_investing = self.env.ref(
-                        'base_accounting_kit.cash_out_investing1')
-                    if (report == cash_in_operation or report ==
-                            cash_in_financial or report == cash_in_investing):
-                        res[report.id]['debit'] += value['debit']
-                        res[report.id]['balance'] += value['debit']
-                    elif (report == cash_out_operation or report ==
-                          cash_out_financial or report == cash_out_investing):
-                        res[report.id]['credit'] += value['credit']
-                        res[report.id]['balance'] += -(value['credit'])
-            elif report.type == 'account_type':
-                # it's the sum the leaf accounts with such an account type
-                accounts = self.env['account.account'].search(
-                    [('account_type', 'in', report.account_type_ids)])
-                res[report.id]['account'] = self._compute_account_balance(
-                    accounts)
-                for value in res[report.id]['account'].values():
-                    for field in fields:
-                        res[report.id][field] += value.get(field)
-            elif report.type == 'account_report' and report.account_report_id:
-                # it's the amount of the linked
-                res[report.id]['account'] = self._compute_account_balance(
-                    report.account_ids)
-                for value in res[report.id]['account'].values():
+                direction = classification.get(report.id, (False,))[0]
+                if report.parent_id:
+                    parent = compute(report.parent_id)
+                    if direction == 'in':
+                        values['debit'] += parent['debit']
+                        values['balance'] += parent['debit']
+                    elif direction == 'out':
+                        values['credit'] += parent['credit']
+                        values['balance'] += -(parent['credit'])
+            else:
+                values['account'] = {
+                    account.id: dict(account_balance[account.id])
+                    for account in report_accounts[report.id]
+                }
+                for value in values['account'].values():
                     for field in fields:
-                        res[report.id][field] += value.get(field)
-            elif report.type == 'sum':
-                # it's the sum of the linked accounts
-                res[report.id]['account'] = self._compute_account_balance(
-                    report.account_ids)
-                for values in res[report.id]['account'].values():
-                    for field in fields:
-                        res[report.id][field] += values.get(field)
+                        values[field] += value.get(field)
+            return values
+
+        res = {}
+        for report in reports:
+            res[report.id] = compute(report)
         return res
 
     def get_account_lines(self, data):
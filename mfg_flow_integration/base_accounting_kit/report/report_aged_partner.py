@@ -67,26 +67,13 @@ class ReportAgedPartnerBalance(models.AbstractModel):
         total = []
         cr = self.env.cr
         user_company = self.env.company
-        user_currency = user_company.currency_id
-        ResCurrency = self.env['res.currency'].with_context(date=date_from)
         company_ids = self._context.get('company_ids') or [user_company.id]
         move_state = ['draft', 'posted']
         if target_move == 'posted':
             move_state = ['posted']
         arg_list = (tuple(move_state), tuple(account_type))
-        # build the reconciliation clause to see what partner needs to be printed
-        reconciliation_clause = '(l.reconciled IS FALSE)'
-        cr.execute(
-            'SELECT debit_move_id, credit_move_id FROM account_partial_reconcile'
-            ' where max_date > %s',
-            (date_from,))
-        reconciled_after_date = []
-        for row in cr.fetchall():
-            reconciled_after_date += [row[0], row[1]]
-        if reconciled_after_date:
-            reconciliation_clause = '(l.reconciled IS FALSE OR l.id IN %s)'
-            arg_list += (tuple(reconciled_after_date),)
-        arg_list += (date_from, tuple(company_ids))
+        # the lines still open as of date_from, see full_reconcile_date
+        arg_list += (date_from, date_from, tuple(company_ids))
         query = '''
             SELECT DISTINCT l.partner_id, UPPER(res_partner.name)
             FROM account_move_line AS l left join res_partner on l.partner_id =
@@ -95,7 +82,7 @@ class ReportAgedPartnerBalance(models.AbstractModel):
                 AND (l.move_id = am.id)
                 AND (am.state IN %s)
                 AND (account_account.account_type IN %s)
-                AND ''' + reconciliation_clause + '''
+                AND COALESCE(l.full_reconcile_date, 'infinity'::date) > %s
                 AND (l.date <= %s)
                 AND l.company_id IN %s
             ORDER BY UPPER(res_partner.name)'''
@@ -111,122 +98,26 @@ class ReportAgedPartnerBalance(models.AbstractModel):
             (partner['partner_id'] or False, []) for partner in partners)
         if not partner_ids:
             return [], [], {}
-        # This dictionary will store the not due amount of all partners
+        # Bucket and net every candidate line in one pass, then group the
+        # amounts per period (0-4 for the aged periods, 6 for not due) and
+        # partner: history[i] = {'<partner_id>': <partner_debit-credit>}
         undue_amounts = {}
-        query = '''SELECT l.id
-                FROM account_move_line AS l, account_account, account_move am
-                WHERE (l.account_id = account_account.id) AND (l.move_id = am.id)
-                    AND (am.state IN %s)
-                    AND (account_account.account_type IN %s)
-                    AND (COALESCE(l.date_maturity,l.date) >= %s)\
-                    AND ((l.partner_id IN %s) OR (l.partner_id IS NULL))
-                AND (l.date <= %s)
-                AND l.company_id IN %s'''
-        cr.execute(query, (
-            tuple(move_state), tuple(account_type), date_from,
-            tuple(partner_ids), date_from, tuple(company_ids)))
-        aml_ids = cr.fetchall()
-        aml_ids = aml_ids and [x[0] for x in aml_ids] or []
-        for line in self.env['account.move.line'].browse(aml_ids):
-            partner_id = line.partner_id.id or False
-            if partner_id not in undue_amounts:
-                undue_amounts[partner_id] = 0.0
-            line_amount = ResCurrency._convert(line.balance, user_currency,
-                                               line.company_id, date_from)
-            if user_currency.is_zero(line_amount):
-                continue
-            for partial_line in line.matched_debit_ids:
-                if partial_line.max_date <= date_from:
-                    line_amount += ResCurrency._convert(
-                        from_amount=partial_line.amount,
-                        to_currency=user_currency,
-                        company=partial_line.company_id,
-                        date=date_from
-                    )
-            for partial_line in line.matched_credit_ids:
-                if partial_line.max_date <= date_from:
-                    line_amount -= ResCurrency._convert(
-                        from_amount=partial_line.amount,
-                        to_currency=user_currency,
-                        company=partial_line.company_id,
-                        date=date_from
-                    )
-            if not self.env.company.currency_id.is_zero(line_amount):
-                undue_amounts[partner_id] += line_amount
-                lines[partner_id].append({
-                    'line': line,
-                    'amount': line_amount,
-                    'period': 6,
-                })
-        # Use one query per period and store results in history (a list variable)
-        # Each history will contain: history[1] = {'<partner_id>': <partner_debit-credit>}
-        history = []
-        for i in range(5):
-            args_list = (
-            tuple(move_state), tuple(account_type), tuple(partner_ids),)
-            dates_query = '(COALESCE(l.date_maturity,l.date)'
-            if periods[str(i)]['start'] and periods[str(i)]['stop']:
-                dates_query += ' BETWEEN %s AND %s)'
-                args_list += (
-                periods[str(i)]['start'], periods[str(i)]['stop'])
-            elif periods[str(i)]['start']:
-                dates_query += ' >= %s)'
-                args_list += (periods[str(i)]['start'],)
-            else:
-                dates_query += ' <= %s)'
-                args_list += (periods[str(i)]['stop'],)
-            args_list += (date_from, tuple(company_ids))
-            query = '''SELECT l.id
-                    FROM account_move_line AS l, account_account, account_move am
-                    WHERE (l.account_id = account_account.id) AND 
-                    (l.move_id = am.id)
-                        AND (am.state IN %s)
-                        AND (account_account.account_type IN %s)
-                        AND ((l.partner_id IN %s) OR (l.partner_id IS NULL))
-                        AND ''' + dates_query + '''
-                    AND (l.date <= %s)
-                    AND l.company_id IN %s'''
-            cr.execute(query, args_list)
-            partners_amount = {}
-            aml_ids = cr.fetchall()
-            aml_ids = aml_ids and [x[0] for x in aml_ids] or []
-            for line in self.env['account.move.line'].browse(aml_ids):
-                partner_id = line.partner_id.id or False
-                if partner_id not in partners_amount:
-                    partners_amount[partner_id] = 0.0
-                line_amount = ResCurrency._convert(
-                    from_amount=line.balance,
-                    to_currency=user_currency,
-                    company=line.company_id,
-                    date=date_from
-                )
-                if user_currency.is_zero(line_amount):
-                    continue
-                for partial_line in line.matched_debit_ids:
-                    if partial_line.max_date <= date_from:
-                        line_amount += ResCurrency._convert(
-                            from_amount=partial_line.amount,
-                            to_currency=user_currency,
-                            company=partial_line.company_id,
-                            date=date_from
-                        )
-                for partial_line in line.matched_credit_ids:
-                    if partial_line.max_date <= date_from:
-                        line_amount -= ResCurrency._convert(
-                            from_amount=partial_line.amount,
-                            to_currency=user_currency,
-                            company=partial_line.company_id,
-                            date=date_from
-                        )
-                if not self.env.company.currency_id.is_zero(
-                        line_amount):
-                    partners_amount[partner_id] += line_amount
-                    lines[partner_id].append({
-                        'line': line,
-                        'amount': line_amount,
-                        'period': i + 1,
-                    })
-            history.append(partners_amount)
+        history = [{} for i in range(5)]
+        for line, partner_id, period, line_amount in \
+                self._get_aged_move_line_amounts(
+                    periods, move_state, account_type, partner_ids, date_from,
+                    company_ids):
+            partners_amount = undue_amounts if period == 6 else history[
+                period - 1]
+            partners_amount[partner_id] = partners_amount.get(
+                partner_id, 0.0) + line_amount
+            lines[partner_id].append({
+                'line': line,
+                'amount': line_amount,
+                'period': period,
+            })
+        partners_by_id = {partner.id: partner for partner in
+                          self.env['res.partner'].browse(partner_ids)}
         for partner in partners:
             if partner['partner_id'] is None:
                 partner['partner_id'] = False
@@ -259,8 +150,7 @@ class ReportAgedPartnerBalance(models.AbstractModel):
             total[(i + 1)] += values['total']
             values['partner_id'] = partner['partner_id']
             if partner['partner_id']:
-                browsed_partner = self.env['res.partner'].browse(
-                    partner['partner_id'])
+                browsed_partner = partners_by_id[partner['partner_id']]
                 values['name'] = browsed_partner.name and len(
                     browsed_partner.name) >= 45 and browsed_partner.name[
                                                     0:40] + '...' or browsed_partner.name
@@ -274,6 +164,114 @@ class ReportAgedPartnerBalance(models.AbstractModel):
                 res.append(values)
         return res, total, lines
 
+    def _get_aged_move_line_amounts(self, periods, move_state, account_type,
+                                    partner_ids, date_from, company_ids):
+        """Yield (move line, partner id, period, amount) for the open lines
+        of the aged balance.
+
+        Age buckets and the partial reconciliations dated on or before
+        ``date_from`` are resolved by a single query on the lines still open
+        at that date; the amounts are then
+        converted with one rate per company and lines netting to zero are
+        dropped, exactly as the former per-period queries did.
+        """
+        bucket_clauses = []
+        args = {
+            'date_from': date_from,
+            'move_state': tuple(move_state),
+            'account_type': tuple(account_type),
+            'partner_ids': tuple(partner_ids),
+            'company_ids': tuple(company_ids),
+        }
+        for i in range(5):
+            start = periods[str(i)]['start']
+            stop = periods[str(i)]['stop']
+            args.update({'start_%s' % i: start, 'stop_%s' % i: stop})
+            if start and stop:
+                condition = ('BETWEEN %%(start_%s)s AND %%(stop_%s)s'
+                             % (i, i))
+            elif start:
+                condition = '>= %%(start_%s)s' % i
+            else:
+                condition = '<= %%(stop_%s)s' % i
+            bucket_clauses.append(
+                'WHEN COALESCE(l.date_maturity, l.date) %s THEN %s'
+                % (condition, i + 1))
+        query = '''
+            SELECT l.id, l.partner_id, l.company_id, l.balance,
+                CASE
+                    WHEN COALESCE(l.date_maturity, l.date) >= %%(date_from)s
+                    THEN 6
+                    %s
+                END AS period,
+                COALESCE((SELECT SUM(part.amount)
+                    FROM account_partial_reconcile part
+                    WHERE part.credit_move_id = l.id
+                        AND part.max_date <= %%(date_from)s), 0)
+                    AS matched_debit,
+                COALESCE((SELECT SUM(part.amount)
+                    FROM account_partial_reconcile part
+                    WHERE part.debit_move_id = l.id
+                        AND part.max_date <= %%(date_from)s), 0)
+                    AS matched_credit
+            FROM account_move_line AS l
+            JOIN account_account ON l.account_id = account_account.id
+            JOIN account_move am ON l.move_id = am.id
+            WHERE am.state IN %%(move_state)s
+                AND account_account.account_type IN %%(account_type)s
+                AND ((l.partner_id IN %%(partner_ids)s)
+                    OR (l.partner_id IS NULL))
+                AND COALESCE(l.full_reconcile_date, 'infinity'::date)
+                    > %%(date_from)s
+                AND l.date <= %%(date_from)s
+                AND l.company_id IN %%(company_ids)s''' % '\n                    '.join(
+            bucket_clauses)
+        self.env.cr.execute(query, args)
+        rows = self.env.cr.fetchall()
+        user_currency = self.env.company.currency_id
+        ResCurrency = self.env['res.currency'].with_context(date=date_from)
+        companies = self.env['res.company'].browse({row[2] for row in rows})
+        # Same conversion as ResCurrency._convert, evaluated once per
+        # (currency, company) pair instead of once per line and partial
+        rates = {
+            company.id: ResCurrency._get_conversion_rate(
+                user_currency, user_currency, company, date_from)
+            for company in companies
+        }
+        MoveLine = self.env['account.move.line']
+        for line_id, partner_id, company_id, balance, period, \
+                matched_debit, matched_credit in rows:
+            rate = rates[company_id]
+            line_amount = user_currency.round((balance or 0.0) * rate)
+            if user_currency.is_zero(line_amount):
+                continue
+            line_amount += user_currency.round(matched_debit * rate)
+            line_amount -= user_currency.round(matched_credit * rate)
+            if not self.env.company.currency_id.is_zero(line_amount):
+                yield (MoveLine.browse(line_id), partner_id or False, period,
+                       line_amount)
+
+    def _get_xlsx_report(self, docids, data):
+        """XLSX export of the aged balance, see account.report.xlsx"""
+        values = self._get_report_values(docids, data)
+        form = values['data']
+        columns = [(_('Partners'), 'char'), (_('Not due'), 'amount')] + [
+            (form[str(period)]['name'], 'amount') for period in range(4, -1, -1)
+        ] + [(_('Total'), 'amount')]
+        total = values['get_direction']
+
+        def rows():
+            if values['get_partner_lines']:
+                yield 'total', [_('Account Total'), total[6], total[4],
+                                total[3], total[2], total[1], total[0],
+                                total[5]]
+            for partner in values['get_partner_lines']:
+                yield 'line', [partner['name'], partner['direction'],
+                               partner['4'], partner['3'], partner['2'],
+                               partner['1'], partner['0'], partner['total']]
+
+        return self._description, columns, rows()
+
     @api.model
     def _get_report_values(self, docids, data=None):
         if not data.get('form') or not self.env.context.get(
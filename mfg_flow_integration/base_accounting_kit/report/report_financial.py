@@ -19,6 +19,8 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 #
 #############################################################################
+from collections import defaultdict
+
 from odoo import api, fields, models
 
 
@@ -60,13 +62,21 @@ class AccountFinancialReport(models.Model):
     def _get_children_by_order(self):
         """returns a recordset of all the children computed recursively,
          and sorted by sequence. Ready for the printing"""
-        res = self
-        children = self.search([('parent_id', 'in', self.ids)],
-                               order='sequence ASC')
-        if children:
-            for child in children:
-                res += child._get_children_by_order()
-        return res
+        # load the whole subtree at once and order it in memory
+        children = defaultdict(list)
+        subtree = self.search([('id', 'child_of', self.ids)]).sorted(
+            key=lambda r: (r.sequence, r.id))
+        for report in subtree:
+            children[report.parent_id.id].append(report.id)
+
+        def walk(report_ids):
+            for report_id in report_ids:
+                yield report_id
+                yield from walk(children[report_id])
+
+        top_ids = set(id_ for report in self for id_ in children[report.id])
+        return self + self.browse(list(walk(
+            [id_ for id_ in subtree.ids if id_ in top_ids])))
 
     name = fields.Char('Report Name', required=True, translate=True)
     parent_id = fields.Many2one('account.financial.report',
@@ -28,15 +28,31 @@ class ReportJournal(models.AbstractModel):
     _name = 'report.base_accounting_kit.report_journal_audit'
     _description = 'Journal Report'
 
+    # Journal item fields printed by the report template
+    _audit_line_fields = ['move_id', 'date', 'account_id', 'partner_id',
+                          'name', 'debit', 'credit', 'amount_currency',
+                          'currency_id']
+
     def lines(self, target_move, journal_ids, sort_selection, data):
         if isinstance(journal_ids, int):
             journal_ids = [journal_ids]
+        lines = self._get_journals_lines(target_move, journal_ids,
+                                         sort_selection, data)
+        return self.env['account.move.line'].browse(
+            [line_id for journal_id in journal_ids
+             for line_id in lines[journal_id].ids])
+
+    def _get_journals_lines(self, target_move, journal_ids, sort_selection,
+                            data):
+        """Return {journal_id: journal items} of all the journals with a
+        single query, the printed fields being prefetched at once"""
         move_state = ['draft', 'posted']
         if target_move == 'posted':
             move_state = ['posted']
         query_get_clause = self._get_query_get_clause(data)
         params = [tuple(move_state), tuple(journal_ids)] + query_get_clause[2]
-        query = 'SELECT "account_move_line".id FROM ' + query_get_clause[
+        query = 'SELECT "account_move_line".journal_id, ' \
+                '"account_move_line".id FROM ' + query_get_clause[
             0] + (', account_move am, account_account acc WHERE '
                   '"account_move_line".account_id = acc.id AND '
                   '"account_move_line".move_id=am.id AND am.state IN %s AND '
@@ -48,81 +64,95 @@ class ReportJournal(models.AbstractModel):
             query += 'am.name'
         query += ', "account_move_line".move_id, acc.code'
         self.env.cr.execute(query, tuple(params))
-        ids = (x[0] for x in self.env.cr.fetchall())
-        return self.env['account.move.line'].browse(ids)
+        ids = {journal_id: [] for journal_id in journal_ids}
+        for journal_id, line_id in self.env.cr.fetchall():
+            ids[journal_id].append(line_id)
+        move_lines = self.env['account.move.line'].browse(
+            [line_id for line_ids in ids.values() for line_id in line_ids])
+        move_lines.fetch(self._audit_line_fields)
+        move_lines.move_id.fetch(['name'])
+        move_lines.account_id.fetch(['code'])
+        move_lines.sudo().partner_id.fetch(['name'])
+        return {journal_id: self.env['account.move.line'].browse(line_ids)
+                for journal_id, line_ids in ids.items()}
 
-    def _sum_debit(self, data, journal_id):
-        move_state = ['draft', 'posted']
-        if data['form'].get('target_move', 'all') == 'posted':
-            move_state = ['posted']
-        query_get_clause = self._get_query_get_clause(data)
-        params = [tuple(move_state), tuple(journal_id.ids)] + query_get_clause[
-            2]
-        self.env.cr.execute('SELECT SUM(debit) FROM ' + query_get_clause[
-            0] + ', account_move am '
-                 'WHERE "account_move_line".move_id=am.id AND am.state IN %s'
-                 ' AND "account_move_line".journal_id IN %s AND ' +
-                            query_get_clause[1] + ' ',
-                            tuple(params))
-        return self.env.cr.fetchone()[0] or 0.0
-
-    def _sum_credit(self, data, journal_id):
-        move_state = ['draft', 'posted']
-        if data['form'].get('target_move', 'all') == 'posted':
-            move_state = ['posted']
-        query_get_clause = self._get_query_get_clause(data)
-        params = [tuple(move_state), tuple(journal_id.ids)] + query_get_clause[
-            2]
-        self.env.cr.execute('SELECT SUM(credit) FROM ' + query_get_clause[
-            0] + ', account_move am '
-                 'WHERE "account_move_line".move_id=am.id AND am.state IN %s '
-                 'AND "account_move_line".journal_id IN %s AND ' +
-                            query_get_clause[1] + ' ',
-                            tuple(params))
-        return self.env.cr.fetchone()[0] or 0.0
+    def _get_journals_totals(self, data, journals):
+        """Compute the debit and credit totals and the tax declaration of
+        all ``journals`` with two grouped queries.
 
-    def _get_taxes(self, data, journal_id):
+        :return: {journal_id: {'debit': total debit, 'credit': total credit,
+                 'taxes': {account.tax: {'base_amount', 'tax_amount'}}}}
+        """
         move_state = ['draft', 'posted']
         if data['form'].get('target_move', 'all') == 'posted':
             move_state = ['posted']
         query_get_clause = self._get_query_get_clause(data)
-        params = [tuple(move_state), tuple(journal_id.ids)] + query_get_clause[
+        params = [tuple(move_state), tuple(journals.ids)] + query_get_clause[
             2]
+        totals = {journal.id: {'debit': 0.0, 'credit': 0.0, 'taxes': {}}
+                  for journal in journals}
+        # totals of the journals and tax amounts of their tax lines
+        self.env.cr.execute(
+            'SELECT "account_move_line".journal_id, '
+            '"account_move_line".tax_line_id, GROUPING('
+            '"account_move_line".tax_line_id), SUM(debit), SUM(credit), '
+            'SUM(debit - credit) FROM ' + query_get_clause[
+                0] + ', account_move am '
+                     'WHERE "account_move_line".move_id=am.id AND am.state IN '
+                     '%s AND "account_move_line".journal_id IN %s AND ' +
+            query_get_clause[1] + ' GROUP BY GROUPING SETS (('
+                                  '"account_move_line".journal_id), ('
+                                  '"account_move_line".journal_id, '
+                                  '"account_move_line".tax_line_id))',
+            tuple(params))
+        tax_amounts = {}
+        for journal_id, tax_id, is_total, debit, credit, balance in \
+                self.env.cr.fetchall():
+            if is_total:
+                totals[journal_id]['debit'] = debit or 0.0
+                totals[journal_id]['credit'] = credit or 0.0
+            elif tax_id:
+                tax_amounts[journal_id, tax_id] = balance or 0.0
+        # base amounts of the taxes
         query = """
-            SELECT rel.account_tax_id, SUM("account_move_line".balance) 
-            AS base_amount
+            SELECT "account_move_line".journal_id, rel.account_tax_id,
+                SUM("account_move_line".balance) AS base_amount
             FROM account_move_line_account_tax_rel rel, """ + query_get_clause[
-            0] + """ 
+            0] + """
             LEFT JOIN account_move am ON "account_move_line".move_id = am.id
             WHERE "account_move_line".id = rel.account_move_line_id
                 AND am.state IN %s
                 AND "account_move_line".journal_id IN %s
                 AND """ + query_get_clause[1] + """
-           GROUP BY rel.account_tax_id"""
+           GROUP BY "account_move_line".journal_id, rel.account_tax_id
+           ORDER BY rel.account_tax_id"""
         self.env.cr.execute(query, tuple(params))
-        ids = []
-        base_amounts = {}
-        for row in self.env.cr.fetchall():
-            ids.append(row[0])
-            base_amounts[row[0]] = row[1]
-        res = {}
-        for tax in self.env['account.tax'].browse(ids):
-            self.env.cr.execute(
-                'SELECT sum(debit - credit) FROM ' + query_get_clause[
-                    0] + ', account_move am '
-                         'WHERE "account_move_line".move_id=am.id AND am.state'
-                         ' IN %s AND "account_move_line".journal_id IN %s AND ' +
-                query_get_clause[1] + ' AND tax_line_id = %s',
-                tuple(params + [tax.id]))
-            res[tax] = {
-                'base_amount': base_amounts[tax.id],
-                'tax_amount': self.env.cr.fetchone()[0] or 0.0,
+        rows = self.env.cr.fetchall()
+        taxes = self.env['account.tax'].browse({row[1] for row in rows})
+        taxes.fetch(['name'])
+        # sales operation are credits
+        sale_journal_ids = set(journals.filtered(
+            lambda journal: journal.type == 'sale').ids)
+        for journal_id, tax_id, base_amount in rows:
+            sign = -1 if journal_id in sale_journal_ids else 1
+            totals[journal_id]['taxes'][taxes.browse(tax_id)] = {
+                'base_amount': base_amount * sign,
+                'tax_amount': tax_amounts.get((journal_id, tax_id),
+                                              0.0) * sign,
             }
-            if journal_id.type == 'sale':
-                # sales operation are credits
-                res[tax]['base_amount'] = res[tax]['base_amount'] * -1
-                res[tax]['tax_amount'] = res[tax]['tax_amount'] * -1
-        return res
+        return totals
+
+    def _sum_debit(self, data, journal_id):
+        return self._get_journals_totals(data, journal_id)[
+            journal_id.id]['debit']
+
+    def _sum_credit(self, data, journal_id):
+        return self._get_journals_totals(data, journal_id)[
+            journal_id.id]['credit']
+
+    def _get_taxes(self, data, journal_id):
+        return self._get_journals_totals(data, journal_id)[
+            journal_id.id]['taxes']
 
     def _get_query_get_clause(self, data):
         return self.env['account.move.line'].with_context(
@@ -135,22 +165,20 @@ class ReportJournal(models.AbstractModel):
                 _("Form content is missing, this report cannot be printed."))
         target_move = data['form'].get('target_move', 'all')
         sort_selection = data['form'].get('sort_selection', 'date')
-        res = {}
-        for journal in data['form']['journal_ids']:
-            res[journal] = self.with_context(
-                data['form'].get('used_context', {})).lines(target_move,
-                                                            journal,
-                                                            sort_selection,
-                                                            data)
+        journals = self.env['account.journal'].browse(
+            data['form']['journal_ids'])
+        res = self.with_context(
+            data['form'].get('used_context', {}))._get_journals_lines(
+            target_move, journals.ids, sort_selection, data)
+        totals = self._get_journals_totals(data, journals)
         return {
             'doc_ids': data['form']['journal_ids'],
             'doc_model': self.env['account.journal'],
             'data': data,
-            'docs': self.env['account.journal'].browse(
-                data['form']['journal_ids']),
+            'docs': journals,
             'time': time,
             'lines': res,
-            'sum_credit': self._sum_credit,
-            'sum_debit': self._sum_debit,
-            'get_taxes': self._get_taxes,
+            'sum_credit': lambda data, journal: totals[journal.id]['credit'],
+            'sum_debit': lambda data, journal: totals[journal.id]['debit'],
+            'get_taxes': lambda data, journal: totals[journal.id]['taxes'],
         }
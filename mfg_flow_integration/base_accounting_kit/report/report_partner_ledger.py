@@ -20,94 +20,147 @@
 #
 #############################################################################
 import time
+from itertools import chain, groupby
+from operator import itemgetter
+
 from odoo import api, models, _
 from odoo.exceptions import UserError
 
 
 class ReportPartnerLedger(models.AbstractModel):
     _name = 'report.base_accounting_kit.report_partnerledger'
+    _inherit = 'account.ledger.mixin'
     _description = 'Partner Ledger Report'
 
-    def _lines(self, data, partner):
-        full_account = []
-        currency = self.env['res.currency']
+    def _get_partners_lines_query(self, data, extra_columns='', window=''):
+        """Query of the lines of every partner of the ledger, sorted by
+        partner reference and name (the report order) then date"""
         query_get_data = self.env['account.move.line'].with_context(
             data['form'].get('used_context', {}))._query_get()
         reconcile_clause = "" if data['form'][
             'reconciled'] else ' AND "account_move_line".full_reconcile_id IS NULL '
-        params = [partner.id, tuple(data['computed']['move_state']),
+        params = [tuple(data['computed']['move_state']),
                   tuple(data['computed']['account_ids'])] + \
                  query_get_data[2]
         query = """
-            SELECT "account_move_line".id, "account_move_line".date, j.code,
+            SELECT "account_move_line".id, "account_move_line".partner_id,
+             "account_move_line".date, j.code,
              acc.code as a_code, acc.name as a_name, "account_move_line".ref, 
              m.name as move_name, "account_move_line".name, 
              "account_move_line".debit, "account_move_line".credit, 
              "account_move_line".amount_currency,
              "account_move_line".currency_id, c.symbol AS currency_code
+             """ + extra_columns + """
             FROM """ + query_get_data[0] + """
+            JOIN res_partner p ON (p.id = "account_move_line".partner_id)
             LEFT JOIN account_journal j ON ("account_move_line".journal_id = j.id)
             LEFT JOIN account_account acc ON ("account_move_line".account_id = acc.id)
             LEFT JOIN res_currency c ON ("account_move_line".currency_id=c.id)
             LEFT JOIN account_move m ON (m.id="account_move_line".move_id)
-            WHERE "account_move_line".partner_id = %s
-                AND m.state IN %s
+            WHERE m.state IN %s
                 AND "account_move_line".account_id IN %s AND """ + \
-                query_get_data[1] + reconcile_clause + """
-                ORDER BY "account_move_line".date"""
+                query_get_data[1] + reconcile_clause + window + """
+                ORDER BY COALESCE(p.ref, '') COLLATE "C",
+                    COALESCE(p.name, '') COLLATE "C", p.id,
+                    "account_move_line".date, "account_move_line".id"""
+        return query, params
+
+    @staticmethod
+    def _get_displayed_name(line):
+        return '-'.join(
+            line[field_name] for field_name in ('move_name', 'ref', 'name')
+            if line[field_name] not in (None, '', '/')
+        )
+
+    def _get_partners_lines(self, data):
+        """Fetch the lines of every partner of the ledger with one query
+        sorted by partner reference and name (the report order) then date,
+        and compute the running balance and the partner totals in the same
+        pass. Returns the ordered partner ids, the lines and the totals,
+        both keyed by partner id.
+        """
+        currency = self.env['res.currency']
+        query, params = self._get_partners_lines_query(data)
         self.env.cr.execute(query, tuple(params))
-        res = self.env.cr.dictfetchall()
-        sum = 0.0
-        lang_code = self.env.context.get('lang') or 'en_US'
-        lang = self.env['res.lang']
-        lang_id = lang._lang_get(lang_code)
-        date_format = lang_id.date_format
-        for r in res:
-            r['date'] = r['date']
-            r['displayed_name'] = '-'.join(
-                r[field_name] for field_name in ('move_name', 'ref', 'name')
-                if r[field_name] not in (None, '', '/')
-            )
-            sum += r['debit'] - r['credit']
-            r['progress'] = sum
+        partner_ids = []
+        lines = {}
+        sums = {}
+        for r in self.env.cr.dictfetchall():
+            partner_id = r.pop('partner_id')
+            if partner_id not in lines:
+                partner_ids.append(partner_id)
+                lines[partner_id] = []
+                sums[partner_id] = {'debit': 0.0, 'credit': 0.0,
+                                    'debit - credit': 0.0}
+            total = sums[partner_id]
+            r['displayed_name'] = self._get_displayed_name(r)
+            total['debit'] += r['debit']
+            total['credit'] += r['credit']
+            total['debit - credit'] += r['debit'] - r['credit']
+            r['progress'] = total['debit - credit']
             r['currency_id'] = currency.browse(r.get('currency_id'))
-            full_account.append(r)
-        return full_account
+            lines[partner_id].append(r)
+        return partner_ids, lines, sums
 
-    def _sum_partner(self, data, partner, field):
-        if field not in ['debit', 'credit', 'debit - credit']:
-            return
-        result = 0.0
-        query_get_data = self.env['account.move.line'].with_context(
-            data['form'].get('used_context', {}))._query_get()
-        reconcile_clause = "" if data['form'][
-            'reconciled'] else ' AND "account_move_line".full_reconcile_id IS NULL '
-        params = [partner.id, tuple(data['computed']['move_state']),
-                  tuple(data['computed']['account_ids'])] + \
-                 query_get_data[2]
-        query = """SELECT sum(""" + field + """)
-                FROM """ + query_get_data[0] + """, account_move AS m
-                WHERE "account_move_line".partner_id = %s
-                    AND m.id = "account_move_line".move_id
-                    AND m.state IN %s
-                    AND account_id IN %s
-                    AND """ + query_get_data[1] + reconcile_clause
-        self.env.cr.execute(query, tuple(params))
+    def _get_partners_lines_stream(self, data):
+        """Streaming variant of :meth:`_get_partners_lines`, yielding
+        (partner_id, totals, lines) per partner. The totals and running
+        balance are computed by PostgreSQL so that the lines can be read
+        from a server-side cursor; they must be consumed before requesting
+        the next partner."""
+        query, params = self._get_partners_lines_query(data, """,
+             p.ref AS partner_ref, p.name AS partner_name,
+             SUM("account_move_line".debit) OVER partner AS partner_debit,
+             SUM("account_move_line".credit) OVER partner AS partner_credit,
+             SUM("account_move_line".debit - "account_move_line".credit)
+                OVER partner AS partner_balance,
+             SUM("account_move_line".debit - "account_move_line".credit)
+                OVER (partner ORDER BY "account_move_line".date,
+                      "account_move_line".id) AS progress""", """
+                WINDOW partner AS (
+                    PARTITION BY "account_move_line".partner_id)""")
+        rows = self._stream_query(query, tuple(params))
+        for partner_id, partner_rows in groupby(rows,
+                                                key=itemgetter('partner_id')):
+            first = next(partner_rows)
+            totals = {'ref': first['partner_ref'],
+                      'name': first['partner_name'],
+                      'debit': first['partner_debit'],
+                      'credit': first['partner_credit'],
+                      'debit - credit': first['partner_balance']}
+            yield partner_id, totals, self._add_displayed_name(
+                chain([first], partner_rows))
 
-        contemp = self.env.cr.fetchone()
-        if contemp is not None:
-            result = contemp[0] or 0.0
-        return result
+    def _add_displayed_name(self, rows):
+        for row in rows:
+            row['displayed_name'] = self._get_displayed_name(row)
+            yield row
 
-    @api.model
-    def _get_report_values(self, docids, data=None):
-        if not data.get('form'):
-            raise UserError(
-                _("Form content is missing, this report cannot be printed."))
+    def _get_xlsx_report(self, docids, data):
+        self._set_computed_data(data)
+        columns = [(_('Date'), 'date'), (_('JRNL'), 'char'),
+                   (_('Account'), 'char'), (_('Ref'), 'char'),
+                   (_('Debit'), 'amount'), (_('Credit'), 'amount'),
+                   (_('Balance'), 'amount')]
+
+        def rows():
+            for partner_id, totals, lines in self._get_partners_lines_stream(
+                    data):
+                yield 'total', [
+                    totals['ref'] or '', totals['name'], '', '',
+                    totals['debit'], totals['credit'],
+                    totals['debit - credit']]
+                for line in lines:
+                    yield 'line', [
+                        line['date'], line['code'], line['a_code'],
+                        line['displayed_name'], line['debit'],
+                        line['credit'], line['progress']]
+
+        return self._description, columns, rows()
+
+    def _set_computed_data(self, data):
+        """Add the move states and accounts of the ledger to ``data``"""
         data['computed'] = {}
-        obj_partner = self.env['res.partner']
-        query_get_data = self.env['account.move.line'].with_context(
-            data['form'].get('used_context', {}))._query_get()
         data['computed']['move_state'] = ['draft', 'posted']
         if data['form'].get('target_move', 'all') == 'posted':
             data['computed']['move_state'] = ['posted']
@@ -126,30 +179,23 @@ class ReportPartnerLedger(models.AbstractModel):
                             (tuple(data['computed']['ACCOUNT_TYPE']),))
         data['computed']['account_ids'] = [a for (a,) in
                                            self.env.cr.fetchall()]
-        params = [tuple(data['computed']['move_state']),
-                  tuple(data['computed']['account_ids'])] + query_get_data[2]
-        reconcile_clause = "" if data['form'][
-            'reconciled'] else ' AND "account_move_line".full_reconcile_id IS NULL '
-        query = """
-            SELECT DISTINCT "account_move_line".partner_id
-            FROM """ + query_get_data[0] + """, account_account AS account, account_move AS am
-            WHERE "account_move_line".partner_id IS NOT NULL
-                AND "account_move_line".account_id = account.id
-                AND am.id = "account_move_line".move_id
-                AND am.state IN %s
-                AND "account_move_line".account_id IN %s
-                AND NOT account.deprecated
-                AND """ + query_get_data[1] + reconcile_clause
-        self.env.cr.execute(query, tuple(params))
-        partner_ids = [res['partner_id'] for res in self.env.cr.dictfetchall()]
-        partners = obj_partner.browse(partner_ids)
-        partners = sorted(partners, key=lambda x: (x.ref or '', x.name or ''))
+
+    @api.model
+    def _get_report_values(self, docids, data=None):
+        if not data.get('form'):
+            raise UserError(
+                _("Form content is missing, this report cannot be printed."))
+        self._set_computed_data(data)
+        partner_ids, partner_lines, partner_sums = self._get_partners_lines(
+            data)
+        partners = self.env['res.partner'].browse(partner_ids)
         return {
             'doc_ids': partner_ids,
             'doc_model': self.env['res.partner'],
             'data': data,
             'docs': partners,
             'time': time,
-            'lines': self._lines,
-            'sum_partner': self._sum_partner,
+            'lines': lambda data, partner: partner_lines.get(partner.id, []),
+            'sum_partner': lambda data, partner, field: partner_sums.get(
+                partner.id, {}).get(field, 0.0),
         }
@@ -19,8 +19,8 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 #
 #############################################################################
-from _datetime import datetime
-from odoo import api, models, _
+from datetime import date, datetime
+from odoo import api, fields, models, tools, _
 from odoo.exceptions import UserError
 
 
@@ -38,45 +38,114 @@ class ReportTax(models.AbstractModel):
             'lines': self.get_lines(data.get('form')),
         }
 
-    def _sql_from_amls_one(self):
-        sql = """SELECT "account_move_line".tax_line_id, 
-        COALESCE(SUM("account_move_line".debit-"account_move_line".credit), 0)
-                    FROM %s
-                    WHERE %s  GROUP BY "account_move_line".tax_line_id"""
-        return sql
-
-    def _sql_from_amls_two(self):
-        sql = """SELECT r.account_tax_id, COALESCE(SUM(
-        "account_move_line".debit-"account_move_line".credit), 0)
-                 FROM %s
+    def _sql_from_amls_periods(self, period_count):
+        """Tax and base amounts of ``period_count`` periods in one scan of
+        the journal items, one conditionally aggregated column per period.
+        Takes the tables and where clause of the journal items, then the
+        bounds of the periods twice (tax, then base columns)."""
+        columns = ', '.join(
+            ['COALESCE(SUM(lines.amount) FILTER (WHERE lines.date >= %s '
+             'AND lines.date <= %s), 0)'] * period_count)
+        sql = """WITH lines AS MATERIALIZED (
+                    SELECT "account_move_line".id,
+                        "account_move_line".tax_line_id,
+                        "account_move_line".date,
+                        "account_move_line".debit -
+                        "account_move_line".credit AS amount
+                    FROM {tables}
+                    WHERE {where_clause})
+                 SELECT 'tax', lines.tax_line_id, """ + columns + """
+                 FROM lines WHERE lines.tax_line_id IS NOT NULL
+                 GROUP BY lines.tax_line_id
+                 UNION ALL
+                 SELECT 'net', r.account_tax_id, """ + columns + """
+                 FROM lines
                  INNER JOIN account_move_line_account_tax_rel r ON
-                  ("account_move_line".id = r.account_move_line_id)
-                 INNER JOIN account_tax t ON (r.account_tax_id = t.id)
-                 WHERE %s GROUP BY r.account_tax_id"""
+                  (lines.id = r.account_move_line_id)
+                 GROUP BY r.account_tax_id"""
         return sql
 
-    def _compute_from_amls(self, options, taxes):
-        # compute the tax amount
-        sql = self._sql_from_amls_one()
+    def _compute_period_amounts(self, tables, where_clause, where_params,
+                                periods):
+        """Return, for each (date_from, date_to) of ``periods``, a dictionary
+        {tax_id: {'tax': tax amount, 'net': base amount}}"""
+        bounds = [bound for date_from, date_to in periods
+                  for bound in (date_from or date.min, date_to or date.max)]
+        query = self._sql_from_amls_periods(len(periods)).format(
+            tables=tables, where_clause=where_clause)
+        self.env.cr.execute(query, list(where_params) + bounds + bounds)
+        amounts = [{} for period in periods]
+        for kind, tax_id, *values in self.env.cr.fetchall():
+            for period_amounts, value in zip(amounts, values):
+                period_amounts.setdefault(
+                    tax_id, {'tax': 0, 'net': 0})[kind] = abs(value)
+        return amounts
+
+    @tools.ormcache('where_clause', 'params_key', 'period')
+    def _get_closed_period_items(self, tables, where_clause, where_params,
+                                 params_key, period):
+        """Amounts of a locked period, which cannot change anymore, as a
+        tuple of (tax_id, tax amount, base amount) shared by every caller;
+        cleared when a lock date changes"""
+        amounts = self._compute_period_amounts(tables, where_clause,
+                                               where_params, [period])[0]
+        return tuple((tax_id, values['tax'], values['net'])
+                     for tax_id, values in amounts.items())
+
+    def _get_closed_period_amounts(self, tables, where_clause, where_params,
+                                   params_key, period):
+        """Return {tax_id: {'tax': tax amount, 'net': base amount}} of a
+        locked period"""
+        return {tax_id: {'tax': tax, 'net': net}
+                for tax_id, tax, net in self._get_closed_period_items(
+                    tables, where_clause, where_params, params_key, period)}
+
+    def _is_closed_period(self, period):
+        if self.env.context.get('state') != 'posted' or not period[1]:
+            return False
+        return all(company.fiscalyear_lock_date and
+                   period[1] <= company.fiscalyear_lock_date
+                   for company in self.env.companies)
+
+    def _compute_periods(self, periods):
+        """Compute the tax and base amounts of every period with a single
+        scan of the journal items, locked periods being cached until the
+        lock date moves and open ones until the ledger changes.
+
+        :param periods: list of (date_from, date_to), either may be False
+        :return: list of {tax_id: {'tax': tax amount, 'net': base amount}}
+        """
+        periods = [(fields.Date.to_date(date_from), fields.Date.to_date(date_to))
+                   for date_from, date_to in periods]
         tables, where_clause, where_params = self.env[
-            'account.move.line']._query_get()
-        query = sql % (tables, where_clause)
-        self.env.cr.execute(query, where_params)
-        results = self.env.cr.fetchall()
-        for result in results:
-            if result[0] in taxes:
-                taxes[result[0]]['tax'] = abs(result[1])
-        # compute the net amount
-        sql2 = self._sql_from_amls_two()
-        query = sql2 % (tables, where_clause)
-        self.env.cr.execute(query, where_params)
-        results = self.env.cr.fetchall()
-        for result in results:
-            if result[0] in taxes:
-                taxes[result[0]]['net'] = abs(result[1])
+            'account.move.line'].with_context(
+            date_from=False, date_to=False)._query_get()
+        params_key = repr(where_params)
+        amounts = {}
+        open_periods = []
+        for period in periods:
+            if self._is_closed_period(period):
+                amounts[period] = self._get_closed_period_amounts(
+                    tables, where_clause, where_params, params_key, period)
+            elif period not in open_periods:
+                open_periods.append(period)
+        if open_periods:
+            # restrict the scan to the range covered by the periods
+            date_from = min(period[0] or date.min for period in open_periods)
+            date_to = max(period[1] or date.max for period in open_periods)
+            where_clause = ('(%s) AND "account_move_line".date >= %%s AND '
+                            '"account_move_line".date <= %%s' % where_clause)
+            where_params = list(where_params) + [date_from, date_to]
+            amounts.update(zip(open_periods, self.env[
+                'account.report.cache'].with_context(
+                date_from=False, date_to=False)._get_or_compute(
+                'tax', tuple(open_periods),
+                lambda: self._compute_period_amounts(
+                    tables, where_clause, where_params, open_periods))))
+        return [amounts[period] for period in periods]
 
-    @api.model
-    def get_lines(self, options):
+    def _get_tax_lines(self):
+        """Return {tax_id: line} of the taxes displayed in the report"""
         taxes = {}
         for tax in self.env['account.tax'].search(
                 [('type_tax_use', '!=', 'none')]):
@@ -89,24 +158,25 @@ class ReportTax(models.AbstractModel):
             else:
                 taxes[tax.id] = {'tax': 0, 'net': 0, 'name': tax.name,
                                  'type': tax.type_tax_use}
-        if options['date_from'] and not options['date_to']:
-            self.with_context(date_from=options['date_from'],
-                              strict_range=True)._compute_from_amls(options,
-                                                                    taxes)
-        elif options['date_to'] and not options['date_from']:
-            self.with_context(date_to=options['date_to'],
-                              strict_range=True)._compute_from_amls(options,
-                                                                    taxes)
-        elif options['date_from'] and options['date_to']:
-            self.with_context(date_from=options['date_from'],
-                              date_to=options['date_to'],
-                              strict_range=True)._compute_from_amls(options,
-                                                                    taxes)
-        else:
+        return taxes
+
+    def _compute_from_amls(self, options, taxes):
+        period = (self.env.context.get('date_from'),
+                  self.env.context.get('date_to'))
+        for tax_id, values in self._compute_periods([period])[0].items():
+            if tax_id in taxes:
+                taxes[tax_id].update(values)
+
+    @api.model
+    def get_lines(self, options):
+        taxes = self._get_tax_lines()
+        date_from = options['date_from']
+        date_to = options['date_to']
+        if not date_from and not date_to:
             date_to = str(datetime.today().date())
-            self.with_context(date_to=date_to,
-                              strict_range=True)._compute_from_amls(options,
-                                                                    taxes)
+        self.with_context(date_from=date_from, date_to=date_to,
+                          strict_range=True)._compute_from_amls(options,
+                                                                taxes)
         groups = dict((tp, []) for tp in ['sale', 'purchase'])
         for tax in taxes.values():
             if tax['tax']:
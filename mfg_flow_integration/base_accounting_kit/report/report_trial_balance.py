@@ -41,12 +41,21 @@ class ReportTrialBalance(models.AbstractModel):
                 `credit`: total amount of credit,
                 `debit`: total amount of debit,
                 `balance`: total amount of balance,
+
+            Results are shared through the report cache until the ledger
+            of the companies or the accounts change.
         """
+        return self.env['account.report.cache']._get_or_compute(
+            'trial_balance', (tuple(accounts.ids), display_account),
+            lambda: self._compute_accounts(accounts, display_account),
+            definition_models=('account.account',))
 
+    def _compute_accounts(self, accounts, display_account):
         account_result = {}
         # Prepare sql query base on selected parameters from wizard
-        tables, where_clause, where_params = self.env[
-            'account.move.line']._query_get()
+        tables, where_clause, where_params = (
+            self.env['account.balance.snapshot']._query_get() or
+            self.env['account.move.line']._query_get())
         tables = tables.replace('"', '')
         if not tables:
             tables = 'account_move_line'
@@ -88,6 +97,123 @@ class ReportTrialBalance(models.AbstractModel):
                 account_res.append(res)
         return account_res
 
+    def _get_period_accounts(self, accounts, display_account, periods):
+        """Comparative trial balance over several periods.
+
+        :param periods: list of (name, date_from, date_to), sorted by start
+        :return: list of dict with the `code`, `name`, `opening` balance
+            before the first period, the `periods` list of {debit, credit,
+            balance} movements and the `closing` balance of each account
+
+        The amounts of every period come from a single query grouped by
+        account with one FILTER column per period, so printing twelve
+        months costs about the same as printing one. Accounts not carrying
+        their balance forward (income and expenses) open at zero.
+        """
+        report = self.with_context(date_from=False, date_to=False)
+        return report.env['account.report.cache']._get_or_compute(
+            'trial_balance_periods',
+            (tuple(accounts.ids), display_account, tuple(
+                tuple(period) for period in periods)),
+            lambda: report._compute_period_accounts(
+                accounts, display_account, periods),
+            definition_models=('account.account',))
+
+    def _compute_period_accounts(self, accounts, display_account, periods):
+        if not accounts or not periods:
+            return []
+        query_get = self.env['account.balance.snapshot']._query_get()
+        table = 'account_balance_snapshot'
+        if not query_get:
+            query_get = self.env['account.move.line']._query_get()
+            table = 'account_move_line'
+        tables, where_clause, where_params = query_get
+        date_column = '"%s"."date"' % table
+        first_date = min(period[1] for period in periods)
+        last_date = max(period[2] for period in periods)
+        columns = [
+            "SUM(debit - credit) FILTER (WHERE %s < %%s) AS opening"
+            % date_column,
+            "SUM(debit - credit) FILTER (WHERE %s >= %%s) AS movement"
+            % date_column,
+        ]
+        params = [first_date, first_date]
+        for index, (name, date_from, date_to) in enumerate(periods):
+            period_filter = 'FILTER (WHERE %s BETWEEN %%s AND %%s)' % (
+                date_column)
+            columns += ['SUM(debit) %s AS debit_%s' % (period_filter, index),
+                        'SUM(credit) %s AS credit_%s' % (period_filter, index)]
+            params += [date_from, date_to, date_from, date_to]
+        request = (
+            "SELECT account_id AS id, " + ", ".join(columns) +
+            " FROM " + tables.replace('"', '') +
+            " WHERE account_id IN %s AND " + date_column + " <= %s" +
+            (" AND " + where_clause if where_clause.strip() else "") +
+            " GROUP BY account_id")
+        params += [tuple(accounts.ids), last_date] + list(where_params)
+        self.env.cr.execute(request, params)
+        account_result = {row.pop('id'): row
+                          for row in self.env.cr.dictfetchall()}
+
+        account_res = []
+        for account in accounts:
+            row = account_result.get(account.id, {})
+            currency = (account.currency_id or
+                        account.company_id.currency_id)
+            opening = ((row.get('opening') or 0.0)
+                       if account.include_initial_balance else 0.0)
+            res = {
+                'code': account.code,
+                'name': account.name,
+                'opening': opening,
+                'periods': [],
+                'closing': opening + (row.get('movement') or 0.0),
+            }
+            for index in range(len(periods)):
+                debit = row.get('debit_%s' % index) or 0.0
+                credit = row.get('credit_%s' % index) or 0.0
+                res['periods'].append({'debit': debit, 'credit': credit,
+                                       'balance': debit - credit})
+            if display_account == 'all':
+                account_res.append(res)
+            if display_account == 'not_zero' and not (
+                    currency.is_zero(res['opening']) and
+                    currency.is_zero(res['closing'])):
+                account_res.append(res)
+            if display_account == 'movement' and any(
+                    not currency.is_zero(period['debit']) or
+                    not currency.is_zero(period['credit'])
+                    for period in res['periods']):
+                account_res.append(res)
+        return account_res
+
+    def _get_xlsx_report(self, docids, data):
+        """XLSX export of the trial balance, see account.report.xlsx"""
+        values = self._get_report_values(docids, data)
+        accounts = values['Accounts']
+        if values['Periods']:
+            columns = [(_('Code'), 'char'), (_('Account'), 'char'),
+                       (_('Opening'), 'amount')]
+            for name, date_from, date_to in values['Periods']:
+                columns += [('%s %s' % (name, _('Debit')), 'amount'),
+                            ('%s %s' % (name, _('Credit')), 'amount'),
+                            ('%s %s' % (name, _('Balance')), 'amount')]
+            columns.append((_('Closing'), 'amount'))
+            rows = (('line', [account['code'], account['name'],
+                              account['opening']] + [
+                amount for period in account['periods']
+                for amount in (period['debit'], period['credit'],
+                               period['balance'])] + [account['closing']])
+                    for account in accounts)
+            return self._description, columns, rows
+        columns = [(_('Code'), 'char'), (_('Account'), 'char'),
+                   (_('Debit'), 'amount'), (_('Credit'), 'amount'),
+                   (_('Balance'), 'amount')]
+        rows = (('line', [account['code'], account['name'], account['debit'],
+                          account['credit'], account['balance']])
+                for account in accounts)
+        return self._description, columns, rows
+
     @api.model
     def _get_report_values(self, docids, data=None):
         if not data.get('form') or not self.env.context.get('active_model'):
@@ -99,9 +225,15 @@ class ReportTrialBalance(models.AbstractModel):
         display_account = data['form'].get('display_account')
         accounts = docs if model == 'account.account' else self.env[
             'account.account'].search([])
-        account_res = self.with_context(
-            data['form'].get('used_context'))._get_accounts(accounts,
-                                                            display_account)
+        periods = data['form'].get('periods') or []
+        if periods:
+            account_res = self.with_context(
+                data['form'].get('used_context'))._get_period_accounts(
+                accounts, display_account, periods)
+        else:
+            account_res = self.with_context(
+                data['form'].get('used_context'))._get_accounts(
+                accounts, display_account)
         return {
             'doc_ids': self.ids,
             'doc_model': model,
@@ -109,4 +241,5 @@ class ReportTrialBalance(models.AbstractModel):
             'docs': docs,
             'time': time,
             'Accounts': account_res,
+            'Periods': periods,
         }
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+#############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2023-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: Cybrosys Techno Solutions(<https://www.cybrosys.com>)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+import os
+import random
+from datetime import date, timedelta
+
+from odoo import Command
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+
+
+def _get_setting(name, default):
+    """Benchmark option read from the ACCOUNTING_BENCHMARK_<NAME>
+    environment variable"""
+    return type(default)(os.environ.get(
+        'ACCOUNTING_BENCHMARK_%s' % name.upper(), default))
+
+
+class SyntheticLedgerCase(AccountTestInvoicingCommon):
+    """Company holding a reproducible synthetic ledger.
+
+    The size of the ledger is set by the ACCOUNTING_BENCHMARK_PARTNERS,
+    _ACCOUNTS, _JOURNALS, _MOVES, _LINES_PER_MOVE, _RECONCILIATIONS and
+    _ASSETS environment variables, the generator by _SEED. Every entry is dated in
+    the year ``ledger_year`` and posted.
+    """
+    ledger_year = 2023
+
+    @classmethod
+    def setUpClass(cls, chart_template_ref=None):
+        super().setUpClass(chart_template_ref=chart_template_ref)
+        cls.ledger_options = {
+            'partners': _get_setting('partners', 50),
+            'accounts': _get_setting('accounts', 30),
+            'journals': _get_setting('journals', 4),
+            'moves': _get_setting('moves', 1000),
+            'lines_per_move': max(_get_setting('lines_per_move', 4), 2),
+            'reconciliations': _get_setting('reconciliations', 200),
+            'assets': _get_setting('assets', 100),
+            'seed': _get_setting('seed', 42),
+        }
+        cls.rng = random.Random(cls.ledger_options['seed'])
+        cls.date_from = date(cls.ledger_year, 1, 1)
+        cls.date_to = date(cls.ledger_year, 12, 31)
+        cls._create_ledger()
+
+    @classmethod
+    def _random_date(cls):
+        return cls.date_from + timedelta(
+            days=cls.rng.randrange((cls.date_to - cls.date_from).days + 1))
+
+    @classmethod
+    def _create_ledger(cls):
+        options = cls.ledger_options
+        company = cls.company_data['company']
+        cls.partners = cls.env['res.partner'].create([
+            {'name': 'Benchmark Partner %04d' % index}
+            for index in range(options['partners'])])
+        account_types = ['asset_current', 'liability_current', 'income',
+                         'expense', 'equity']
+        cls.accounts = cls.env['account.account'].create([{
+            'name': 'Benchmark Account %04d' % index,
+            'code': 'BM%04d' % index,
+            'account_type': account_types[index % len(account_types)],
+            'company_id': company.id,
+        } for index in range(options['accounts'])])
+        cls.journals = cls.env['account.journal'].create([{
+            'name': 'Benchmark Journal %02d' % index,
+            'code': 'BM%02d' % index,
+            'type': 'general',
+            'company_id': company.id,
+        } for index in range(options['journals'])]) | (
+            cls.company_data['default_journal_sale'] |
+            cls.company_data['default_journal_purchase'])
+
+        move_vals = [cls._prepare_move_vals()
+                     for index in range(options['moves'])]
+        for start in range(0, len(move_vals), 500):
+            cls.env['account.move'].create(
+                move_vals[start:start + 500]).action_post()
+        cls._create_reconciliations()
+        cls._create_assets()
+
+    @classmethod
+    def _prepare_move_vals(cls):
+        """Balanced entry spread over random accounts and partners"""
+        lines = []
+        total = 0.0
+        for index in range(cls.ledger_options['lines_per_move'] - 1):
+            amount = round(cls.rng.uniform(-5000.0, 5000.0), 2) or 1.0
+            total += amount
+            lines.append(Command.create({
+                'name': 'Benchmark line',
+                'account_id': cls.rng.choice(cls.accounts).id,
+                'partner_id': cls.rng.choice(cls.partners).id,
+                'debit': max(amount, 0.0),
+                'credit': max(-amount, 0.0),
+            }))
+        lines.append(Command.create({
+            'name': 'Benchmark counterpart',
+            'account_id': cls.rng.choice(cls.accounts).id,
+            'debit': max(-total, 0.0),
+            'credit': max(total, 0.0),
+        }))
+        return {
+            'move_type': 'entry',
+            'date': cls._random_date(),
+            'journal_id': cls.rng.choice(cls.journals).id,
+            'line_ids': lines,
+        }
+
+    @classmethod
+    def _create_reconciliations(cls):
+        """Receivables settled by a later payment, fully or partially"""
+        receivable = cls.company_data['default_account_receivable']
+        revenue = cls.company_data['default_account_revenue']
+        bank_journal = cls.company_data['default_journal_bank']
+        bank_account = bank_journal.default_account_id
+        invoice_vals, payment_vals = [], []
+        for index in range(cls.ledger_options['reconciliations']):
+            partner = cls.rng.choice(cls.partners)
+            amount = round(cls.rng.uniform(10.0, 10000.0), 2)
+            paid = amount if cls.rng.random() < 0.8 else round(amount / 2, 2)
+            invoice_date = cls._random_date()
+            payment_date = min(invoice_date + timedelta(
+                days=cls.rng.randrange(90)), cls.date_to)
+            invoice_vals.append({
+                'move_type': 'entry',
+                'date': invoice_date,
+                'journal_id': cls.company_data['default_journal_misc'].id,
+                'line_ids': [
+                    Command.create({'account_id': receivable.id,
+                                    'partner_id': partner.id,
+                                    'debit': amount, 'credit': 0.0,
+                                    'date_maturity': invoice_date + timedelta(
+                                        days=30)}),
+                    Command.create({'account_id': revenue.id,
+                                    'partner_id': partner.id,
+                                    'debit': 0.0, 'credit': amount}),
+                ],
+            })
+            payment_vals.append({
+                'move_type': 'entry',
+                'date': payment_date,
+                'journal_id': bank_journal.id,
+                'line_ids': [
+                    Command.create({'account_id': bank_account.id,
+                                    'partner_id': partner.id,
+                                    'debit': paid, 'credit': 0.0}),
+                    Command.create({'account_id': receivable.id,
+                                    'partner_id': partner.id,
+                                    'debit': 0.0, 'credit': paid}),
+                ],
+            })
+        if not invoice_vals:
+            return
+        invoices = cls.env['account.move'].create(invoice_vals)
+        payments = cls.env['account.move'].create(payment_vals)
+        (invoices | payments).action_post()
+        for invoice, payment in zip(invoices, payments):
+            (invoice.line_ids | payment.line_ids).filtered(
+                lambda line: line.account_id == receivable).reconcile()
+
+    @classmethod
+    def _create_assets(cls):
+        """Running assets bought during the year, with their depreciation
+        boards"""
+        if not cls.ledger_options['assets']:
+            return
+        company = cls.company_data['company']
+        category = cls.env['account.asset.category'].create({
+            'name': 'Benchmark Assets',
+            'company_id': company.id,
+            'price': 0.0,
+            'account_asset_id': cls.accounts[0].id,
+            'account_depreciation_id': cls.accounts[0].id,
+            'account_depreciation_expense_id': cls.accounts[3].id,
+            'journal_id': cls.company_data['default_journal_misc'].id,
+            'method_number': 60,
+            'method_period': 1,
+        })
+        assets = cls.env['account.asset.asset'].create([{
+            'name': 'Benchmark Asset %04d' % index,
+            'category_id': category.id,
+            'company_id': company.id,
+            'value': round(cls.rng.uniform(500.0, 50000.0), 2),
+            'date': cls._random_date(),
+        } for index in range(cls.ledger_options['assets'])])
+        assets.compute_depreciation_board()
+        assets.validate()
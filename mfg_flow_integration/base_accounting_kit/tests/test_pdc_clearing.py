@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+#############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2023-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: Cybrosys Techno Solutions(<https://www.cybrosys.com>)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+from datetime import timedelta
+
+from odoo import Command, fields
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+from odoo.tests import tagged
+
+
+@tagged('post_install', '-at_install')
+class TestPdcClearing(AccountTestInvoicingCommon):
+
+    @classmethod
+    def setUpClass(cls, chart_template_ref=None):
+        super().setUpClass(chart_template_ref=chart_template_ref)
+        cls.bank_journal = cls.company_data['default_journal_bank']
+        cls.pdc_method_line = \
+            cls.bank_journal.inbound_payment_method_line_ids.filtered(
+                lambda l: l.code == 'pdc')[:1]
+        if not cls.pdc_method_line:
+            cls.pdc_method_line = cls.env[
+                'account.payment.method.line'].create({
+                    'payment_method_id': cls.env.ref(
+                        'base_accounting_kit.account_payment_method_pdc_in'
+                    ).id,
+                    'journal_id': cls.bank_journal.id,
+                })
+        cls.clearing_account = cls.env['account.account'].create({
+            'name': 'PDC Clearing',
+            'code': 'PDC01',
+            'account_type': 'asset_current',
+            'reconcile': True,
+            'company_id': cls.company_data['company'].id,
+        })
+        cls.bank_journal.pdc_clearing_account_id = cls.clearing_account
+        cls.effective_date = fields.Date.today() - timedelta(days=1)
+
+    def _create_pdc(self, amount, cheque_reference):
+        payment = self.env['account.payment'].create({
+            'payment_type': 'inbound',
+            'partner_type': 'customer',
+            'partner_id': self.partner_a.id,
+            'amount': amount,
+            'date': self.effective_date - timedelta(days=30),
+            'journal_id': self.bank_journal.id,
+            'payment_method_line_id': self.pdc_method_line.id,
+            'effective_date': self.effective_date,
+            'cheque_reference': cheque_reference,
+        })
+        payment.action_post()
+        return payment
+
+    def _get_balance(self, account):
+        return sum(self.env['account.move.line'].search([
+            ('account_id', '=', account.id),
+            ('parent_state', '=', 'posted')]).mapped('balance'))
+
+    def test_clear_pdc_same_journal_and_day(self):
+        payments = self._create_pdc(100.0, 'CHQ-1') | \
+            self._create_pdc(250.0, 'CHQ-2')
+        moves = payments._clear_pdc()
+
+        self.assertEqual(len(moves), 1)
+        self.assertRecordValues(moves, [{
+            'state': 'posted',
+            'date': self.effective_date,
+            'journal_id': self.bank_journal.id,
+        }])
+        self.assertEqual(payments.pdc_clearing_move_id, moves)
+        self.assertTrue(all(payments.mapped('pdc_cleared')))
+        clearing_lines = moves.line_ids.filtered(
+            lambda l: l.account_id == self.clearing_account)
+        self.assertRecordValues(clearing_lines, [
+            {'debit': 100.0, 'credit': 0.0, 'reconciled': False},
+            {'debit': 250.0, 'credit': 0.0, 'reconciled': False},
+        ])
+        self.assertFalse(moves.line_ids.filtered(
+            lambda l: l.account_id == self.bank_journal.default_account_id))
+        self.assertTrue(all(
+            payments._get_pdc_outstanding_lines().mapped('reconciled')))
+        self.assertFalse(self.env['account.payment'].search(
+            self.env['account.payment']._get_due_pdc_domain(
+                self.effective_date) + [('id', 'in', payments.ids)]))
+
+    def test_statement_line_after_clearing(self):
+        payment = self._create_pdc(100.0, 'CHQ-3')
+        payment._clear_pdc()
+        bank_account = self.bank_journal.default_account_id
+        self.assertEqual(self._get_balance(bank_account), 0.0)
+
+        st_line = self.env['account.bank.statement.line'].create({
+            'journal_id': self.bank_journal.id,
+            'date': self.effective_date,
+            'payment_ref': 'CHQ-3',
+            'partner_id': self.partner_a.id,
+            'amount': 100.0,
+        })
+        # the deposit is booked on the bank account once, by the statement
+        self.assertEqual(self._get_balance(bank_account), 100.0)
+        # and the cheque waits on the clearing account for its matching
+        clearing_line = payment.pdc_clearing_move_id.line_ids.filtered(
+            lambda l: l.account_id == self.clearing_account)
+        self.assertRecordValues(clearing_line, [{
+            'partner_id': self.partner_a.id,
+            'amount_residual': 100.0,
+        }])
+        _liquidity_lines, suspense_lines, _other_lines = \
+            st_line._seek_for_lines()
+        st_line.move_id.write({'line_ids': [
+            Command.update(suspense_lines.id,
+                           {'account_id': self.clearing_account.id})]})
+        (clearing_line + suspense_lines).reconcile()
+        self.assertTrue(st_line.is_reconciled)
+        self.assertEqual(self._get_balance(self.clearing_account), 0.0)
+        self.assertEqual(self._get_balance(bank_account), 100.0)
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+#############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2023-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: Cybrosys Techno Solutions(<https://www.cybrosys.com>)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+import json
+import logging
+import os
+import statistics
+import tempfile
+import time
+
+from odoo.tests import tagged
+
+from .common import SyntheticLedgerCase, _get_setting
+
+_logger = logging.getLogger(__name__)
+
+
+@tagged('post_install', '-at_install', '-standard', 'benchmark')
+class TestReportBenchmark(SyntheticLedgerCase):
+    """Time and count the queries of every accounting report on the
+    synthetic ledger. Run with ``--test-tags benchmark``.
+
+    The results are written as JSON to ACCOUNTING_BENCHMARK_OUTPUT
+    (``base_accounting_kit_benchmark.json`` in the temporary directory by
+    default). When ACCOUNTING_BENCHMARK_BASELINE names the JSON of an
+    earlier run on the same ledger options, a report running more than
+    ACCOUNTING_BENCHMARK_MAX_SLOWDOWN times slower (1.5 by default) or
+    issuing more queries than in the baseline fails the test.
+    """
+
+    @classmethod
+    def setUpClass(cls, chart_template_ref=None):
+        super().setUpClass(chart_template_ref=chart_template_ref)
+        cls.rounds = max(_get_setting('rounds', 3), 1)
+        cls.results = {}
+        cls.baseline = {}
+        baseline_path = os.environ.get('ACCOUNTING_BENCHMARK_BASELINE')
+        if baseline_path:
+            with open(baseline_path) as baseline_file:
+                baseline = json.load(baseline_file)
+            if baseline.get('ledger') == cls.ledger_options:
+                cls.baseline = baseline.get('reports', {})
+            else:
+                _logger.warning("Benchmark baseline %s was run on another "
+                                "ledger, it is ignored", baseline_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        output = os.environ.get('ACCOUNTING_BENCHMARK_OUTPUT') or \
+            os.path.join(tempfile.gettempdir(),
+                         'base_accounting_kit_benchmark.json')
+        with open(output, 'w') as output_file:
+            json.dump({'ledger': cls.ledger_options, 'reports': cls.results},
+                      output_file, indent=2, sort_keys=True)
+        _logger.info("Accounting report benchmark written to %s", output)
+        super().tearDownClass()
+
+    def _reset_caches(self):
+        """Start every round from cold caches, the ormcaches of the
+        ledger queries, locked tax periods and company branches included"""
+        self.env['account.report.cache']._clear()
+        self.env.registry.clear_cache()
+        self.env.cr.precommit.data.pop('base_accounting_kit.query_get', None)
+        self.env.invalidate_all()
+
+    def _render(self, wizard):
+        action = getattr(wizard, getattr(wizard, '_report_job_method',
+                                         'check_report'))()
+        context = action.get('context') or {}
+        html, report_type = self.env['ir.actions.report'].with_context(
+            context)._render_qweb_html(
+            action['report_name'], context.get('active_ids'),
+            data=action.get('data'))
+        return html
+
+    def _benchmark(self, name, model, values=None, context=None):
+        """Print the report of a ``model`` wizard created with ``values``
+        ``rounds`` times and record the median duration and the queries"""
+        def prepare():
+            wizard = self.env[model].with_context(
+                **(context or {})).create(dict(values or {}))
+            return lambda: self._render(wizard)
+        self._measure(name, prepare)
+
+    def _measure(self, name, prepare):
+        """Run the callable returned by ``prepare`` ``rounds`` times from
+        cold caches and record the median duration and the queries"""
+        durations = []
+        queries = None
+        for round_index in range(self.rounds):
+            run = prepare()
+            self._reset_caches()
+            query_count = self.env.cr.sql_log_count
+            start = time.perf_counter()
+            output = run()
+            durations.append(time.perf_counter() - start)
+            if queries is None:
+                queries = self.env.cr.sql_log_count - query_count
+            self.assertTrue(output, "%s rendered nothing" % name)
+        result = self.results[name] = {
+            'duration': round(statistics.median(durations), 4),
+            'queries': queries,
+        }
+        _logger.info("Benchmark %s: %.3fs, %d queries", name,
+                     result['duration'], queries)
+        baseline = self.baseline.get(name)
+        if baseline:
+            max_slowdown = _get_setting('max_slowdown', 1.5)
+            self.assertLessEqual(
+                result['duration'], baseline['duration'] * max_slowdown,
+                "%s is slower than the baseline" % name)
+            self.assertLessEqual(
+                result['queries'], baseline['queries'],
+                "%s issues more queries than the baseline" % name)
+
+    def _dates(self):
+        return {'date_from': self.date_from, 'date_to': self.date_to}
+
+    def test_general_ledger(self):
+        self._benchmark('general_ledger', 'account.report.general.ledger', dict(
+            self._dates(), journal_ids=self.journals.ids,
+            initial_balance=True))
+
+    def test_trial_balance(self):
+        self._benchmark('trial_balance', 'account.balance.report', dict(
+            self._dates(), journal_ids=self.journals.ids))
+
+    def test_trial_balance_comparative(self):
+        wizard_values = dict(self._dates(), journal_ids=self.journals.ids,
+                             comparative=True, period_type='month',
+                             period_count=12)
+        wizard = self.env['account.balance.report'].create(wizard_values)
+        wizard.action_generate_periods()
+        periods = [(0, 0, {'name': period.name,
+                           'date_from': period.date_from,
+                           'date_to': period.date_to})
+                   for period in wizard.period_ids]
+        self._benchmark('trial_balance_comparative', 'account.balance.report',
+                        dict(wizard_values, period_ids=periods))
+
+    def test_partner_ledger(self):
+        self._benchmark('partner_ledger', 'account.report.partner.ledger',
+                        dict(self._dates(), journal_ids=self.journals.ids))
+
+    def test_aged_partner_balance(self):
+        self._benchmark('aged_partner_balance', 'account.aged.trial.balance',
+                        {'date_from': self.date_to,
+                         'journal_ids': self.journals.ids})
+
+    def test_day_book(self):
+        self._benchmark('day_book', 'account.day.book.report', dict(
+            self._dates(), journal_ids=self.journals.ids))
+
+    def test_cash_book(self):
+        self._benchmark('cash_book', 'account.cash.book.report',
+                        dict(self._dates(), initial_balance=True))
+
+    def test_bank_book(self):
+        self._benchmark('bank_book', 'account.bank.book.report',
+                        dict(self._dates(), initial_balance=True))
+
+    def test_tax_report(self):
+        self._benchmark('tax_report', 'kit.account.tax.report',
+                        self._dates())
+
+    def test_journal_audit(self):
+        self._benchmark('journal_audit', 'account.print.journal', dict(
+            self._dates(), journal_ids=self.journals.ids))
+
+    def test_balance_sheet(self):
+        self._benchmark('balance_sheet', 'financial.report', dict(
+            self._dates(), account_report_id=self.env.ref(
+                'base_accounting_kit.account_financial_report_balancesheet0'
+            ).id))
+
+    def test_profit_and_loss(self):
+        self._benchmark('profit_and_loss', 'financial.report', dict(
+            self._dates(), account_report_id=self.env.ref(
+                'base_accounting_kit.account_financial_report_profitandloss0'
+            ).id))
+
+    def test_cash_flow(self):
+        self._benchmark('cash_flow', 'cash.flow.report', dict(
+            self._dates(), account_report_id=self.env.ref(
+                'base_accounting_kit.account_financial_report_cash_flow0'
+            ).id))
+
+    def test_asset_report(self):
+        """The assets analysis is a pivot view: time its read_group by
+        category and year"""
+        report = self.env['asset.asset.report']
+        self._measure('asset_report', lambda: lambda: report.read_group(
+            [], ['gross_value:sum', 'unposted_value:sum',
+                 'residual_value:sum'],
+            ['asset_category_id', 'depreciation_date:year'], lazy=False))
@@ -34,3 +34,5 @@ from . import partner_ledger
 from . import tax_report
 from . import trial_balance
 from . import account_lock_date
+from . import asset_depreciation_forecast
+from . import account_pdc_intake
@@ -26,6 +26,7 @@ from odoo.exceptions import UserError
 
 class BankBookWizard(models.TransientModel):
     _name = 'account.bank.book.report'
+    _inherit = 'account.report.job.mixin'
     _description = 'Account Bank Book Report'
 
     company_id = fields.Many2one('res.company', string='Company',
@@ -26,6 +26,7 @@ from odoo.exceptions import UserError
 
 class CashBookWizard(models.TransientModel):
     _name = 'account.cash.book.report'
+    _inherit = 'account.report.job.mixin'
     _description = 'Account Cash Book Report'
 
     company_id = fields.Many2one('res.company', string='Company',
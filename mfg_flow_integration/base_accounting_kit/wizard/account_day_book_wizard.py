@@ -25,6 +25,7 @@ from odoo import fields, models
 
 class DayBookWizard(models.TransientModel):
     _name = 'account.day.book.report'
+    _inherit = 'account.report.job.mixin'
     _description = 'Account Day Book Report'
 
     company_id = fields.Many2one('res.company', string='Company',
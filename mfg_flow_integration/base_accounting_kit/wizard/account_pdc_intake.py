@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+#############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2023-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: Cybrosys Techno Solutions(<https://www.cybrosys.com>)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+from odoo import api, fields, models, _
+from odoo.exceptions import UserError
+
+
+class AccountPdcIntake(models.TransientModel):
+    """Registers a batch of post-dated cheques against their invoices in
+    one run: the payments are created with one create and posted together,
+    then each is reconciled with its invoices"""
+    _name = 'account.pdc.intake'
+    _description = 'PDC Intake'
+
+    payment_type = fields.Selection([('inbound', 'Receive Cheques'),
+                                     ('outbound', 'Send Cheques')],
+                                    string='Type', required=True,
+                                    default='inbound')
+    company_id = fields.Many2one('res.company', string='Company',
+                                 required=True,
+                                 default=lambda self: self.env.company)
+    journal_id = fields.Many2one('account.journal', string='Bank Journal',
+                                 required=True,
+                                 domain="[('type', '=', 'bank'), "
+                                        "('company_id', '=', company_id)]")
+    payment_date = fields.Date(string='Receipt Date', required=True,
+                               default=fields.Date.context_today)
+    line_ids = fields.One2many('account.pdc.intake.line', 'intake_id',
+                               string='Cheques')
+
+    def _get_payment_method_line(self):
+        """PDC payment method of the journal for the intake direction"""
+        self.ensure_one()
+        if self.payment_type == 'inbound':
+            method_lines = self.journal_id.inbound_payment_method_line_ids
+        else:
+            method_lines = self.journal_id.outbound_payment_method_line_ids
+        method_line = method_lines.filtered(lambda l: l.code == 'pdc')[:1]
+        if not method_line:
+            raise UserError(_("Add the PDC payment method to the journal %s.",
+                              self.journal_id.display_name))
+        return method_line
+
+    def _prepare_payment_vals_list(self):
+        self.ensure_one()
+        method_line = self._get_payment_method_line()
+        partner_type = 'customer' if self.payment_type == 'inbound' \
+            else 'supplier'
+        return [{
+            'payment_type': self.payment_type,
+            'partner_type': partner_type,
+            'partner_id': line.partner_id.id,
+            'amount': line.amount,
+            'date': self.payment_date,
+            'journal_id': self.journal_id.id,
+            'payment_method_line_id': method_line.id,
+            'ref': ', '.join(line.invoice_ids.mapped('name')) or
+            line.cheque_reference,
+            'effective_date': line.effective_date,
+            'cheque_reference': line.cheque_reference,
+            'bank_reference': line.bank_reference,
+        } for line in self.line_ids]
+
+    def action_register_payments(self):
+        """Create and post the payments of all the cheques, then reconcile
+        them with their invoices"""
+        self.ensure_one()
+        if not self.line_ids:
+            raise UserError(_("Add the cheques to register."))
+        if any(line.amount <= 0 for line in self.line_ids):
+            raise UserError(_("The amount of a cheque must be positive."))
+        payments = self.env['account.payment'].create(
+            self._prepare_payment_vals_list())
+        payments.action_post()
+        for payment, line in zip(payments, self.line_ids):
+            if not line.invoice_ids:
+                continue
+            counterpart_lines = payment._seek_for_lines()[1]
+            (counterpart_lines + line.invoice_ids.line_ids).filtered(
+                lambda l: l.account_id == payment.destination_account_id
+                and not l.reconciled).reconcile()
+        return {
+            'name': _('Post-dated Cheques'),
+            'view_mode': 'tree,form',
+            'res_model': 'account.payment',
+            'type': 'ir.actions.act_window',
+            'domain': [('id', 'in', payments.ids)],
+        }
+
+
+class AccountPdcIntakeLine(models.TransientModel):
+    _name = 'account.pdc.intake.line'
+    _description = 'PDC Intake Cheque'
+
+    intake_id = fields.Many2one('account.pdc.intake', required=True,
+                                ondelete='cascade')
+    payment_type = fields.Selection(related='intake_id.payment_type')
+    partner_id = fields.Many2one('res.partner', string='Partner',
+                                 required=True)
+    invoice_ids = fields.Many2many(
+        'account.move', string='Invoices',
+        domain="[('commercial_partner_id', '=', commercial_partner_id), "
+               "('state', '=', 'posted'), "
+               "('payment_state', 'in', ('not_paid', 'partial')), "
+               "('move_type', 'in', payment_type == 'inbound' and "
+               "['out_invoice', 'out_receipt'] or "
+               "['in_invoice', 'in_receipt'])]")
+    commercial_partner_id = fields.Many2one(
+        related='partner_id.commercial_partner_id')
+    cheque_reference = fields.Char(string='Cheque Reference', required=True)
+    bank_reference = fields.Char(string='Bank Reference')
+    effective_date = fields.Date(string='Effective Date', required=True,
+                                 help='Effective date of PDC')
+    amount = fields.Float(string='Amount', required=True, digits='Account')
+
+    @api.onchange('invoice_ids')
+    def _onchange_invoice_ids(self):
+        if self.invoice_ids:
+            self.amount = sum(self.invoice_ids.mapped('amount_residual'))
@@ -26,7 +26,7 @@ from odoo.tools.misc import get_lang
 class AccountingCommonPartnerReport(models.TransientModel):
     _name = 'account.common.partner.report'
     _description = 'Account Common Partner Report'
-    _inherit = "account.report"
+    _inherit = ["account.report", "account.report.job.mixin"]
 
     section_main_report_ids = fields.Many2many(string="Section Of",
                                                comodel_name='account.report',
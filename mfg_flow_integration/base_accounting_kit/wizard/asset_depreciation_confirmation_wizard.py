@@ -32,12 +32,31 @@ class AssetDepreciationConfirmationWizard(models.TransientModel):
                             "running assets", default=fields.Date.context_today)
 
     def asset_compute(self):
+        """Post the due depreciation lines of the selected companies, one
+        run per company. Small runs are processed right away, larger ones
+        are queued for the scheduled action, which commits after every
+        chunk"""
         self.ensure_one()
         context = self._context
-        created_move_ids = (self.env['account.asset.asset'].
-                            compute_generated_entries(self.date,
-                                                      asset_type=context.get(
-                                                          'asset_type')))
+        runs = self.env['account.asset.depreciation.run']._create_company_runs(
+            self.date, context.get('asset_type') or False)
+        due_count = sum(
+            self.env['account.asset.depreciation.line'].search_count(
+                run._get_due_line_domain()) for run in runs)
+        if due_count > min(runs.mapped('chunk_size')):
+            self.env.ref(
+                'base_accounting_kit.ir_cron_asset_depreciation_run'
+            )._trigger()
+            return {
+                'name': _('Depreciation Runs'),
+                'view_mode': 'tree,form',
+                'res_model': runs._name,
+                'domain': [('id', 'in', runs.ids)],
+                'type': 'ir.actions.act_window',
+            }
+        for run in runs:
+            run._process(auto_commit=False)
+        created_move_ids = runs.move_ids.ids
         return {
             'name': _('Created Asset Moves') if context.get('asset_type') ==
                                                 'purchase' else _(
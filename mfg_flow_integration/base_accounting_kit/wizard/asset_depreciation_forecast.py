@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+#############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2023-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: Cybrosys Techno Solutions(<https://www.cybrosys.com>)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+from dateutil.relativedelta import relativedelta
+
+from odoo import fields, models, _
+from odoo.exceptions import UserError
+
+
+class AssetDepreciationForecast(models.TransientModel):
+    _name = 'asset.depreciation.forecast'
+    _description = 'Depreciation Forecast'
+
+    date_from = fields.Date(
+        string='Start Date', required=True,
+        default=lambda self: fields.Date.context_today(self).replace(day=1))
+    year_count = fields.Integer(string='Number of Years', required=True,
+                                default=5)
+    category_ids = fields.Many2many(
+        'account.asset.category', string='Asset Categories',
+        domain=[('type', '=', 'purchase')],
+        help="Leave empty to forecast all the asset categories.")
+    budget_ids = fields.One2many('asset.depreciation.forecast.budget',
+                                 'forecast_id', string='Budgeted Assets',
+                                 help="Planned purchases to include in the "
+                                      "forecast.")
+    line_ids = fields.One2many('asset.depreciation.forecast.line',
+                               'forecast_id', string='Forecast')
+
+    def action_compute_forecast(self):
+        """Compute the monthly depreciation of the running and budgeted
+        assets and open it as a pivot"""
+        self.ensure_one()
+        if self.year_count <= 0:
+            raise UserError(_("The number of years must be positive."))
+        date_to = self.date_from + relativedelta(years=self.year_count,
+                                                 days=-1)
+        forecast = self.category_ids._forecast_depreciation(
+            self.date_from, date_to,
+            [budget._get_asset_vals() for budget in self.budget_ids])
+        categories = self.env['account.asset.category'].browse(
+            {key[0] for key in forecast})
+        company_by_category = {category.id: category.company_id.id
+                               for category in categories}
+        self.line_ids.unlink()
+        self.env['asset.depreciation.forecast.line'].create([{
+            'forecast_id': self.id,
+            'category_id': category_id,
+            'company_id': company_by_category[category_id],
+            'date': month,
+            'origin': origin,
+            'amount': amount,
+        } for (category_id, month, origin), amount in forecast.items()])
+        return {
+            'name': _('Depreciation Forecast'),
+            'type': 'ir.actions.act_window',
+            'res_model': 'asset.depreciation.forecast.line',
+            'view_mode': 'pivot,graph,tree',
+            'domain': [('forecast_id', '=', self.id)],
+            'context': {'search_default_group_category': 1},
+        }
+
+
+class AssetDepreciationForecastBudget(models.TransientModel):
+    _name = 'asset.depreciation.forecast.budget'
+    _description = 'Budgeted Asset of a Depreciation Forecast'
+
+    forecast_id = fields.Many2one('asset.depreciation.forecast',
+                                  required=True, ondelete='cascade')
+    name = fields.Char(string='Description', required=True)
+    category_id = fields.Many2one('account.asset.category',
+                                  string='Asset Category', required=True,
+                                  domain=[('type', '=', 'purchase')])
+    date = fields.Date(string='Purchase Date', required=True)
+    value = fields.Float(string='Gross Value', required=True, digits=0)
+    salvage_value = fields.Float(string='Salvage Value', digits=0)
+
+    def _get_asset_vals(self):
+        """Values of the hypothetical asset of the budget line"""
+        self.ensure_one()
+        return {
+            'name': self.name,
+            'category_id': self.category_id.id,
+            'date': self.date,
+            'value': self.value,
+            'salvage_value': self.salvage_value,
+        }
+
+
+class AssetDepreciationForecastLine(models.TransientModel):
+    _name = 'asset.depreciation.forecast.line'
+    _description = 'Depreciation Forecast Line'
+    _order = 'date, category_id'
+
+    forecast_id = fields.Many2one('asset.depreciation.forecast',
+                                  required=True, ondelete='cascade')
+    category_id = fields.Many2one('account.asset.category',
+                                  string='Asset Category', readonly=True)
+    company_id = fields.Many2one('res.company', string='Company',
+                                 readonly=True)
+    date = fields.Date(string='Month', readonly=True)
+    origin = fields.Selection([('asset', 'Running Assets'),
+                               ('budget', 'Budgeted Assets')],
+                              string='Origin', readonly=True)
+    amount = fields.Float(string='Depreciation', readonly=True)
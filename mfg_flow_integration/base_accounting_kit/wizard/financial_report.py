@@ -20,13 +20,15 @@
 #
 #############################################################################
 import re
+
 from odoo import api, models, fields
 
 
 class FinancialReport(models.TransientModel):
     _name = "financial.report"
-    _inherit = "account.report"
+    _inherit = ["account.report", "account.report.job.mixin"]
     _description = "Financial Reports"
+    _report_job_method = 'view_report_pdf'
 
     section_main_report_ids = fields.Many2many(string="Section Of",
                                                comodel_name='account.report',
@@ -113,31 +115,9 @@ class FinancialReport(models.TransientModel):
             used_context,
             lang=self.env.context.get('lang') or 'en_US')
         report_lines = self.get_account_lines(data['form'])
-        # find the journal items of these accounts
-        journal_items = self.find_journal_items(report_lines, data['form'])
-
-        def set_report_level(rec):
-            """This function is used to set the level of each item.
-            This level will be used to set the alignment in the dynamic reports."""
-            level = 1
-            if not rec['parent']:
-                return level
-            else:
-                for line in report_lines:
-                    key = 'a_id' if line['type'] == 'account' else 'id'
-                    if line[key] == rec['parent']:
-                        return level + set_report_level(line)
-
-        # finding the root
-        for item in report_lines:
-            item['balance'] = round(item['balance'], 2)
-            if not item['parent']:
-                item['level'] = 1
-            else:
-                item['level'] = set_report_level(item)
+        self._set_report_levels(report_lines)
         currency = self._get_currency()
         data['currency'] = currency
-        data['journal_items'] = journal_items
         data['report_lines'] = report_lines
         # checking view type
         return self.env.ref(
@@ -161,6 +141,7 @@ class FinancialReport(models.TransientModel):
                                    for fn in mapping.keys())
         if accounts:
             tables, where_clause, where_params = (
+                self.env['account.balance.snapshot']._query_get() or
                 self.env['account.move.line']._query_get())
             tables = tables.replace(
                 '"', '') if tables else "account_move_line"
@@ -180,73 +161,109 @@ class FinancialReport(models.TransientModel):
                 res[row['id']] = row
         return res
 
-    def _compute_report_balance(self, reports):
+    def _get_report_accounts(self, report, type_cache):
+        """Accounts whose balance makes up the amount of an 'accounts' or
+        'account_type' report; searches are shared through ``type_cache``"""
+        if report.type == 'accounts':
+            return report.account_ids
+        account_types = [report.account_type_ids]
+        if report.name == "Expenses":
+            account_types = ["expense", "expense_depreciation",
+                             "expense_direct_cost"]
+        if report.name == "Liability":
+            account_types = ["liability_payable", "equity",
+                             "liability_current", "liability_non_current"]
+        if report.name == "Assets":
+            account_types = ["asset_receivable", "asset_cash",
+                             "asset_current", "asset_non_current",
+                             "asset_prepayments", "asset_fixed"]
+        key = tuple(account_types)
+        if key not in type_cache:
+            type_cache[key] = self.env['account.account'].search([
+                ('account_type', 'in', account_types)])
+        return type_cache[key]
+
+    def _get_report_plan(self, reports):
+        """Compile the financial reports into a plan reusable for several
+        periods: every report reachable from ``reports`` (children and
+        linked reports) is loaded level by level, and the account set of
+        each 'accounts' and 'account_type' report is resolved once.
+
+        Returns a dict with 'accounts': {report_id: account recordset} and
+        'all_accounts': the union of those accounts."""
+        report_accounts = {}
+        type_cache = {}
+        seen = self.env['account.financial.report']
+        todo = reports
+        while todo:
+            seen |= todo
+            for report in todo:
+                if report.type in ('accounts', 'account_type'):
+                    report_accounts[report.id] = self._get_report_accounts(
+                        report, type_cache)
+            todo = (todo.filtered(lambda r: r.type == 'sum').children_ids |
+                    todo.filtered(lambda r: r.type == 'account_report')
+                    .account_report_id) - seen
+        all_accounts = self.env['account.account'].union(
+            *report_accounts.values())
+        return {'accounts': report_accounts, 'all_accounts': all_accounts}
+
+    def _compute_report_balance(self, reports, plan=None):
         """returns a dictionary with key=the ID of a record and
          value=the credit, debit and balance amount
-        computed for this record. If the record is of type :
-        'accounts' : it's the sum of the linked accounts
-        'account_type' : it's the sum of leaf accounts with
+        computed for this record. If the record is of type :
+        'accounts' : it's the sum of the linked accounts
+        'account_type' : it's the sum of leaf accounts with
          such an account_type
-        'account_report' : it's the amount of the related report
-        'sum' : it's the sum of the children of this record
-         (aka a 'view' record)"""
-        res = {}
+        'account_report' : it's the amount of the related report
+        'sum' : it's the sum of the children of this record
+         (aka a 'view' record)
+
+        The balances of all the accounts involved are fetched with a single
+        grouped query, see :meth:`_get_report_plan`, and shared through the
+        report cache until the ledger of the companies, the report lines or
+        the accounts change."""
+        return self.env['account.report.cache']._get_or_compute(
+            'financial', tuple(reports.ids),
+            lambda: self._compute_financial_balance(reports, plan),
+            definition_models=('account.financial.report',
+                               'account.account'))
+
+    def _compute_financial_balance(self, reports, plan=None):
+        if plan is None:
+            plan = self._get_report_plan(reports)
         fields = ['credit', 'debit', 'balance']
-        for report in reports:
-            if report.id in res:
-                continue
-            res[report.id] = dict((fn, 0.0) for fn in fields)
-            if report.type == 'accounts':
-                # it's the sum of the linked accounts
-                res[report.id]['account'] = self._compute_account_balance(
-                    report.account_ids
-                )
-                for value in \
-                        res[report.id]['account'].values():
-                    for field in fields:
-                        res[report.id][field] += value.get(field)
-            elif report.type == 'account_type':
-                # it's the sum the leaf accounts
-                #  with such an account type
-                accounts = self.env['account.account'].search([
-                    ('account_type', '=', report.account_type_ids)
-                ])
-                if report.name == "Expenses":
-                    accounts = self.env['account.account'].search([
-                        ('account_type', 'in', ["expense",
-                                                "expense_depreciation",
-                                                "expense_direct_cost"])
-                    ])
-                if report.name == "Liability":
-                    accounts = self.env['account.account'].search([
-                        ('account_type', 'in',
-                         ["liability_payable", "equity", "liability_current",
-                          "liability_non_current"])
-                    ])
-                if report.name == "Assets":
-                    accounts = self.env['account.account'].search([
-                        ('account_type', 'in',
-                         ["asset_receivable", "asset_cash", "asset_current",
-                          "asset_non_current", "asset_prepayments",
-                          "asset_fixed"])
-                    ])
-                res[report.id]['account'] = self._compute_account_balance(
-                    accounts)
-                for value in res[report.id]['account'].values():
+        account_balance = self._compute_account_balance(plan['all_accounts'])
+        computed = {}
+
+        def compute(report):
+            if report.id in computed:
+                return computed[report.id]
+            values = computed[report.id] = dict((fn, 0.0) for fn in fields)
+            if report.type in ('accounts', 'account_type'):
+                values['account'] = {
+                    account.id: dict(account_balance[account.id])
+                    for account in plan['accounts'][report.id]
+                }
+                for value in values['account'].values():
                     for field in fields:
-                        res[report.id][field] += value.get(field)
+                        values[field] += value.get(field)
             elif report.type == 'account_report' and report.account_report_id:
                 # it's the amount of the linked report
-                res2 = self._compute_report_balance(report.account_report_id)
-                for key, value in res2.items():
-                    for field in fields:
-                        res[report.id][field] += value[field]
+                linked = compute(report.account_report_id)
+                for field in fields:
+                    values[field] += linked[field]
             elif report.type == 'sum':
                 # it's the sum of the children of this account.report
-                res2 = self._compute_report_balance(report.children_ids)
-                for key, value in res2.items():
+                for child in report.children_ids:
+                    child_values = compute(child)
                     for field in fields:
-                        res[report.id][field] += value[field]
+                        values[field] += child_values[field]
+            return values
+
+        res = {}
+        for report in reports:
+            res[report.id] = compute(report)
         return res
 
     def get_account_lines(self, data):
@@ -255,10 +272,12 @@ class FinancialReport(models.TransientModel):
             ('id', '=', data['account_report_id'][0])
         ])
         child_reports = account_report._get_children_by_order()
+        plan = self._get_report_plan(child_reports)
         res = self.with_context(
-            data.get('used_context'))._compute_report_balance(child_reports)
+            data.get('used_context'))._compute_report_balance(child_reports,
+                                                              plan)
         if data['enable_filter']:
-            comparison_res = self._compute_report_balance(child_reports)
+            comparison_res = self._compute_report_balance(child_reports, plan)
             for report_id, value in comparison_res.items():
                 res[report_id]['comp_bal'] = value['balance']
                 report_acc = res[report_id].get('account')
@@ -356,54 +375,22 @@ class FinancialReport(models.TransientModel):
                                 key=lambda sub_line: sub_line['name'])
         return lines
 
-    def find_journal_items(self, report_lines, form):
-        cr = self.env.cr
-        journal_items = []
-        for i in report_lines:
-            if i['type'] == 'account':
-                account = i['account']
-                if form['target_move'] == 'posted':
-                    search_query = ("select aml.id, am.id as j_id, "
-                                    "aml.account_id, aml.date, aml.name as "
-                                    "label, am.name, (aml.debit-aml.credit) as "
-                                    "balance, aml.debit, aml.credit, "
-                                    "aml.partner_id  from "
-                                    "account_move_line aml "
-                                    "join account_move am on (aml.move_id=am.id"
-                                    " and am.state=%s) where aml.account_id=%s")
-                    vals = [form['target_move']]
-                else:
-                    search_query = ("select aml.id, am.id as j_id, "
-                                    "aml.account_id, aml.date, aml.name as "
-                                    "label, am.name, (aml.debit-aml.credit) as "
-                                    "balance, aml.debit, aml.credit, "
-                                    "aml.partner_id from account_move_line aml"
-                                    " join account_move am on "
-                                    "(aml.move_id=am.id) where "
-                                    "aml.account_id=%s")
-                    vals = []
-                if form['date_from'] and form['date_to']:
-                    search_query += " and aml.date>=%s and aml.date<=%s"
-                    vals += [account, form['date_from'], form['date_to']]
-                elif form['date_from']:
-                    search_query += " and aml.date>=%s"
-                    vals += [account, form['date_from']]
-                elif form['date_to']:
-                    search_query += " and aml.date<=%s"
-                    vals += [account, form['date_to']]
-                else:
-                    vals += [account]
-                cr.execute(search_query, tuple(vals))
-                items = cr.dictfetchall()
-                for j in items:
-                    temp = j['id']
-                    j['id'] = re.sub('[^0-9a-zA-Z]+', '',
-                                     i['name']) + str(
-                        temp)
-                    j['p_id'] = str(i['a_id'])
-                    j['type'] = 'journal_item'
-                    journal_items.append(j)
-        return journal_items
+    @staticmethod
+    def _set_report_levels(report_lines):
+        """Set the level of each item, used to set the alignment in the
+        dynamic reports. Lines come after their parent, so that the levels
+        are computed in a single pass."""
+        levels = {}
+        for item in report_lines:
+            item['balance'] = round(item['balance'], 2)
+            if not item['parent']:
+                item['level'] = 1
+            else:
+                parent_level = levels.get(item['parent'])
+                item['level'] = parent_level and parent_level + 1
+            key = item['a_id'] if item['type'] == 'account' else item['id']
+            levels.setdefault(key, item['level'])
+        return report_lines
 
     @api.model
     def _get_currency(self):
@@ -424,7 +411,7 @@ class ProfitLossPdf(models.AbstractModel):
         """ Provide report values to template """
         ctx = {
             'data': data,
-            'journal_items': data['journal_items'],
+            'journal_items': data.get('journal_items', []),
             'report_lines': data['report_lines'],
             'account_report': data['form']['account_report_id'][1],
             'currency': data['currency'],
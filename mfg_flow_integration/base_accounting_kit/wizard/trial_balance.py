@@ -19,7 +19,13 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 #
 #############################################################################
+from dateutil.relativedelta import relativedelta
+
 from odoo import api, fields, models, _
+from odoo.exceptions import UserError
+
+# Months covered by each period of a generated comparison
+PERIOD_MONTHS = {'month': 1, 'quarter': 3, 'year': 12}
 
 
 class AccountBalanceReport(models.TransientModel):
@@ -44,6 +50,17 @@ class AccountBalanceReport(models.TransientModel):
                                    'account_id', 'journal_id',
                                    string='Journals', required=True,
                                    default=[])
+    comparative = fields.Boolean(
+        string='Compare Periods',
+        help="Print the opening balance, the movements of each period and "
+             "the closing balance of every account side by side.")
+    period_type = fields.Selection([('month', 'Months'),
+                                    ('quarter', 'Quarters'),
+                                    ('year', 'Years')],
+                                   string='Split By', default='month')
+    period_count = fields.Integer(string='Number of Periods', default=12)
+    period_ids = fields.One2many('account.balance.report.period',
+                                 'report_id', string='Periods')
 
     @api.model
     def _get_report_name(self):
@@ -51,9 +68,69 @@ class AccountBalanceReport(models.TransientModel):
         return self.env['consolidation.period'].browse(period_id)[
             'display_name'] or _("Trial Balance")
 
+    def action_generate_periods(self):
+        """Replace the periods by ``period_count`` consecutive periods of
+        ``period_type`` starting on the start date"""
+        self.ensure_one()
+        if not self.date_from:
+            raise UserError(_("You must define a Start Date"))
+        if self.period_count <= 0:
+            raise UserError(_("The number of periods must be positive."))
+        months = PERIOD_MONTHS[self.period_type]
+        periods = [(5, 0, 0)]
+        for index in range(self.period_count):
+            date_from = self.date_from + relativedelta(months=index * months)
+            date_to = date_from + relativedelta(months=months, days=-1)
+            periods.append((0, 0, {
+                'sequence': index,
+                'name': date_from.strftime(
+                    '%Y' if self.period_type == 'year' else '%m/%Y'),
+                'date_from': date_from,
+                'date_to': date_to,
+            }))
+        self.write({'period_ids': periods})
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': self._name,
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'new',
+        }
+
+    def pre_print_report(self, data):
+        data = super(AccountBalanceReport, self).pre_print_report(data)
+        data['form']['periods'] = []
+        if self.comparative:
+            if not self.period_ids:
+                raise UserError(_("Add the periods to compare."))
+            data['form']['periods'] = [
+                (period.name, fields.Date.to_string(period.date_from),
+                 fields.Date.to_string(period.date_to))
+                for period in self.period_ids.sorted('date_from')]
+        return data
+
     def _print_report(self, data):
         data = self.pre_print_report(data)
         records = self.env[data['model']].browse(data.get('ids', []))
         return self.env.ref(
-            'base_accounting_kit.action_report_trial_balance').report_action(
+            'base_accounting_kit.action_report_trial_balance').with_context(
+            landscape=bool(data['form']['periods'])).report_action(
             records, data=data)
+
+
+class AccountBalanceReportPeriod(models.TransientModel):
+    _name = 'account.balance.report.period'
+    _description = 'Trial Balance Period'
+    _order = 'sequence, date_from'
+
+    report_id = fields.Many2one('account.balance.report', string='Report',
+                                required=True, ondelete='cascade')
+    sequence = fields.Integer(string='Sequence', default=10)
+    name = fields.Char(string='Label', required=True)
+    date_from = fields.Date(string='Start Date', required=True)
+    date_to = fields.Date(string='End Date', required=True)
+
+    _sql_constraints = [
+        ('date_check', 'CHECK (date_from <= date_to)',
+         'The start date of a period must precede its end date.'),
+    ]
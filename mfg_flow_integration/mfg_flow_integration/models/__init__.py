@@ -1,3 +1,3 @@
-from . import sale_order, purchase_order, mrp_production, stock_picking, integration_test, vendor_compare_wizard
+from . import sale_order, purchase_order, mrp_production, stock_picking, integration_test, vendor_compare_wizard, stock_quant
 from . import wizard
 from . import production_reques
\ No newline at end of file
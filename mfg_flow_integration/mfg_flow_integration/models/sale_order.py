@@ -434,20 +434,31 @@ class SaleOrder(models.Model):
     @api.depends('order_line.product_id', 'state')
     def _compute_needs_manufacturing_purchase(self):
         """Check if any product lacks sufficient stock"""
-        StockQuant = self.env['stock.quant']
+        availability = self.filtered(lambda o: o.state == 'sale')._get_stock_availability()
+        short_orders = {
+            line.order_id.id
+            for line, qty_available in availability.items()
+            if qty_available < line.product_uom_qty
+        }
         
         for order in self:
-            needs_mo_po = False
-            
-            if order.state == 'sale':
-                for line in order.order_line.filtered(lambda l: l.product_id.type == 'product'):
-                    qty_available = StockQuant._get_available_quantity(
-                        line.product_id, order.warehouse_id.lot_stock_id)
-                    if qty_available < line.product_uom_qty:
-                        needs_mo_po = True
-                        break
-            
-            order.needs_manufacturing_purchase = needs_mo_po
+            order.needs_manufacturing_purchase = order.id in short_orders
+
+    def _get_stock_availability(self):
+        """Available quantity of every storable line of the orders.
+
+        All lines of the recordset are resolved with a single batched quant
+        query, see ``stock.quant._get_available_quantities``.
+
+        :return: dict {sale.order.line: available quantity}
+        """
+        lines = self.order_line.filtered(lambda l: l.product_id.type == 'product')
+        available = self.env['stock.quant']._get_available_quantities(
+            (line.product_id, line.order_id.warehouse_id.lot_stock_id) for line in lines)
+        return {
+            line: available[line.product_id.id, line.order_id.warehouse_id.lot_stock_id.id]
+            for line in lines
+        }
 
     def action_confirm(self):
         """Confirm quotation - just change state, no stock check"""
@@ -457,12 +468,9 @@ class SaleOrder(models.Model):
         res = super(SaleOrder, self).action_confirm()
         
         # Check if MO/PO will be needed
-        StockQuant = self.env['stock.quant']
         unavailable_products = []
         
-        for line in self.order_line.filtered(lambda l: l.product_id.type == 'product'):
-            qty_available = StockQuant._get_available_quantity(
-                line.product_id, self.warehouse_id.lot_stock_id)
+        for line, qty_available in self._get_stock_availability().items():
             if qty_available < line.product_uom_qty:
                 unavailable_products.append(line.product_id.display_name)
         
@@ -545,12 +553,9 @@ class SaleOrder(models.Model):
         """Create production request with lines for products needing MO/PO"""
         self.ensure_one()
         
-        StockQuant = self.env['stock.quant']
         request_lines = []
         
-        for line in self.order_line.filtered(lambda l: l.product_id.type == 'product'):
-            qty_available = StockQuant._get_available_quantity(
-                line.product_id, self.warehouse_id.lot_stock_id)
+        for line, qty_available in self._get_stock_availability().items():
             qty_needed = line.product_uom_qty - qty_available
             
             if qty_needed > 0:
@@ -0,0 +1,97 @@
+from collections import defaultdict
+
+from odoo import api, models
+from odoo.tools import float_compare
+
+# key of the per-transaction availability memo in cr.precommit.data
+AVAILABILITY_CACHE_KEY = 'mfg_flow_integration.quant_availability'
+
+
+class StockQuant(models.Model):
+    _inherit = "stock.quant"
+
+    def _get_availability_cache(self):
+        """Availability memo living for the current transaction only"""
+        return self.env.cr.precommit.data.setdefault(AVAILABILITY_CACHE_KEY, {})
+
+    def _invalidate_availability_cache(self):
+        self.env.cr.precommit.data.pop(AVAILABILITY_CACHE_KEY, None)
+
+    @api.model
+    def _get_available_quantities(self, pairs):
+        """Batched version of ``_get_available_quantity``.
+
+        Fetches the quants of every (product, location) pair with one grouped
+        query and memoizes the result until the end of the transaction or the
+        next quant update, whichever comes first.
+
+        :param pairs: iterable of (product.product, stock.location) records
+        :return: dict {(product_id, location_id): available quantity}
+        """
+        cache = self._get_availability_cache()
+        pairs = {(product, location) for product, location in pairs}
+        missing = {(product.id, location.id): (product, location)
+                   for product, location in pairs
+                   if (product.id, location.id) not in cache}
+        if missing:
+            cache.update(self._compute_available_quantities(missing))
+        return {(product.id, location.id): cache.get((product.id, location.id), 0.0)
+                for product, location in pairs}
+
+    @api.model
+    def _compute_available_quantities(self, missing):
+        """Compute availability of ``missing`` {(product_id, location_id):
+        (product, location)} the way ``_get_available_quantity`` does without
+        lot, package or owner: the quants of the location and its children
+        are summed, per lot for tracked products."""
+        quants = self.sudo()
+        products = self.env['product.product'].browse({key[0] for key in missing})
+        locations = self.env['stock.location'].browse({key[1] for key in missing if key[1]})
+        balances = defaultdict(float)
+        if locations:
+            groups = quants._read_group(
+                [('product_id', 'in', products.ids), ('location_id', 'child_of', locations.ids)],
+                ['product_id', 'location_id', 'lot_id'],
+                ['quantity:sum', 'reserved_quantity:sum'],
+            )
+            for product, location, lot, quantity, reserved_quantity in groups:
+                for root in locations:
+                    if (product.id, root.id) in missing \
+                            and location.parent_path.startswith(root.parent_path):
+                        balances[product.id, root.id, lot.id] += quantity - reserved_quantity
+        lot_balances = defaultdict(list)
+        for (product_id, location_id, lot_id), balance in balances.items():
+            lot_balances[product_id, location_id].append(balance)
+
+        result = {}
+        for key, (product, location) in missing.items():
+            rounding = product.uom_id.rounding
+            values = lot_balances.get(key, [])
+            if product.tracking == 'none':
+                available_quantity = sum(values)
+                if float_compare(available_quantity, 0.0, precision_rounding=rounding) < 0:
+                    available_quantity = 0.0
+            else:
+                available_quantity = sum(
+                    value for value in values
+                    if float_compare(value, 0.0, precision_rounding=rounding) > 0)
+            result[key] = available_quantity
+        return result
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        self._invalidate_availability_cache()
+        return super().create(vals_list)
+
+    def write(self, vals):
+        self._invalidate_availability_cache()
+        return super().write(vals)
+
+    def unlink(self):
+        self._invalidate_availability_cache()
+        return super().unlink()
+
+    @api.model
+    def _merge_quants(self):
+        self._invalidate_availability_cache()
+        return super()._merge_quants()
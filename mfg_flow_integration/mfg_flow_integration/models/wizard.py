@@ -39,10 +39,10 @@ class ManufactureOrPurchaseWizard(models.TransientModel):
 
     def _create_manufacturing_orders(self, order, request):
         """Create Manufacturing Orders for products without sufficient stock"""
-        StockQuant = self.env['stock.quant']
         mo_orders = self.env['mrp.production']
         
         lines_to_process = request.line_ids if request else order.order_line.filtered(lambda l: l.product_id.type == 'product')
+        availability = {} if request else order._get_stock_availability()
         
         for line in lines_to_process:
             if request:
@@ -50,8 +50,7 @@ class ManufactureOrPurchaseWizard(models.TransientModel):
                 qty_needed = line.quantity_needed
             else:
                 product = line.product_id
-                qty_available = StockQuant._get_available_quantity(
-                    product, order.warehouse_id.lot_stock_id)
+                qty_available = availability[line]
                 qty_needed = line.product_uom_qty - qty_available
             
             if qty_needed > 0:
@@ -72,10 +71,10 @@ class ManufactureOrPurchaseWizard(models.TransientModel):
 
     def _open_purchase_order_form(self, order, request):
         """Open Purchase Order form with products that need purchasing"""
-        StockQuant = self.env['stock.quant']
         po_lines = []
         
         lines_to_process = request.line_ids if request else order.order_line.filtered(lambda l: l.product_id.type == 'product')
+        availability = {} if request else order._get_stock_availability()
         
         for line in lines_to_process:
             if request:
@@ -83,8 +82,7 @@ class ManufactureOrPurchaseWizard(models.TransientModel):
                 qty_needed = line.quantity_needed
             else:
                 product = line.product_id
-                qty_available = StockQuant._get_available_quantity(
-                    product, order.warehouse_id.lot_stock_id)
+                qty_available = availability[line]
                 qty_needed = line.product_uom_qty - qty_available
             
             if qty_needed > 0: